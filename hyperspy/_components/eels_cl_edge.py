@@ -131,6 +131,7 @@ def __init__(self, element_subshell, GOS=None):
         self.free_onset_energy = False
         self.intensity.grad = self.grad_intensity
         self.intensity.value = 1
+        self.intensity._linear = True
         self.intensity.bmin = 0.
         self.intensity.bmax = None
 
@@ -21,7 +21,7 @@
 import sympy
 import warnings
 
-from hyperspy.component import Component
+from hyperspy.component import Component, Parameter
 from hyperspy.docstrings.parameters import FUNCTION_ND_DOCSTRING
 
 
@@ -62,6 +62,28 @@ def _parse_substitutions(string):
     return expr
 
 
+def _get_linear_parameters(expr, parameters):
+    """Return the parameters in which `expr` is linear.
+
+    A parameter is considered linear if the second derivative of `expr` with
+    respect to it vanishes and its first derivative does not depend on any
+    other linear candidate, so that all the returned parameters can be
+    solved for simultaneously by linear least squares.
+
+    """
+    candidates = []
+    for parameter in parameters:
+        try:
+            if sympy.diff(expr, parameter, 2) == 0:
+                candidates.append(parameter)
+        except Exception:
+            # e.g. expressions containing a "where" condition
+            continue
+    return [parameter for parameter in candidates
+            if not (sympy.diff(expr, parameter).free_symbols &
+                    set(candidates))]
+
+
 class Expression(Component):
 
     """Create a component from a string expression.
@@ -160,6 +182,9 @@ class docstring.
             self.compile_function(module=module, position=rotation_center)
         # Initialise component
         Component.__init__(self, self._parameter_strings)
+        for parameter in self.parameters:
+            parameter._linear = (
+                parameter.name in self._linear_parameter_strings)
         # When creating components using Expression (for example GaussianHF)
         # we shouldn't add anything else to the _whitelist as the
         # component should be initizialized with its own kwargs.
@@ -260,6 +285,12 @@ def f(x): return self._f(x, *[p.value for p in self.parameters])
         parnames = [symbol.name if symbol.name not in self._rename_pars else self._rename_pars[symbol.name]
                     for symbol in parameters]
         self._parameter_strings = parnames
+        # Used by _FusedExpressions
+        self._sympy_expression = eval_expr
+        self._sympy_parameters = parameters
+        self._linear_parameter_strings = [
+            self._rename_pars.get(symbol.name, symbol.name)
+            for symbol in _get_linear_parameters(expr, parameters)]
 
         if self._compute_gradients:
             try:
@@ -306,3 +337,88 @@ def function_nd(self, *args):
                                *[p.map['values'][..., np.newaxis]
                                  for p in self.parameters])
     function_nd.__doc__ %= FUNCTION_ND_DOCSTRING
+
+
+class _FusedExpressions:
+
+    """Sum of 1D Expression components compiled as a single function.
+
+    The expressions of the components are added symbolically, replacing the
+    twinned parameters by the twin function of their twin, and the sum and
+    its partial derivatives are compiled with sympy's lambdify. The arguments
+    of the compiled functions are the parameters that are not twinned.
+
+    Parameters
+    ----------
+    components : list of Expression
+        1D Expression components. The twin functions of their parameters
+        must be defined with `twin_function_expr`.
+    module : {"numpy", "numexpr"}
+        Module used to evaluate the sum. The gradients are always evaluated
+        with numpy.
+
+    Attributes
+    ----------
+    parameters : list of Parameter
+        The parameters whose values are the arguments of the compiled
+        functions, including the twins of the parameters of the components.
+    has_gradients : bool
+        False if sympy could not compute the partial derivatives, e.g. for
+        expressions containing a "where" condition.
+
+    """
+
+    def __init__(self, components, module="numpy"):
+        from sympy.utilities.lambdify import lambdify
+        x = sympy.Symbol("x", real=True)
+        symbols = {}
+
+        def parameter_expression(parameter):
+            if isinstance(parameter.twin, Parameter):
+                twin = parameter_expression(parameter.twin)
+                if not parameter.twin_function_expr:
+                    return twin
+                twin_function = sympy.sympify(parameter.twin_function_expr)
+                variable = tuple(twin_function.free_symbols)[0]
+                return twin_function.subs(variable, twin)
+            if parameter not in symbols:
+                symbols[parameter] = sympy.Symbol(
+                    "p%i" % len(symbols), real=True)
+            return symbols[parameter]
+
+        expr = 0
+        for component in components:
+            substitutions = {
+                symbol: parameter_expression(parameter) for symbol, parameter
+                in zip(component._sympy_parameters, component.parameters)}
+            for symbol in component._sympy_expression.free_symbols:
+                if symbol.name == "x":
+                    substitutions[symbol] = x
+            expr += component._sympy_expression.xreplace(substitutions)
+
+        self.parameters = list(symbols)
+        variables = [x] + list(symbols.values())
+        self._f = lambdify(variables, expr, modules=module, dummify=False)
+        try:
+            gradients = [sympy.diff(expr, symbol)
+                         for symbol in symbols.values()]
+        except Exception:
+            gradients = None
+        self.has_gradients = gradients is not None and not any(
+            gradient.has(sympy.Derivative, sympy.Subs)
+            for gradient in gradients)
+        if self.has_gradients:
+            self._grad = lambdify(variables, gradients, modules="numpy",
+                                  dummify=False)
+
+    def function(self, x):
+        """Return the sum of the components evaluated at `x`."""
+        return self._f(x, *[parameter.value for parameter in self.parameters])
+
+    def gradients(self, x):
+        """Return a dictionary with the partial derivatives of the sum of the
+        components with respect to each of `parameters` evaluated at `x`."""
+        gradients = self._grad(
+            x, *[parameter.value for parameter in self.parameters])
+        return {parameter: np.broadcast_to(gradient, x.shape)
+                for parameter, gradient in zip(self.parameters, gradients)}
@@ -47,6 +47,7 @@ def __init__(self, offset=0.):
         Component.__init__(self, ('offset',))
         self.offset.free = True
         self.offset.value = offset
+        self.offset._linear = True
 
         self.isbackground = True
         self.convolved = False
@@ -76,6 +76,7 @@ def __init__(self, order=2, legacy=True, module="numexpr", **kwargs):
             self.coefficients._number_of_elements = order + 1
             self.coefficients.value = np.zeros((order + 1,))
             self.coefficients.grad = self.grad_coefficients
+            self.coefficients._linear = True
         else:
             from hyperspy._components.polynomial import Polynomial
             self.__class__ = Polynomial
@@ -76,6 +76,8 @@ def __init__(self, A=10e5, r=3., origin=0., left_cutoff=0.0,
 
         self.origin.free = False
         self.left_cutoff.free = False
+        # sympy can't differentiate the "where" condition
+        self.A._linear = True
 
         # Boundaries
         self.A.bmin = 0.
@@ -78,6 +78,7 @@ def __init__(self, signal1D, yscale=1.0, xscale=1.0,
         self.signal = signal1D
         self.yscale.free = True
         self.yscale.value = yscale
+        self.yscale._linear = True
         self.xscale.value = xscale
         self.shift.value = shift
 
@@ -16,14 +16,17 @@
 # You should have received a copy of the GNU General Public License
 # along with  HyperSpy.  If not, see <http://www.gnu.org/licenses/>.
 
+import atexit
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import logging
 from functools import partial
+import threading
 import warnings
 
 import numpy as np
 import dask.array as da
 import dask.delayed as dd
-from dask import threaded
 from dask.diagnostics import ProgressBar
 from itertools import product
 
@@ -34,8 +37,12 @@
 from hyperspy.exceptions import VisibleDeprecationWarning
 from hyperspy.external.progressbar import progressbar
 from hyperspy.misc.array_tools import _requires_linear_rebin
+from hyperspy.misc import chunk_planner, dask_scheduler
 from hyperspy.misc.hist_tools import histogram_dask
+from hyperspy.misc.lazy_navigator import (NavigatorComputation,
+                                          get_cached_navigator)
 from hyperspy.misc.machine_learning import import_sklearn
+from hyperspy.misc.persist import persist_to_disk
 from hyperspy.misc.utils import multiply, dummy_context_manager
 
 _logger = logging.getLogger(__name__)
@@ -81,13 +88,64 @@ def to_array(thing, chunks=None):
             raise ValueError
 
 
+def _get_iteration_data(signal, data):
+    """Transpose the data of a signal to iterate over it by blocks.
+
+    The navigation dimensions come first, in the order of iteration of
+    ``_iterate_signal``, followed by the signal dimensions in array order.
+    """
+    am = signal.axes_manager
+    axes = (am.navigation_indices_in_array[::-1] +
+            tuple(sorted(am.signal_indices_in_array)))
+    if axes != tuple(range(data.ndim)):
+        data = data.transpose(axes)
+    return data
+
+
+def _unwrap_map_value(value):
+    # Same as in create_map_objects
+    if isinstance(value, np.ndarray) and len(value) == 1:
+        value = value[0]
+    return value
+
+
+def _map_block(data, *args, function, keys, constant_keys, nav_dim,
+               sig_shape, dtype):
+    """Apply the function to every navigation pixel of a block.
+
+    To be used in LazySignal._map_iterate_blockwise. ``args`` are the blocks
+    of the iterating kwargs ``keys`` followed by the constant arrays
+    ``constant_keys``.
+    """
+    constant_kwargs = dict(zip(constant_keys, args[len(keys):]))
+    nav_shape = data.shape[:nav_dim]
+    out = np.empty(nav_shape + tuple(sig_shape), dtype=dtype)
+    for index in np.ndindex(*nav_shape):
+        kwargs = {key: _unwrap_map_value(arg[index])
+                  for key, arg in zip(keys, args)}
+        res = function(data[index], **kwargs, **constant_kwargs)
+        if out.dtype.kind != "O":
+            res = np.asarray(res)
+            if not np.can_cast(res.dtype, out.dtype, casting="same_kind"):
+                raise ValueError(
+                    f"The result of the function at the navigation index "
+                    f"{index} of a block has dtype {res.dtype}, which can "
+                    f"not be stored in the dtype {out.dtype} of the lazy "
+                    "result.")
+        out[index] = res
+    return out
+
+
 class LazySignal(BaseSignal):
     """A Lazy Signal instance that delays computation until explicitly saved
     (assuming storing the full result of computation in memory is not feasible)
     """
     _lazy = True
+    # See NavigationBlockStream
+    _navigation_block = None
 
-    def compute(self, close_file=False, show_progressbar=None, **kwargs):
+    def compute(self, close_file=False, show_progressbar=None,
+                scheduler=None, **kwargs):
         """Attempt to store the full signal in memory.
 
         Parameters
@@ -97,6 +155,11 @@ def compute(self, close_file=False, show_progressbar=None, **kwargs):
             array data if any. Note that closing the file will make all other
             associated lazy signals inoperative.
         %s
+        scheduler : None, str or dask.distributed.Client, default None
+            The dask scheduler to use: one of ``"default"``, ``"threads"``,
+            ``"processes"``, ``"synchronous"`` and ``"distributed"``, or a
+            ``dask.distributed.Client``. If None,
+            ``preferences.General.dask_scheduler`` is used.
 
         Returns
         -------
@@ -114,11 +177,13 @@ def compute(self, close_file=False, show_progressbar=None, **kwargs):
         if show_progressbar is None:
             show_progressbar = preferences.General.show_progressbar
 
-        cm = ProgressBar if show_progressbar else dummy_context_manager
+        scheduler = dask_scheduler.get_scheduler(scheduler)
+        # The progress bar of dask only works with the local schedulers
+        cm = ProgressBar if show_progressbar and not \
+            dask_scheduler.is_client(scheduler) else dummy_context_manager
 
         with cm():
-            da = self.data
-            data = da.compute()
+            data, = dask_scheduler.compute(self.data, scheduler=scheduler)
             if close_file:
                 self.close_file()
             self.data = data
@@ -128,6 +193,156 @@ def compute(self, close_file=False, show_progressbar=None, **kwargs):
 
     compute.__doc__ %= SHOW_PROGRESSBAR_ARG
 
+    def persist(self, to="disk", path=None, show_progressbar=None,
+                scheduler=None):
+        """Compute the data and keep the result, still as a lazy signal, so
+        that the following operations start from it instead of recomputing
+        all the previous lazy operations.
+
+        Parameters
+        ----------
+        to : {"disk", "memory"}, default "disk"
+            If "disk", the data is written in a chunked zarr directory (or
+            HDF5 file) and read back lazily from it. If "memory", the chunks
+            are kept in memory (see :py:meth:`dask.array.Array.persist`).
+        path : None or str
+            The zarr directory, if it ends with ".zarr", or the HDF5 file to
+            write when `to` is "disk". If None, a temporary zarr directory is
+            created if zarr is installed, and a temporary HDF5 file
+            otherwise, which is deleted when the data is no longer used, or
+            at the end of the session. The data persisted in HDF5 files can
+            only be computed with the "threads" and "synchronous"
+            schedulers.
+        %s
+        scheduler : None, str or dask.distributed.Client, default None
+            The dask scheduler to use, see :py:meth:`compute`.
+
+        See Also
+        --------
+        compute
+
+        Examples
+        --------
+        >>> s = hs.load("big_file.hspy", lazy=True)
+        >>> s2 = s.rebin(scale=(2, 2, 1))
+        >>> s2.persist()
+        >>> s2.decomposition(algorithm="PCA", output_dimension=10)
+
+        """
+        if to not in ("disk", "memory"):
+            raise ValueError(
+                f"'{to}' is not a valid value for `to`, it must be 'disk' or "
+                "'memory'.")
+        if show_progressbar is None:
+            show_progressbar = preferences.General.show_progressbar
+        scheduler = dask_scheduler.get_scheduler(scheduler)
+        cm = ProgressBar if show_progressbar and not \
+            dask_scheduler.is_client(scheduler) else dummy_context_manager
+        self._make_lazy()
+        with cm():
+            if to == "disk":
+                data = persist_to_disk(self.data, path=path,
+                                       scheduler=scheduler)
+            elif scheduler is None:
+                data = self.data.persist()
+            else:
+                data = self.data.persist(scheduler=scheduler)
+        self.data = data
+
+    persist.__doc__ %= SHOW_PROGRESSBAR_ARG
+
+    def compute_navigator(self, show_progressbar=None):
+        """Compute the navigator used by :py:meth:`plot` with
+        ``navigator="auto"``, i.e. the sum over the signal axes, one chunk
+        of the navigation space at a time.
+
+        The navigator is kept in memory for the rest of the session and
+        saved with the signal in hspy files, so that it is not computed
+        again when plotting the signal.
+
+        Parameters
+        ----------
+        %s
+
+        Returns
+        -------
+        navigator : BaseSignal
+
+        """
+        if show_progressbar is None:
+            show_progressbar = preferences.General.show_progressbar
+        navigator, _ = self._get_navigator(show_progressbar=show_progressbar)
+        return navigator
+
+    compute_navigator.__doc__ %= SHOW_PROGRESSBAR_ARG
+
+    def _get_navigator(self, background=False, show_progressbar=False,
+                       cached=True):
+        """Return the navigator signal and the NavigatorComputation computing
+        it, or None if it was already computed.
+
+        If `background` is True, only the first chunk is computed before
+        returning and the remaining ones are computed in a background thread.
+        If `cached` is False, the navigator is computed even if it is in the
+        cache, e.g. because the data changed in place.
+        """
+        am = self.axes_manager
+        data = None
+        if cached:
+            data = get_cached_navigator(
+                self.data, tuple(am._navigation_shape_in_array))
+        computation = None
+        if data is None:
+            computation = NavigatorComputation(self)
+            data = computation.navigator
+            if background:
+                computation.compute_block()
+                if not computation.done:
+                    computation.start()
+            else:
+                computation.run(show_progressbar=show_progressbar)
+        navigator = self._get_navigation_signal(data=data)
+        navigator.metadata.General.title = self.metadata.General.title
+        if am.navigation_dimension > 2:
+            # A view, which is updated by the computation
+            navigator = navigator.as_signal2D((0, 1), optimize=False)
+        return navigator, computation
+
+    def _update_navigator_plot(self, computation):
+        """Update the navigator plot as the chunks of the navigator are
+        computed in the background."""
+        self._stop_navigator_update()
+        navigator_plot = self._plot.navigator_plot
+        if navigator_plot is None or navigator_plot.figure is None:
+            return
+        timer = navigator_plot.figure.canvas.new_timer(interval=500)
+        computed = [computation.computed]
+
+        def update():
+            if computation.computed != computed[0]:
+                computed[0] = computation.computed
+                navigator_plot.update()
+            if computation.done:
+                timer.stop()
+
+        def close():
+            timer.stop()
+            computation.stop()
+
+        timer.add_callback(update)
+        timer.start()
+        navigator_plot.events.closed.connect(close, [])
+        # Keep a reference to the timer
+        self._navigator_update = (computation, timer)
+
+    def _stop_navigator_update(self):
+        """Stop the computation of the navigator of the plot, if any."""
+        computation, timer = getattr(self, '_navigator_update', (None, None))
+        if computation is not None:
+            timer.stop()
+            computation.stop()
+            self._navigator_update = (None, None)
+
     def close_file(self):
         """Closes the associated data file if any.
 
@@ -137,7 +352,10 @@ def close_file(self):
         """
         arrkey = None
         for key in self.data.dask.keys():
-            if "array-original" in key:
+            # The key of the source array is "original-<name>" since dask 2.0
+            if "array-original" in key or (
+                    isinstance(key, str) and key.startswith("original-") and
+                    hasattr(self.data.dask[key], "file")):
                 arrkey = key
                 break
         if arrkey:
@@ -146,12 +364,16 @@ def close_file(self):
             except AttributeError:
                 _logger.exception("Failed to close lazy Signal file")
 
-    def _get_dask_chunks(self, axis=None, dtype=None):
+    def _get_dask_chunks(self, axis=None, dtype=None, operation="iterate"):
         """Returns dask chunks.
 
         Aims:
             - Have at least one signal (or specified axis) in a single chunk,
-              or as many as fit in memory
+              or as many as fit in ``preferences.General.lazy_chunk_size``
+            - Be multiples of the chunks of the file the data is read from
+            - Keep the current chunks if they suit the operation
+
+        See :py:mod:`~hyperspy.misc.chunk_planner` for details.
 
         Parameters
         ----------
@@ -161,6 +383,12 @@ def _get_dask_chunks(self, axis=None, dtype=None):
             only that particular axis is guaranteed to be "not sliced".
         dtype : {string, np.dtype}
             The dtype of target chunks.
+        operation : {"iterate", "reduce"}
+            If "iterate" (default), the chunks are planned for an operation
+            along `axis` at every position of the other axes (e.g. ``map``,
+            ``decomposition`` or ``transpose``). If "reduce", for a reduction
+            along `axis`: no axis needs to be in a single chunk, but the
+            chunks are made as large as possible along `axis` first.
 
         Returns
         -------
@@ -184,46 +412,37 @@ def _get_dask_chunks(self, axis=None, dtype=None):
         elif not isinstance(dtype, np.dtype):
             dtype = np.dtype(dtype)
         typesize = max(dtype.itemsize, dc.dtype.itemsize)
-        want_to_keep = multiply([ax.size for ax in need_axes]) * typesize
-
-        # @mrocklin reccomends to have around 100MB chunks, so we do that:
-        num_that_fit = int(100. * 2.**20 / want_to_keep)
-
-        # want to have at least one "signal" per chunk
-        if num_that_fit < 2:
-            chunks = [tuple(1 for _ in range(i)) for i in dc.shape]
-            for ax in need_axes:
-                chunks[ax.index_in_array] = dc.shape[ax.index_in_array],
-            return tuple(chunks)
-
-        sizes = [
-            ax.size for ax in self.axes_manager._axes if ax not in need_axes
-        ]
-        indices = [
-            ax.index_in_array for ax in self.axes_manager._axes
-            if ax not in need_axes
-        ]
-
-        while True:
-            if multiply(sizes) <= num_that_fit:
-                break
-
-            i = np.argmax(sizes)
-            sizes[i] = np.floor(sizes[i] / 2)
-        chunks = []
-        ndim = len(dc.shape)
-        for i in range(ndim):
-            if i in indices:
-                size = float(dc.shape[i])
-                split_array = np.array_split(
-                    np.arange(size), np.ceil(size / sizes[indices.index(i)]))
-                chunks.append(tuple(len(sp) for sp in split_array))
-            else:
-                chunks.append((dc.shape[i], ))
-        return tuple(chunks)
+        max_nbytes = int(preferences.General.lazy_chunk_size * 2 ** 20)
+        # The axes manager can be ahead of the data, e.g. when slicing
+        indices = tuple(ax.index_in_array for ax in need_axes
+                        if ax.index_in_array < len(dcshape))
+        if operation == "reduce":
+            keep_axes, grow_axes = (), indices
+        elif operation == "iterate":
+            keep_axes, grow_axes = indices, ()
+        else:
+            raise ValueError(
+                f"'{operation}' is not a valid operation, it must be "
+                "'iterate' or 'reduce'.")
 
-    def _make_lazy(self, axis=None, rechunk=False, dtype=None):
-        self.data = self._lazy_data(axis=axis, rechunk=rechunk, dtype=dtype)
+        if isinstance(dc, da.Array):
+            start = tuple(c[0] if c else 0 for c in dc.chunks)
+            units = chunk_planner.get_storage_chunks(dc)
+        else:
+            start = units = None
+        chunks = chunk_planner.plan_chunks(
+            dc.shape, typesize, max_nbytes, keep_axes=keep_axes,
+            grow_axes=grow_axes, start=start, units=units)
+        if isinstance(dc, da.Array) and chunk_planner.chunks_fit(
+                dc.chunks, typesize, max_nbytes, chunks, keep_axes):
+            # Avoid rechunking repeatedly in a chain of lazy operations
+            return dc.chunks
+        return chunks
+
+    def _make_lazy(self, axis=None, rechunk=False, dtype=None,
+                   operation="iterate"):
+        self.data = self._lazy_data(axis=axis, rechunk=rechunk, dtype=dtype,
+                                    operation=operation)
 
     def change_dtype(self, dtype, rechunk=True):
         from hyperspy.misc import rgb_tools
@@ -234,7 +453,8 @@ def change_dtype(self, dtype, rechunk=True):
         super().change_dtype(dtype)
     change_dtype.__doc__ = BaseSignal.change_dtype.__doc__
 
-    def _lazy_data(self, axis=None, rechunk=True, dtype=None):
+    def _lazy_data(self, axis=None, rechunk=True, dtype=None,
+                   operation="iterate"):
         """Return the data as a dask array, rechunked if necessary.
 
         Parameters
@@ -248,12 +468,16 @@ def _lazy_data(self, axis=None, rechunk=True, dtype=None):
             not rechunk at least the data is not a dask array, in which case
             it chunks as if rechunk was `True`. If "dask_auto", rechunk if
             necessary using dask's automatic chunk guessing.
+        operation: {"iterate", "reduce"}
+            The operation that the chunks are planned for, see
+            :py:meth:`_get_dask_chunks`.
 
         """
         if rechunk == "dask_auto":
             new_chunks = "auto"
         else:
-            new_chunks = self._get_dask_chunks(axis=axis, dtype=dtype)
+            new_chunks = self._get_dask_chunks(axis=axis, dtype=dtype,
+                                               operation=operation)
         if isinstance(self.data, da.Array):
             res = self.data
             if self.data.chunks != new_chunks and rechunk:
@@ -288,11 +512,9 @@ def get_dask_function(numpy_name):
         if len(ar_axes) == 1:
             ar_axes = ar_axes[0]
         # For reduce operations the actual signal and navigation
-        # axes configuration does not matter. Hence we leave
-        # dask guess the chunks
-        if rechunk is True:
-            rechunk = "dask_auto"
-        current_data = self._lazy_data(rechunk=rechunk)
+        # axes configuration does not matter, only the reduced axes
+        current_data = self._lazy_data(axis=axes, rechunk=rechunk,
+                                       operation="reduce")
         # Apply reducing function
         new_data = function(current_data, axis=ar_axes)
         if not new_data.ndim:
@@ -520,24 +742,37 @@ def _map_iterate(self,
                      max_workers=None,
                      ragged=None,
                      inplace=True,
+                     out_filename=None,
                      **kwargs):
         if ragged not in (True, False):
             raise ValueError('"ragged" kwarg has to be bool for lazy signals')
+        if out_filename is not None:
+            raise ValueError(
+                '"out_filename" is not supported for lazy signals, save the '
+                'result instead.')
         _logger.debug("Entering '_map_iterate'")
 
+        nav_shape = self.axes_manager.navigation_shape
+        if all(isinstance(value, BaseSignal) and (
+                value.axes_manager.navigation_size < 2 or
+                value.axes_manager.navigation_shape == nav_shape)
+               for key, value in iterating_kwargs):
+            return self._map_iterate_blockwise(
+                function, iterating_kwargs=iterating_kwargs,
+                show_progressbar=show_progressbar, ragged=ragged,
+                inplace=inplace, **kwargs)
+
         size = max(1, self.axes_manager.navigation_size)
         from hyperspy.misc.utils import (create_map_objects,
                                          map_result_construction)
         func, iterators = create_map_objects(function, size, iterating_kwargs,
                                              **kwargs)
-        iterators = (self._iterate_signal(), ) + iterators
+        iterators = (self._iterate_signal(lazy=not ragged), ) + iterators
         res_shape = self.axes_manager._navigation_shape_in_array
         # no navigation
         if not len(res_shape) and ragged:
             res_shape = (1,)
 
-        all_delayed = [dd(func)(data) for data in zip(*iterators)]
-
         if ragged:
             if inplace:
                 raise ValueError("In place computation is not compatible with "
@@ -546,40 +781,38 @@ def _map_iterate(self,
             # index, which means we can't predict the shape and the dtype needs
             # to be python object to support numpy ragged array
             sig_shape = ()
-            sig_dtype = np.dtype('O')
-        else:
-            one_compute = all_delayed[0].compute()
-            # No signal dimension for scalar
-            if np.isscalar(one_compute):
-                sig_shape = ()
-                sig_dtype = type(one_compute)
-            else:
-                sig_shape = one_compute.shape
-                sig_dtype = one_compute.dtype
-        pixels = [
-            da.from_delayed(
-                res, shape=sig_shape, dtype=sig_dtype) for res in all_delayed
-        ]
-        if ragged:
             if show_progressbar is None:
-                from hyperspy.defaults_parser import preferences
                 show_progressbar = preferences.General.show_progressbar
             # We compute here because this is not sure if this is possible
             # to make a ragged dask array: we need to provide a chunk size...
-            res_data = np.empty(res_shape, dtype=sig_dtype)
+            res_data = np.empty(res_shape, dtype='O')
             _logger.info("Lazy signal is computed to make the ragged array.")
-            if show_progressbar:
-                cm = ProgressBar
-            else:
-                cm = dummy_context_manager
-            with cm():
+            # The data is computed one navigation block at a time, see
+            # _iterate_signal
+            with progressbar(total=size, disable=not show_progressbar,
+                             leave=True) as pbar:
                 try:
-                    for i, pixel in enumerate(pixels):
-                        res_data.flat[i] = pixel.compute()
+                    for i, data in enumerate(zip(*iterators)):
+                        res_data.flat[i] = func(data)
+                        pbar.update(1)
                 except MemoryError:
                     raise MemoryError("The use of 'ragged' array requires the "
                                       "computation of the lazy signal.")
         else:
+            all_delayed = [dd(func)(data) for data in zip(*iterators)]
+            one_compute = all_delayed[0].compute()
+            # No signal dimension for scalar
+            if np.isscalar(one_compute):
+                sig_shape = ()
+                sig_dtype = type(one_compute)
+            else:
+                sig_shape = one_compute.shape
+                sig_dtype = one_compute.dtype
+            pixels = [
+                da.from_delayed(
+                    res, shape=sig_shape, dtype=sig_dtype)
+                for res in all_delayed
+            ]
             if len(pixels) > 0:
                 for step in reversed(res_shape):
                     _len = len(pixels)
@@ -596,7 +829,179 @@ def _map_iterate(self,
 
         return res
 
-    def _iterate_signal(self):
+    def _map_iterate_blockwise(self,
+                               function,
+                               iterating_kwargs=(),
+                               show_progressbar=None,
+                               ragged=False,
+                               inplace=True,
+                               **kwargs):
+        """Apply the function to every navigation pixel, one dask task per
+        navigation chunk.
+
+        The iterating kwargs must be signals with either the same navigation
+        shape as this signal, in which case they are rechunked to match the
+        navigation chunks of the data, or a navigation size smaller than 2,
+        in which case they are constant.
+        """
+        from hyperspy.misc.utils import map_result_construction
+
+        if ragged and inplace:
+            raise ValueError("In place computation is not compatible with "
+                             "ragged array for lazy signal.")
+        nav_dim = self.axes_manager.navigation_dimension
+        # the signal axes can not be split
+        data = _get_iteration_data(self, self._lazy_data(rechunk=True))
+        nav_chunks = data.chunks[:nav_dim]
+
+        iterating = tuple(key for key, value in iterating_kwargs)
+        constant_kwargs = {k: v for k, v in kwargs.items()
+                           if k not in iterating}
+        keys = []
+        args = []
+        for key, value in iterating_kwargs:
+            if value.axes_manager.navigation_size < 2:
+                constant_kwargs[key] = _unwrap_map_value(value())
+            else:
+                arg = _get_iteration_data(value, da.asarray(value.data))
+                arg = arg.rechunk(nav_chunks + (-1,) * (arg.ndim - nav_dim))
+                keys.append(key)
+                args.append(arg)
+        # The dask arrays are computed by the scheduler and passed whole to
+        # every block
+        constant_keys = [k for k, v in constant_kwargs.items()
+                         if isinstance(v, da.Array)]
+        constant_args = [constant_kwargs.pop(k) for k in constant_keys]
+        function = partial(function, **constant_kwargs)
+        map_block = partial(_map_block, function=function, keys=keys,
+                            constant_keys=constant_keys, nav_dim=nav_dim)
+
+        if ragged:
+            # Shape of the signal dimension will change for the each nav.
+            # index, which means we can't predict the shape and the dtype needs
+            # to be python object to support numpy ragged array
+            sig_shape = ()
+            sig_dtype = np.dtype('O')
+        else:
+            first = (slice(0, 1),) * nav_dim
+            one_compute = map_block(
+                *da.compute(data[first], *[arg[first] for arg in args],
+                            *constant_args),
+                sig_shape=(), dtype=np.dtype('O')).flat[0]
+            one_compute = np.asarray(one_compute)
+            sig_shape = one_compute.shape
+            sig_dtype = one_compute.dtype
+            if sig_dtype.kind in "iu":
+                # The dtype must be known before computing the other pixels,
+                # whose results may not be integers, e.g. NaN for the masked
+                # pixels: use a float to not truncate them
+                sig_dtype = np.result_type(sig_dtype, np.float64)
+
+        # Indices of the dimensions for da.blockwise: the navigation
+        # dimensions are shared, the signal dimensions of the inputs are
+        # contracted and the ones of the output are new.
+        nav_ind = tuple(range(nav_dim))
+        block_args = []
+        label = nav_dim
+        for arg in (data, *args):
+            ndim = arg.ndim - nav_dim
+            block_args += [arg, nav_ind + tuple(range(label, label + ndim))]
+            label += ndim
+        for arg in constant_args:
+            block_args += [arg, tuple(range(label, label + arg.ndim))]
+            label += arg.ndim
+        out_ind = nav_ind + tuple(range(label, label + len(sig_shape)))
+        res_data = da.blockwise(
+            partial(map_block, sig_shape=sig_shape, dtype=sig_dtype),
+            out_ind,
+            *block_args,
+            new_axes=dict(zip(out_ind[nav_dim:], sig_shape)),
+            dtype=sig_dtype,
+            concatenate=True,
+            align_arrays=False,
+        )
+
+        if ragged:
+            if show_progressbar is None:
+                show_progressbar = preferences.General.show_progressbar
+            # We compute here because this is not sure if this is possible
+            # to make a ragged dask array: we need to provide a chunk size...
+            _logger.info("Lazy signal is computed to make the ragged array.")
+            cm = ProgressBar if show_progressbar else dummy_context_manager
+            with cm():
+                try:
+                    res_data = res_data.compute()
+                except MemoryError:
+                    raise MemoryError("The use of 'ragged' array requires the "
+                                      "computation of the lazy signal.")
+            if not nav_dim:
+                res_data = res_data.reshape((1,))
+
+        return map_result_construction(
+            self, inplace, res_data, ragged, sig_shape, lazy=not ragged)
+
+    def __call__(self, axes_manager=None, fft_shift=False):
+        if axes_manager is None:
+            axes_manager = self.axes_manager
+        getitem = list(axes_manager._getitem_tuple)
+        data = self._get_navigation_chunk(getitem)
+        if data is None:
+            return super().__call__(axes_manager=axes_manager,
+                                    fft_shift=fft_shift)
+        # A copy, since the data in memory is shared with the other calls
+        value = np.array(data[tuple(getitem)], ndmin=1)
+        if fft_shift:
+            value = np.fft.fftshift(value)
+        return value
+
+    def _get_navigation_chunk(self, getitem):
+        """Return the data in memory containing the navigation position of
+        `getitem` and shift the navigation indices of `getitem` in place to
+        index it, or return None if the position is not in memory and can not
+        be cached.
+
+        The data is either the block loaded by a
+        :py:class:`NavigationBlockStream` or the chunk of the
+        :py:data:`chunk_cache`.
+        """
+        block = self._navigation_block
+        if block is not None:
+            axis, start, stop, data = block
+            index = getitem[axis]
+            if isinstance(index, (int, np.integer)) and start <= index < stop:
+                getitem[axis] = index - start
+                return data
+        am = self.axes_manager
+        if not (am.navigation_dimension and am.signal_dimension and
+                isinstance(self.data, da.Array) and chunk_cache.max_nbytes):
+            return None
+        nav_axes = tuple(axis.index_in_array for axis in am.navigation_axes)
+        cached = chunk_cache.get(
+            self.data, nav_axes, tuple(getitem[axis] for axis in nav_axes))
+        if cached is None:
+            return None
+        chunk, starts = cached
+        for axis, start in zip(nav_axes, starts):
+            getitem[axis] -= start
+        return chunk
+
+    def _iterate_signal(self, lazy=False):
+        """Iterate over the signal data.
+
+        The data is computed one block of the last navigation axis at a time
+        and the views of the data at each navigation index are yielded, while
+        the next block is computed in a background thread, see
+        :py:class:`NavigationBlockStream`. The blocks fit in
+        ``preferences.General.lazy_chunk_size``; if they can not, the data is
+        computed at each navigation index.
+
+        Parameters
+        ----------
+        lazy : bool, default False
+            If True, yield the dask arrays of the data at each navigation
+            index instead, without computing them.
+
+        """
         if self.axes_manager.navigation_size < 2:
             yield self()
             return
@@ -606,17 +1011,34 @@ def _iterate_signal(self):
         nav_lengths = np.atleast_1d(
             np.array(self.data.shape)[list(nav_indices)])
         getitem = [slice(None)] * (nav_dim + sig_dim)
-        data = self._lazy_data()
-        for indices in product(*[range(l) for l in nav_lengths]):
-            for res, ind in zip(indices, nav_indices):
-                getitem[ind] = res
-            yield data[tuple(getitem)]
+        if lazy:
+            data = self._lazy_data()
+            for indices in product(*[range(l) for l in nav_lengths]):
+                for res, ind in zip(indices, nav_indices):
+                    getitem[ind] = res
+                yield data[tuple(getitem)]
+            return
+        self._make_lazy()
+        with NavigationBlockStream([self]) as blocks:
+            # The first index is the index of the last navigation axis, along
+            # which the blocks are split
+            for indices in product(*[range(l) for l in nav_lengths]):
+                blocks.load(indices[0])
+                for res, ind in zip(indices, nav_indices):
+                    getitem[ind] = res
+                if blocks.block is None:
+                    yield dask_scheduler.compute(
+                        self.data[tuple(getitem)])[0]
+                    continue
+                getitem[blocks.axis] -= blocks.edges[blocks.block]
+                yield blocks.arrays[0][tuple(getitem)]
 
     def _block_iterator(self,
                         flat_signal=True,
-                        get=threaded.get,
+                        get=None,
                         navigation_mask=None,
-                        signal_mask=None):
+                        signal_mask=None,
+                        scheduler=None):
         """A function that allows iterating lazy signal data by blocks,
         defining the dask.Array.
 
@@ -628,17 +1050,28 @@ def _block_iterator(self,
             optionally masked elements missing. If false, returns
             the equivalent of s.inav[{blocks}].data, where masked elements are
             set to np.nan or 0.
-        get : dask scheduler
-            the dask scheduler to use for computations;
-            default `dask.threaded.get`
+        get : None or dask get function
+            Deprecated, use `scheduler` instead.
         navigation_mask : {BaseSignal, numpy array, dask array}
             The navigation locations marked as True are not returned (flat) or
             set to NaN or 0.
         signal_mask : {BaseSignal, numpy array, dask array}
             The signal locations marked as True are not returned (flat) or set
             to NaN or 0.
+        scheduler : None, str or dask.distributed.Client, default None
+            The dask scheduler to use, see :py:meth:`compute`. The next
+            block is computed while the current one is used, so that at most
+            two blocks are in memory (as futures with a
+            ``dask.distributed.Client``).
 
         """
+        if get is not None:
+            warnings.warn(
+                "The `get` keyword is deprecated and will be removed "
+                "in HyperSpy 2.0. Use `scheduler` instead.",
+                VisibleDeprecationWarning,
+            )
+            scheduler = get
         self._make_lazy()
         data = self._data_aligned_with_axes
         nav_chunks = data.chunks[:self.axes_manager.navigation_dimension]
@@ -677,10 +1110,10 @@ def _block_iterator(self,
                                  "{} was given".format(type(navigation_mask)))
         if flat_signal:
             nav_mask = ~nav_mask
-        for ind in indices:
-            chunk = get(data.dask,
-                        (data.name, ) + ind + (0,) * bool(signalsize))
-            n_mask = get(nav_mask.dask, (nav_mask.name, ) + ind)
+        blocks = dask_scheduler.compute_iter(
+            ((data.blocks[ind], nav_mask.blocks[ind]) for ind in indices),
+            scheduler=scheduler)
+        for chunk, n_mask in blocks:
             if flat_signal:
                 yield chunk[n_mask, ...][..., signal_mask]
             else:
@@ -698,10 +1131,11 @@ def decomposition(
         output_dimension=None,
         signal_mask=None,
         navigation_mask=None,
-        get=threaded.get,
+        get=None,
         num_chunks=None,
         reproject=True,
         print_info=True,
+        scheduler=None,
         **kwargs
     ):
         """Perform Incremental (Batch) decomposition on the data.
@@ -720,9 +1154,8 @@ def decomposition(
         output_dimension : int or None, default None
             Number of components to keep/calculate. If None, keep all
             (only valid for 'SVD' algorithm)
-        get : dask scheduler
-            the dask scheduler to use for computations;
-            default `dask.threaded.get`
+        get : None or dask get function
+            Deprecated, use `scheduler` instead.
         num_chunks : int or None, default None
             the number of dask chunks to pass to the decomposition model.
             More chunks require more memory, but should run faster. Will be
@@ -739,6 +1172,13 @@ def decomposition(
             If True, print information about the decomposition being performed.
             In the case of sklearn.decomposition objects, this includes the
             values of all arguments of the chosen sklearn algorithm.
+        scheduler : None, str or dask.distributed.Client, default None
+            The dask scheduler to use: one of ``"default"``, ``"threads"``,
+            ``"processes"``, ``"synchronous"`` and ``"distributed"``, or a
+            ``dask.distributed.Client``. If None,
+            ``preferences.General.dask_scheduler`` is used. The chunks are
+            computed by the scheduler while the previous ones are passed to
+            the decomposition algorithm.
         **kwargs
             passed to the partial_fit/fit functions.
 
@@ -765,6 +1205,15 @@ def decomposition(
             )
             kwargs.pop("bounds", None)
 
+        if get is not None:
+            warnings.warn(
+                "The `get` keyword is deprecated and will be removed "
+                "in HyperSpy 2.0. Use `scheduler` instead.",
+                VisibleDeprecationWarning,
+            )
+            scheduler = get
+        scheduler = dask_scheduler.get_scheduler(scheduler)
+
         # Deprecate 'ONMF' for 'ORNMF'
         if algorithm == "ONMF":
             warnings.warn(
@@ -785,19 +1234,6 @@ def decomposition(
         explained_variance = None
         explained_variance_ratio = None
 
-        _al_data = self._data_aligned_with_axes
-        nav_chunks = _al_data.chunks[: self.axes_manager.navigation_dimension]
-        sig_chunks = _al_data.chunks[self.axes_manager.navigation_dimension :]
-
-        num_chunks = 1 if num_chunks is None else num_chunks
-        blocksize = np.min([multiply(ar) for ar in product(*nav_chunks)])
-        nblocks = multiply([len(c) for c in nav_chunks])
-
-        if output_dimension and blocksize / output_dimension < num_chunks:
-            num_chunks = np.ceil(blocksize / output_dimension)
-
-        blocksize *= num_chunks
-
         # Initialize return_info and print_info
         to_return = None
         to_print = [
@@ -835,6 +1271,23 @@ def decomposition(
             raise ValueError("'algorithm' not recognised")
 
         original_data = self.data
+        if algorithm != "SVD":
+            # The online algorithms learn from one navigation chunk at a time
+            self._make_lazy(rechunk=True)
+
+        _al_data = self._data_aligned_with_axes
+        nav_chunks = _al_data.chunks[: self.axes_manager.navigation_dimension]
+        sig_chunks = _al_data.chunks[self.axes_manager.navigation_dimension :]
+
+        num_chunks = 1 if num_chunks is None else num_chunks
+        blocksize = np.min([multiply(ar) for ar in product(*nav_chunks)])
+        nblocks = multiply([len(c) for c in nav_chunks])
+
+        if output_dimension and blocksize / output_dimension < num_chunks:
+            num_chunks = np.ceil(blocksize / output_dimension)
+
+        blocksize *= num_chunks
+
         try:
             _logger.info("Performing decomposition analysis")
 
@@ -856,9 +1309,10 @@ def decomposition(
                 )
                 ndim = self.axes_manager.navigation_dimension
                 sdim = self.axes_manager.signal_dimension
-                bH, aG = da.compute(
+                bH, aG = dask_scheduler.compute(
                     data.sum(axis=tuple(range(ndim))),
                     data.sum(axis=tuple(range(ndim, ndim + sdim))),
+                    scheduler=scheduler,
                 )
                 bH = da.where(sm, bH, 1)
                 aG = da.where(nm, aG, 1)
@@ -907,7 +1361,7 @@ def decomposition(
                     for chunk in progressbar(
                         self._block_iterator(
                             flat_signal=True,
-                            get=get,
+                            scheduler=scheduler,
                             signal_mask=signal_mask,
                             navigation_mask=navigation_mask,
                         ),
@@ -964,7 +1418,7 @@ def post(a):
                     lambda thing: method(thing),
                     self._block_iterator(
                         flat_signal=True,
-                        get=get,
+                        scheduler=scheduler,
                         signal_mask=signal_mask,
                         navigation_mask=navigation_mask,
                     ),
@@ -1052,3 +1506,305 @@ def split_stack_list(what, step, axis):
         return all_chunks
     else:
         return array
+
+
+class NavigationBlockStream:
+    """Keep in memory the data of lazy signals for one block of the
+    navigation space at a time, computing the next block in a background
+    thread.
+
+    The blocks are split along the last navigation axis, i.e. the axis that
+    changes the slowest when iterating over the navigation space with the
+    axes manager (with both the "flyback" and the "serpentine" iteration
+    paths). They are made of whole chunks of the first signal along this
+    axis if possible, and split so that the block in memory and the next
+    block of all the signals fit in ``preferences.General.lazy_chunk_size``.
+    If a single index of this axis does not fit, no block is loaded and the
+    data is read pixel by pixel. While a block is loaded, calling the
+    signals returns the data from memory instead of computing the dask array
+    at every position.
+
+    Parameters
+    ----------
+    signals : list of BaseSignal
+        Signals with the same navigation shape and the same array order of
+        the axes. The signals that are not lazy are ignored.
+
+    Attributes
+    ----------
+    block : None or int
+        The index of the block in memory, always None if the blocks do not
+        fit in memory.
+    arrays : None or list of numpy.ndarray
+        The data of the signals in the block in memory.
+    axis : int
+        The array axis along which the blocks are split.
+    edges : numpy.ndarray
+        The limits of the blocks along `axis`.
+
+    Examples
+    --------
+    >>> with NavigationBlockStream([s]) as blocks:
+    ...     for index in s.axes_manager:
+    ...         blocks.load(index[-1])
+    ...         spectrum = s()
+
+    """
+
+    def __init__(self, signals):
+        self.signals = [signal for signal in signals
+                        if isinstance(signal, LazySignal)]
+        self.axis = None
+        self.edges = ()
+        self.block = None
+        self.arrays = None
+        self._next = None
+        self._executor = None
+        if not self.signals or \
+                not self.signals[0].axes_manager.navigation_dimension:
+            return
+        am = self.signals[0].axes_manager
+        self.axis = am.navigation_axes[-1].index_in_array
+        chunks = self.signals[0].data.chunks[self.axis]
+        # The block in memory and the next one must fit
+        max_nbytes = int(preferences.General.lazy_chunk_size * 2 ** 20) // 2
+        index_nbytes = sum(
+            signal.data.nbytes // max(1, signal.data.shape[self.axis])
+            for signal in self.signals)
+        if index_nbytes > max_nbytes:
+            _logger.info("The navigation blocks do not fit in memory, the "
+                         "data is read pixel by pixel.")
+            return
+        planned = chunk_planner.plan_chunks(
+            (sum(chunks), ), index_nbytes, max_nbytes,
+            units=(max(chunks), ))[0]
+        # Split the chunks that are larger than the planned blocks
+        self.edges = np.union1d(np.cumsum((0,) + chunks),
+                                np.cumsum((0,) + planned))
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def _compute(self, block):
+        getitem = (slice(None), ) * self.axis + (
+            slice(self.edges[block], self.edges[block + 1]), )
+        return dask_scheduler.compute(*[signal.data[getitem]
+                                        for signal in self.signals])
+
+    def load(self, index):
+        """Make sure that the block containing the position `index` of the
+        last navigation axis is in memory, and start computing the next
+        block.
+
+        Parameters
+        ----------
+        index : int
+        """
+        if self._executor is None:
+            return
+        if self.block is not None and \
+                self.edges[self.block] <= index < self.edges[self.block + 1]:
+            return
+        block = int(np.searchsorted(self.edges, index, side="right")) - 1
+        # Release the current block before loading the next one
+        self._set_block(None, None)
+        if self._next is not None and self._next[0] == block:
+            arrays = self._next[1].result()
+        else:
+            if self._next is not None:
+                self._next[1].cancel()
+            arrays = self._compute(block)
+        self._next = None
+        self._set_block(block, arrays)
+        if block + 2 < len(self.edges):
+            self._next = (block + 1,
+                          self._executor.submit(self._compute, block + 1))
+
+    def _set_block(self, block, arrays):
+        self.block = block
+        self.arrays = arrays
+        for i, signal in enumerate(self.signals):
+            if block is None:
+                signal._navigation_block = None
+            else:
+                signal._navigation_block = (
+                    self.axis, self.edges[block], self.edges[block + 1],
+                    arrays[i])
+
+    def close(self):
+        """Release the block in memory and stop the background thread."""
+        self._set_block(None, None)
+        if self._next is not None:
+            self._next[1].cancel()
+            self._next = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class NavigationChunkCache:
+    """Least recently used cache of the navigation chunks of lazy signals.
+
+    Reading the data of a lazy signal at one navigation position, e.g. when
+    plotting it, reads (and decompresses) the full chunk of the file that
+    contains it. The cache keeps the most recently used chunks in memory, up
+    to ``preferences.General.lazy_chunk_cache_size`` megabytes, so that
+    navigating within a chunk does not read it again. When moving to a new
+    chunk, the next chunk in the direction of travel is computed in a
+    background thread.
+
+    The chunks are identified by the name of the dask array, which changes
+    whenever the array changes.
+
+    """
+
+    def __init__(self):
+        self._chunks = OrderedDict()
+        self._nbytes = 0
+        self._pending = {}
+        self._last_block = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    @property
+    def max_nbytes(self):
+        """The maximum size of the cache in bytes."""
+        return int(preferences.General.lazy_chunk_cache_size * 2 ** 20)
+
+    @property
+    def nbytes(self):
+        """The size of the chunks in the cache in bytes."""
+        return self._nbytes
+
+    def __len__(self):
+        return len(self._chunks)
+
+    def get(self, data, nav_axes, indices):
+        """Return the chunk of `data` containing a navigation position.
+
+        Parameters
+        ----------
+        data : dask.array.Array
+        nav_axes : tuple of int
+            The array axes of the navigation axes.
+        indices : tuple of int
+            The indices of the navigation position along `nav_axes`.
+
+        Returns
+        -------
+        None or tuple
+            The chunk, with the full signal axes, and the indices of its
+            first element along `nav_axes`. None if the chunk is larger
+            than the cache.
+        """
+        edges = [np.cumsum((0, ) + data.chunks[axis]) for axis in nav_axes]
+        block = tuple(int(np.searchsorted(edge, index, side="right")) - 1
+                      for edge, index in zip(edges, indices))
+        key = (data.name, nav_axes, block)
+        with self._lock:
+            chunk = self._chunks.get(key)
+            if chunk is not None:
+                self._chunks.move_to_end(key)
+            future = self._pending.get(key)
+        if chunk is None:
+            if future is not None:
+                chunk = future.result()
+            elif self._chunk_nbytes(data, edges, block) > self.max_nbytes:
+                return None
+            else:
+                chunk = self._compute(key, data, edges, block)
+        self._prefetch(data, nav_axes, edges, block)
+        starts = tuple(int(edge[i]) for edge, i in zip(edges, block))
+        return chunk, starts
+
+    @staticmethod
+    def _chunk_nbytes(data, edges, block):
+        nav_size = multiply([edge[-1] for edge in edges])
+        if not nav_size:
+            return 0
+        block_size = multiply([edge[i + 1] - edge[i]
+                               for edge, i in zip(edges, block)])
+        return data.nbytes // nav_size * block_size
+
+    @staticmethod
+    def _getitem(data, nav_axes, edges, block):
+        getitem = [slice(None)] * data.ndim
+        for axis, edge, i in zip(nav_axes, edges, block):
+            getitem[axis] = slice(edge[i], edge[i + 1])
+        return tuple(getitem)
+
+    def _compute(self, key, data, edges, block):
+        _, nav_axes, _ = key
+        chunk, = dask_scheduler.compute(
+            data[self._getitem(data, nav_axes, edges, block)])
+        # The chunk is shared by all the signals with the same data
+        chunk = np.asarray(chunk).view()
+        chunk.flags.writeable = False
+        with self._lock:
+            self._store(key, chunk)
+        return chunk
+
+    def _store(self, key, chunk):
+        if chunk.nbytes > self.max_nbytes:
+            return
+        old = self._chunks.pop(key, None)
+        if old is not None:
+            self._nbytes -= old.nbytes
+        self._chunks[key] = chunk
+        self._nbytes += chunk.nbytes
+        while self._nbytes > self.max_nbytes:
+            _, old = self._chunks.popitem(last=False)
+            self._nbytes -= old.nbytes
+
+    def _prefetch(self, data, nav_axes, edges, block):
+        with self._lock:
+            last = self._last_block.get((data.name, nav_axes))
+            self._last_block[(data.name, nav_axes)] = block
+        if last is None or last == block:
+            return
+        # The next chunk in the direction of travel
+        following = tuple(i + int(np.sign(i - j)) for i, j in zip(block, last))
+        if not all(0 <= i < len(edge) - 1 for i, edge in zip(following, edges)):
+            return
+        if self._chunk_nbytes(data, edges, following) > self.max_nbytes:
+            return
+        key = (data.name, nav_axes, following)
+        with self._lock:
+            if key in self._chunks or key in self._pending:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1)
+            self._pending[key] = self._executor.submit(
+                self._prefetch_chunk, key, data, edges, following)
+
+    def _prefetch_chunk(self, key, data, edges, block):
+        try:
+            return self._compute(key, data, edges, block)
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def clear(self):
+        """Remove all the chunks from the cache."""
+        with self._lock:
+            self._chunks.clear()
+            self._nbytes = 0
+            self._last_block.clear()
+
+    def close(self):
+        """Stop the background thread and clear the cache."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            # Wait for the chunk being prefetched, if any, before clearing
+            executor.shutdown(wait=True)
+        self.clear()
+
+
+#: The cache of the navigation chunks of all lazy signals
+chunk_cache = NavigationChunkCache()
+atexit.register(chunk_cache.close)
@@ -17,6 +17,7 @@
 # along with  HyperSpy.  If not, see <http://www.gnu.org/licenses/>.
 
 import numpy as np
+from numpy.lib.recfunctions import repack_fields
 from dask.array import Array as dArray
 import traits.api as t
 from traits.trait_numeric import Array
@@ -124,6 +125,9 @@ class Parameter(t.HasTraits):
     _axes_manager = None
     __ext_bounded = False
     __ext_force_positive = False
+    # True if the component function is linear in this parameter, so that it
+    # can be fitted with the "linear" optimizer
+    _linear = False
 
     # traitsui bugs out trying to make an editor for this, so always specify!
     # (it bugs out, because both editor shares the object, and Array editors
@@ -567,8 +571,13 @@ def _create_array(self):
                 ('values', 'float'),
                 ('std', 'float'),
                 ('is_set', 'bool')])
+        # The map can be a view into the parameter store of the model, see
+        # hyperspy.model.ParameterStore, whose dtype has the same fields
+        # but different offsets
         if (self.map is None or self.map.shape != shape or
-                self.map.dtype != dtype_):
+                self.map.dtype.names != dtype_.names or
+                any(self.map.dtype[name] != dtype_[name]
+                    for name in dtype_.names)):
             self.map = np.zeros(shape, dtype_)
             self.map['std'].fill(np.nan)
             # TODO: in the future this class should have access to
@@ -702,6 +711,10 @@ def as_dictionary(self, fullcopy=True):
         """
         dic = {'_twins': [id(t) for t in self._twins]}
         export_to_dictionary(self, self._whitelist, dic, fullcopy)
+        if isinstance(dic.get('map'), np.ndarray):
+            # Pack the map when it is a view into the parameter store of the
+            # model, which would otherwise include the other parameters
+            dic['map'] = repack_fields(dic['map'])
         return dic
 
     def default_traits_view(self):
@@ -48,6 +48,16 @@ def add_np(doctest_namespace):
     doctest_namespace['hs'] = hs
 
 
+@pytest.fixture(autouse=True, scope="session")
+def gos_cache_path(tmp_path_factory):
+    # Do not write the GOS cache in the configuration directory of the user
+    from hyperspy.misc.eels import gos_cache
+    cache_path = gos_cache.cache_path
+    gos_cache.cache_path = tmp_path_factory.mktemp("EELS_GOS_cache")
+    yield gos_cache.cache_path
+    gos_cache.cache_path = cache_path
+
+
 @pytest.fixture
 def pdb_cmdopt(request):
     return request.config.getoption("--pdb")
@@ -111,6 +111,39 @@ class GeneralConfig(t.HasTraits):
         desc='Attempt to use ipywidgets progressbar'
     )
 
+    lazy_chunk_cache_size = t.CFloat(
+        256.,
+        label='Lazy chunk cache size (MB)',
+        desc='Maximum memory, in megabytes, used to keep in memory the '
+        'chunks of lazy signals read when navigating them, e.g. when '
+        'plotting. Set to 0 to disable the cache.'
+    )
+
+    lazy_chunk_size = t.CFloat(
+        100.,
+        label='Lazy chunk size (MB)',
+        desc='Maximum size, in megabytes, of the chunks of lazy signals '
+        'when they are rechunked for an operation.'
+    )
+
+    dask_scheduler = t.Enum(
+        ['default', 'threads', 'processes', 'synchronous', 'distributed'],
+        label='Dask scheduler',
+        desc='The dask scheduler used to compute lazy signals. "default" '
+        'uses the scheduler configured in dask, "synchronous" computes in '
+        'the calling thread (useful for debugging) and "distributed" uses a '
+        'dask.distributed cluster (requires the distributed package).'
+    )
+
+    dask_scheduler_address = t.Str(
+        '',
+        label='Dask distributed scheduler address',
+        desc='The address of the dask.distributed scheduler to connect to '
+        'when the "distributed" scheduler is used, e.g. '
+        '"tcp://127.0.0.1:8786". If empty, the current dask.distributed '
+        'client is used or a local cluster is started.'
+    )
+
     def _logger_on_changed(self, old, new):
         if new is True:
             turn_logging_on()
@@ -123,6 +156,11 @@ class EELSConfig(t.HasTraits):
         guess_gos_path(),
         label='GOS directory',
         desc='The GOS files are required to create the EELS edge components')
+    eels_gos_disk_cache = t.CBool(
+        True,
+        label='Cache the integrated GOS on disk',
+        desc='If enabled, the integrated GOS are stored in the HyperSpy '
+        'configuration folder and reused in following sessions.')
 
 
 class GUIs(t.HasTraits):
@@ -50,6 +50,13 @@
                   optimization method. It does support bounds on parameters. See
                   :py:func:`scipy.optimize.shgo` for more details on available
                   options. Requires ``scipy >= 1.2.0``.
+                * "linear" solves the least-squares problem directly, without
+                  iterating, and it is only available for models that are linear
+                  in their free parameters, e.g. when only the amplitudes of
+                  components with fixed shape are free. It does not support
+                  bounds on parameters. In :py:meth:`~hyperspy.model.BaseModel.multifit`,
+                  all navigation indices are solved at once when the fixed
+                  parameters have the same value at all of them.
 
         loss_function : {"ls", "ML-poisson", "huber", callable}, default "ls"
             The loss function to use for minimization. Only ``"ls"`` is available
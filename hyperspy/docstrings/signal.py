@@ -67,15 +67,20 @@
            the preferences settings is used."""
 
 PARALLEL_ARG = \
-    """parallel : None or bool
-           If ``True``, perform computation in parallel using multithreading. If
-           ``None``, the default from the preferences settings is used. The number
-           of threads is controlled by the ``max_workers`` argument."""
+    """parallel : None, bool or "processes"
+           If ``True``, perform computation in parallel using multithreading.
+           If ``"processes"``, use a pool of processes instead, which is faster
+           for functions that hold the global interpreter lock; the function
+           and its arguments must then be serialisable with :py:mod:`dill`.
+           If ``None``, the default from the preferences settings is used. The
+           number of threads or processes is controlled by the
+           ``max_workers`` argument."""
 
 MAX_WORKERS_ARG = \
     """max_workers : None or int
-           Maximum number of threads used when ``parallel=True``. If None, defaults
-           to ``min(32, os.cpu_count())``."""
+           Maximum number of threads used when ``parallel=True``, or of
+           processes when ``parallel="processes"``. If None, defaults to
+           ``min(32, os.cpu_count())``."""
 
 CLUSTER_SIGNALS_ARG = \
     """signal : {"mean", "sum", "centroid"}, optional
@@ -24,7 +24,7 @@
 
 import numpy as np
 from natsort import natsorted
-from inspect import isgenerator
+from inspect import isgenerator, signature
 from pathlib import Path
 
 from hyperspy.drawing.marker import markers_metadata_dict_to_markers
@@ -46,6 +46,18 @@
     "\t\t%d signals\n"
     "\t\tPath: %s")
 
+# Formats whose files can be directories
+DIRECTORY_EXTENSIONS = ("zspy",)
+
+
+def _is_file(path):
+    """Whether `path` is a file or a directory of a format stored in
+    directories, e.g. zspy."""
+    path = str(path)
+    return os.path.isfile(path) or (
+        os.path.isdir(path) and
+        os.path.splitext(path)[1][1:].lower() in DIRECTORY_EXTENSIONS)
+
 
 def _infer_file_reader(extension):
     """Return a file reader from the plugins list based on the file extension.
@@ -200,6 +212,20 @@ def load(filenames=None,
         it should implement the ``file_reader`` function, which returns
         a dictionary containing the data and metadata for conversion to
         a HyperSpy signal.
+    navigation_slice, signal_slice : None or tuple, default None
+        Load only a part of the data, selected with the same syntax as
+        :py:attr:`~.signal.BaseSignal.inav` and
+        :py:attr:`~.signal.BaseSignal.isig` respectively: integers and
+        slices of integers select indices, floats select axis values, e.g.
+        ``navigation_slice=(slice(10, 20), slice(0, 5))``. The file is read
+        lazily and, if `lazy` is False, only the selected data is read and
+        loaded in memory.
+    original_metadata : {True, "lazy"}, default True
+        If "lazy", the original metadata is read when it is first accessed,
+        which makes loading files with large original metadata faster. This
+        is supported by the ``hspy`` and ``zspy`` formats, whose groups of
+        original metadata are read on demand; the other readers parse the
+        original metadata on loading, since they map it to the metadata.
     print_info: bool, default False
         For SEMPER unf- and EMD (Berkeley)-files, if True
         additional information read during loading is printed for a quick
@@ -289,6 +315,11 @@ def load(filenames=None,
 
     >>> s = hs.load('file*.blo', lazy=True, stack=True)
 
+    Loading only a part of the data:
+
+    >>> s = hs.load('file.hspy', navigation_slice=(slice(0, 10), 5),
+    ...             signal_slice=slice(1.5, 3.))
+
     Specify the file reader to use
 
     >>> s = hs.load('a_nexus_file.h5', reader='nxs')
@@ -318,7 +349,7 @@ def load(filenames=None,
             filenames = _escape_square_brackets(filenames)
 
         filenames = natsorted([f for f in glob.glob(filenames)
-                               if os.path.isfile(f)])
+                               if _is_file(f)])
 
         if not filenames:
             raise ValueError('No filename matches this pattern')
@@ -326,7 +357,7 @@ def load(filenames=None,
     elif isinstance(filenames, Path):
         # Just convert to list for now, pathlib.Path not
         # fully supported in io_plugins
-        filenames = [f for f in [filenames] if f.is_file()]
+        filenames = [f for f in [filenames] if _is_file(f)]
 
     elif isgenerator(filenames):
         filenames = list(filenames)
@@ -429,7 +460,7 @@ def load_single_file(filename, **kwds):
         Data loaded from the file.
 
     """
-    if not os.path.isfile(filename):
+    if not _is_file(filename):
         raise FileNotFoundError(f"File: {filename} not found!")
 
     # File extension without "." separator
@@ -468,10 +499,24 @@ def load_with_reader(
         reader,
         signal_type=None,
         convert_units=False,
+        navigation_slice=None,
+        signal_slice=None,
+        original_metadata=True,
         **kwds
     ):
     """Load a supported file with a given reader."""
     lazy = kwds.get('lazy', False)
+    if original_metadata not in (True, "lazy"):
+        raise ValueError(
+            "`original_metadata` must be True or 'lazy', not "
+            f"{original_metadata}.")
+    if original_metadata == "lazy" and \
+            "original_metadata" in signature(reader.file_reader).parameters:
+        kwds['original_metadata'] = original_metadata
+    sliced = navigation_slice is not None or signal_slice is not None
+    if sliced:
+        # Read the file lazily so that only the selected data is read
+        kwds['lazy'] = True
     file_data_list = reader.file_reader(filename, **kwds)
     objects = []
 
@@ -481,7 +526,11 @@ def load_with_reader(
                 signal_dict["metadata"]["Signal"] = {}
             if signal_type is not None:
                 signal_dict['metadata']["Signal"]['signal_type'] = signal_type
-            objects.append(dict2signal(signal_dict, lazy=lazy))
+            signal = dict2signal(signal_dict, lazy=kwds.get('lazy', False))
+            if sliced:
+                signal = _slice_signal(signal, navigation_slice,
+                                       signal_slice, lazy=lazy)
+            objects.append(signal)
             folder, filename = os.path.split(os.path.abspath(filename))
             filename, extension = os.path.splitext(filename)
             objects[-1].tmp_parameters.folder = folder
@@ -499,6 +548,19 @@ def load_with_reader(
     return objects
 
 
+def _slice_signal(signal, navigation_slice=None, signal_slice=None,
+                  lazy=False):
+    """Slice a signal read lazily with `inav` and `isig` and, if not `lazy`,
+    read the selected data only."""
+    if navigation_slice is not None:
+        signal = signal.inav[navigation_slice]
+    if signal_slice is not None:
+        signal = signal.isig[signal_slice]
+    if not lazy and signal._lazy:
+        signal.compute(close_file=True)
+    return signal
+
+
 def assign_signal_subclass(dtype, signal_dimension, signal_type="", lazy=False):
     """Given dtype, signal_dimension and signal_type, return the matching Signal subclass.
 
@@ -737,7 +799,7 @@ def save(filename, signal, overwrite=None, **kwds):
 
     # Create the directory if it does not exist
     ensure_directory(filename.parent)
-    is_file = filename.is_file()
+    is_file = filename.exists()
 
     if overwrite is None:
         write = overwrite_method(filename)  # Ask what to do
@@ -751,6 +813,9 @@ def save(filename, signal, overwrite=None, **kwds):
         )
 
     if write:
+        # The lazy original metadata may be read from the file that is
+        # about to be overwritten
+        signal.original_metadata._process_all_lazy_attributes()
         # Pass as a string for now, pathlib.Path not
         # properly supported in io_plugins
         writer.file_writer(str(filename), signal, **kwds)
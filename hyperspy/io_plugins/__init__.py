@@ -98,6 +98,16 @@
         "the mrcz package is not installed."
     )
 
+try:
+    from hyperspy.io_plugins import zspy
+
+    io_plugins.append(zspy)
+except ImportError:
+    _logger.info(
+        "The zspy IO plugin is not available because "
+        "the zarr package is not installed."
+    )
+
 
 default_write_ext = set()
 for plugin in io_plugins:
@@ -40,6 +40,7 @@
 from dateutil import tz
 import pint
 
+from hyperspy.misc.chunk_planner import get_reading_chunks
 from hyperspy.misc.elements import atomic_number2name
 import hyperspy.misc.io.fei_stream_readers as stream_readers
 from hyperspy.exceptions import VisibleDeprecationWarning
@@ -65,40 +66,6 @@
 _logger = logging.getLogger(__name__)
 
 
-def calculate_chunks(shape, dtype, chunk_size_mb=100):
-    """Calculate chunks to get target chunk size.
-
-    The chunks are optimized for C-order reading speed.
-
-    Parameters
-    ----------
-    shape: tuple of ints
-        The shape of the array
-    dtype: string or numpy dtype
-        The dtype of the array
-    chunk_size_mb: int
-        The maximum size of the resulting chunks in MB. The default is
-        100MB as reccommended by the dask documentation.
-
-    """
-
-    target = chunk_size_mb * 1e6
-    items = int(target // np.dtype(dtype).itemsize)
-    chunks = ()
-    dimsize = np.cumprod(shape[::-1])[::-1][1:]
-    for i, ds in enumerate(dimsize):
-        chunk = items // ds
-        if not chunk:
-            chunks += (1,)
-        elif chunk <= shape[i]:
-            chunks += (chunk, )
-        else:
-            chunks += (shape[i],)
-    # At least one signal
-    chunks += (shape[-1], )
-    return chunks
-
-
 class EMD(object):
 
     """Class for storing electron microscopy datasets.
@@ -220,7 +187,7 @@ def _read_signal_from_group(self, name, group, lazy=False):
         # Extract essential data:
         data = group.get('data')
         if lazy:
-            data = da.from_array(data, chunks=data.chunks)
+            data = da.from_array(data, chunks=get_reading_chunks(data))
         else:
             data = np.asanyarray(data)
         # EMD does not have a standard way to describe the signal axis.
@@ -507,7 +474,8 @@ class EMD_NCEM:
     def __init__(self):
         self._ureg = pint.UnitRegistry()
 
-    def read_file(self, file, lazy=None, dataset_path=None, stack_group=None):
+    def read_file(self, file, lazy=None, dataset_path=None, stack_group=None,
+                  chunks=None):
         """
         Read the data from an emd file
 
@@ -517,6 +485,11 @@ def read_file(self, file, lazy=None, dataset_path=None, stack_group=None):
             Handle of the file to read the data from.
         lazy : bool, optional
             Load the data lazily. The default is False.
+        chunks : None or dask chunks, optional
+            The chunks of the datasets when loaded lazily, in the order of
+            the axes of the datasets in the file. If None, whole chunks of
+            the file are aggregated in dask chunks of up to
+            ``preferences.General.lazy_chunk_size``. The default is None.
         dataset_path : None, str or list of str
             Path of the dataset. If None, load all supported datasets,
             otherwise the specified dataset. The default is None.
@@ -527,6 +500,7 @@ def read_file(self, file, lazy=None, dataset_path=None, stack_group=None):
         """
         self.file = file
         self.lazy = lazy
+        self.chunks = chunks
 
         if isinstance(dataset_path, list):
             if stack_group:
@@ -655,9 +629,7 @@ def _read_data_from_groups(self, group_path, dataset_name, stack_key=None,
             raise IOError("Dataset can't be found.")
 
         if self.lazy:
-            chunks = array_list[0].chunks
-            if chunks is None:
-                chunks = calculate_chunks(array_list[0].shape, array_list[0].dtype)
+            chunks = get_reading_chunks(array_list[0], self.chunks)
 
         if len(array_list) > 1:
             # Squeeze the data only when
@@ -943,7 +915,7 @@ class FeiEMDReader(object):
     def __init__(self, filename=None, select_type=None, first_frame=0,
                  last_frame=None, sum_frames=True, sum_EDS_detectors=True,
                  rebin_energy=1, SI_dtype=None, load_SI_image_stack=False,
-                 lazy=False):
+                 lazy=False, chunks=None):
         # TODO: Finish lazy implementation using the `FrameLocationTable`
         # Parallelise streams reading
         self.filename = filename
@@ -958,6 +930,7 @@ def __init__(self, filename=None, select_type=None, first_frame=0,
         self.SI_data_dtype = SI_dtype
         self.load_SI_image_stack = load_SI_image_stack
         self.lazy = lazy
+        self.chunks = chunks
         self.detector_name = None
         self.original_metadata = {}
 
@@ -1026,7 +999,8 @@ def _read_spectrum(self, spectrum_group, spectrum_sub_group_key):
         spectrum_sub_group = spectrum_group[spectrum_sub_group_key]
         dataset = spectrum_sub_group['Data']
         if self.lazy:
-            data = da.from_array(dataset, chunks=dataset.chunks).T
+            data = da.from_array(
+                dataset, chunks=get_reading_chunks(dataset, self.chunks)).T
         else:
             data = dataset[:].T
         original_metadata = _parse_metadata(spectrum_group,
@@ -1128,7 +1102,7 @@ def _read_image(self, image_group, image_sub_group_key):
                 data = da.transpose(
                     da.from_array(
                         h5data,
-                        chunks=h5data.chunks),
+                        chunks=get_reading_chunks(h5data, self.chunks)),
                     axes=[2, 0, 1])
             else:
                 # Workaround for a h5py bug https://github.com/h5py/h5py/issues/977
@@ -1823,9 +1797,10 @@ def file_reader(filename, lazy=False, **kwds):
                 dataset_path = f"{dataset_name}/data"
             dataset_path = kwds.pop('dataset_path', None)
             stack_group = kwds.pop('stack_group', None)
+            chunks = kwds.pop('chunks', None)
             emd_reader = EMD_NCEM(**kwds)
             emd_reader.read_file(file, lazy=lazy, dataset_path=dataset_path,
-                                 stack_group=stack_group)
+                                 stack_group=stack_group, chunks=chunks)
         else:
             raise IOError("The file is not a supported EMD file.")
     except Exception as e:
@@ -17,21 +17,36 @@
 # along with  HyperSpy.  If not, see <http://www.gnu.org/licenses/>.
 
 from distutils.version import LooseVersion
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import itertools
+import os
 import warnings
 import logging
 import datetime
 import ast
+import zlib
 
 import h5py
 import numpy as np
 import dask.array as da
 from traits.api import Undefined
-from hyperspy.misc.utils import ensure_unicode, multiply, get_object_package_info
+from hyperspy.misc.chunk_planner import get_reading_chunks
+from hyperspy.misc.lazy_navigator import cache_navigator, get_cached_navigator
+from hyperspy.misc.utils import (ensure_unicode, multiply,
+                                 get_object_package_info,
+                                 DictionaryTreeBrowser)
 from hyperspy.axes import AxesManager
 from collections import namedtuple
 
 _logger = logging.getLogger(__name__)
 
+try:
+    # Registers the compression filters of hdf5plugin, e.g. blosc, in HDF5
+    import hdf5plugin
+except ImportError:
+    hdf5plugin = None
+
 
 # Plugin characteristics
 # ----------------------
@@ -69,6 +84,9 @@
 # 'metadata'subgroup that will be
 # assigned to the same name attributes of the Signal instance as a
 # Dictionary Browsers
+# The experiment group may also contain a dataset called navigator, with the
+# navigation shape of data, storing the sum of data over the signal axes that
+# lazy signals use as navigator when plotting
 # The Experiments group can contain attributes that may be common to all
 # the experiments and that will be accessible as attributes of the
 # Experiments instance
@@ -96,6 +114,15 @@
 current_file_version = None  # Format version of the file being read
 default_version = LooseVersion(version)
 
+# Compression filters provided by hdf5plugin, shuffling is done by the HDF5
+# shuffle filter
+HDF5PLUGIN_COMPRESSIONS = {
+    'blosc': lambda: hdf5plugin.Blosc(
+        cname='lz4', clevel=5, shuffle=hdf5plugin.Blosc.NOSHUFFLE),
+    'lz4': lambda: hdf5plugin.LZ4(),
+    'zstd': lambda: hdf5plugin.Zstd(),
+}
+
 
 def get_hspy_format_version(f):
     if "file_format_version" in f.attrs:
@@ -115,8 +142,19 @@ def get_hspy_format_version(f):
     return LooseVersion(version)
 
 
+def _is_hdf5(group):
+    # The groups and datasets can also be zarr groups and arrays, see the
+    # zspy plugin
+    return isinstance(group, (h5py.Group, h5py.Dataset))
+
+
+def _is_dataset(group):
+    # h5py datasets and zarr arrays, but not groups
+    return hasattr(group, "dtype")
+
+
 def file_reader(filename, backing_store=False,
-                lazy=False, **kwds):
+                lazy=False, chunks=None, original_metadata=True, **kwds):
     """Read data from hdf5 files saved with the hyperspy hdf5 format specification
 
     Parameters
@@ -124,10 +162,43 @@ def file_reader(filename, backing_store=False,
     filename: str
     lazy: bool
         Load image lazily using dask
+    chunks: None or dask chunks
+        The chunks of the data when loaded lazily. If None, whole chunks of
+        the file are aggregated in dask chunks of up to
+        ``preferences.General.lazy_chunk_size``.
+    original_metadata: {True, "lazy"}
+        If "lazy", the groups of the original metadata are read when they
+        are first accessed.
     **kwds, optional
     """
     mode = kwds.pop('mode', 'r')
     f = h5py.File(filename, mode=mode, **kwds)
+    exp_dict_list = read_file(
+        f, lazy=lazy, chunks=chunks,
+        lazy_original_metadata=original_metadata == "lazy")
+    if not lazy:
+        f.close()
+    return exp_dict_list
+
+
+def read_file(f, lazy=False, chunks=None, lazy_original_metadata=False):
+    """Read the signals and models of an opened hspy file.
+
+    Parameters
+    ----------
+    f : h5py.File or zarr.hierarchy.Group
+        The root group of the file.
+    lazy : bool
+    chunks : None or dask chunks
+        See :py:func:`file_reader`.
+    lazy_original_metadata : bool
+        Whether to read the groups of the original metadata on first access,
+        see :py:func:`hdfgroup2dict`.
+
+    Returns
+    -------
+    list of dictionaries
+    """
     # Getting the format version here also checks if it is a valid HSpy
     # hdf5 file, so the following two lines must not be deleted or moved
     # elsewhere.
@@ -145,7 +216,7 @@ def file_reader(filename, backing_store=False,
     standalone_models = []
     if 'Analysis/models' in f:
         try:
-            m_gr = f.require_group('Analysis/models')
+            m_gr = f['Analysis/models']
             for model_name in m_gr:
                 if '_signal' in m_gr[model_name].attrs:
                     key = m_gr[model_name].attrs['_signal']
@@ -166,13 +237,15 @@ def file_reader(filename, backing_store=False,
     exp_dict_list = []
     if 'Experiments' in f:
         for ds in f['Experiments']:
-            if isinstance(f['Experiments'][ds], h5py.Group):
+            if not _is_dataset(f['Experiments'][ds]):
                 if 'data' in f['Experiments'][ds]:
                     experiments.append(ds)
         # Parse the file
         for experiment in experiments:
             exg = f['Experiments'][experiment]
-            exp = hdfgroup2signaldict(exg, lazy)
+            exp = hdfgroup2signaldict(
+                exg, lazy, chunks=chunks,
+                lazy_original_metadata=lazy_original_metadata)
             # assign correct models, if found:
             _tmp = {}
             for (key, _dict) in reversed(models_with_signals):
@@ -192,12 +265,11 @@ def file_reader(filename, backing_store=False,
                       'You can still load the data using a hdf5 reader, '
                       'e.g. h5py, and manually create a Signal. '
                       'Please, refer to the User Guide for details')
-    if not lazy:
-        f.close()
     return exp_dict_list
 
 
-def hdfgroup2signaldict(group, lazy=False):
+def hdfgroup2signaldict(group, lazy=False, chunks=None,
+                        lazy_original_metadata=False):
     global current_file_version
     global default_version
     if current_file_version < LooseVersion("1.2"):
@@ -210,7 +282,8 @@ def hdfgroup2signaldict(group, lazy=False):
     exp = {'metadata': hdfgroup2dict(
         group[metadata], lazy=lazy),
         'original_metadata': hdfgroup2dict(
-            group[original_metadata], lazy=lazy),
+            group[original_metadata], lazy=lazy,
+            lazy_nodes=lazy_original_metadata),
         'attributes': {}
     }
     if "package" in group.attrs:
@@ -226,8 +299,11 @@ def hdfgroup2signaldict(group, lazy=False):
 
     data = group['data']
     if lazy:
-        data = da.from_array(data, chunks=data.chunks)
+        data = da.from_array(data, chunks=get_reading_chunks(data, chunks))
         exp['attributes']['_lazy'] = True
+        if 'navigator' in group:
+            # See LazySignal.compute_navigator
+            cache_navigator(data, group['navigator'][()])
     else:
         data = np.asanyarray(data)
     exp['data'] = data
@@ -438,8 +514,9 @@ def parse_structure(key, group, value, _type, **kwds):
             if _type + key in group:
                 del group[_type + key]
             group.create_dataset(_type + key,
-                                 tmp.shape,
-                                 dtype=h5py.special_dtype(vlen=str),
+                                 shape=tmp.shape,
+                                 dtype=h5py.special_dtype(vlen=str)
+                                 if _is_hdf5(group) else str,
                                  **kwds)
             group[_type + key][:] = tmp[:]
         else:
@@ -470,7 +547,13 @@ def parse_structure(key, group, value, _type, **kwds):
                 # binary string if has any null characters (otherwise not
                 # supported by hdf5)
                 value.index(b'\x00')
-                group.attrs['_bs_' + key] = np.void(value)
+                if _is_hdf5(group):
+                    group.attrs['_bs_' + key] = np.void(value)
+                else:
+                    # zarr attributes are stored as JSON
+                    group.create_dataset(
+                        '_bs_' + key, data=np.frombuffer(value, np.uint8),
+                        overwrite=True)
             except ValueError:
                 group.attrs[key] = value.decode()
         elif isinstance(value, str):
@@ -493,6 +576,9 @@ def parse_structure(key, group, value, _type, **kwds):
         elif value is Undefined:
             continue
         else:
+            if isinstance(value, np.bool_) and not _is_hdf5(group):
+                # Not supported by the JSON encoder of zarr
+                value = bool(value)
             try:
                 group.attrs[key] = value
             except BaseException:
@@ -547,7 +633,127 @@ def get_signal_chunks(shape, dtype, signal_axes=None):
     return tuple(int(x) for x in chunks)
 
 
+def parse_compression(kwds):
+    """Replace the name of a compression filter provided by hdf5plugin in
+    the `compression` keyword argument of h5py by the arguments of the
+    filter.
+
+    Parameters
+    ----------
+    kwds : dict
+        The keyword arguments passed to h5py to create datasets, modified
+        in place.
+    """
+    compression = kwds.get('compression')
+    if not isinstance(compression, str) or \
+            compression.lower() not in HDF5PLUGIN_COMPRESSIONS:
+        return
+    if hdf5plugin is None:
+        raise ImportError(
+            f"The '{compression}' compression requires the hdf5plugin "
+            "package, install it with `pip install hdf5plugin`.")
+    del kwds['compression']
+    kwds.update(HDF5PLUGIN_COMPRESSIONS[compression.lower()]())
+
+
+# The HDF5 filter pipelines that HyperSpy can apply to write the chunks
+# directly
+_DIRECT_CHUNK_FILTERS = (
+    (),
+    (h5py.h5z.FILTER_SHUFFLE,),
+    (h5py.h5z.FILTER_DEFLATE,),
+    (h5py.h5z.FILTER_SHUFFLE, h5py.h5z.FILTER_DEFLATE),
+)
+
+
+def _get_filters(dset):
+    # The code and options of the filters of the dataset, in order
+    dcpl = dset.id.get_create_plist()
+    filters = []
+    for i in range(dcpl.get_nfilters()):
+        code, _, options, _ = dcpl.get_filter(i)
+        filters.append((code, options))
+    return tuple(filters)
+
+
+def _encode_chunk(chunk, chunk_shape, filters):
+    if chunk.shape != chunk_shape:
+        # The edge chunks are stored with the full chunk shape
+        full = np.zeros(chunk_shape, dtype=chunk.dtype)
+        full[tuple(slice(0, n) for n in chunk.shape)] = chunk
+        chunk = full
+    chunk = np.ascontiguousarray(chunk)
+    buffer = chunk
+    for code, options in filters:
+        if code == h5py.h5z.FILTER_SHUFFLE:
+            buffer = np.ascontiguousarray(buffer.view(np.uint8).reshape(
+                (-1, chunk.itemsize)).T)
+        elif code == h5py.h5z.FILTER_DEFLATE:
+            buffer = zlib.compress(buffer, options[0] if options else 4)
+    return bytes(buffer)
+
+
+def write_direct_chunks(dset, data, max_workers=None):
+    """Compress the chunks of `data` in a pool of threads and write them to
+    `dset` with `write_direct_chunk`, bypassing the filter pipeline of
+    HDF5, which compresses the chunks one at a time.
+
+    Only the shuffle and gzip filters are supported, see
+    :py:func:`can_write_direct_chunks`.
+
+    Parameters
+    ----------
+    dset : h5py.Dataset
+        A chunked dataset with the shape and dtype of `data`.
+    data : numpy.ndarray
+    max_workers : None or int
+        The number of threads, by default the number of CPUs.
+    """
+    filters = _get_filters(dset)
+    chunk_shape = dset.chunks
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    offsets = itertools.product(*[range(0, n, c) for n, c in
+                                  zip(data.shape, chunk_shape)])
+
+    def encode(offset):
+        chunk = data[tuple(slice(o, o + c) for o, c in
+                           zip(offset, chunk_shape))]
+        return offset, _encode_chunk(chunk, chunk_shape, filters)
+
+    # Bound the number of compressed chunks waiting to be written
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for offset in offsets:
+            pending.append(executor.submit(encode, offset))
+            if len(pending) > 2 * max_workers:
+                dset.id.write_direct_chunk(*pending.popleft().result())
+        while pending:
+            dset.id.write_direct_chunk(*pending.popleft().result())
+
+
+def can_write_direct_chunks(dset, data):
+    """Whether :py:func:`write_direct_chunks` can write `data` to `dset`.
+
+    Parameters
+    ----------
+    dset : h5py.Dataset
+    data : numpy.ndarray
+    """
+    if dset.chunks is None or data.dtype.kind not in "biufc":
+        return False
+    if tuple(code for code, _ in _get_filters(dset)) not in \
+            _DIRECT_CHUNK_FILTERS:
+        return False
+    # Nothing to gain with a single chunk
+    return data.size > multiply(dset.chunks)
+
+
 def overwrite_dataset(group, data, key, signal_axes=None, chunks=None, **kwds):
+    if not _is_hdf5(group):
+        from hyperspy.io_plugins.zspy import overwrite_dataset
+        return overwrite_dataset(group, data, key, signal_axes=signal_axes,
+                                 chunks=chunks, **kwds)
     if chunks is None:
         if signal_axes is None:
             # Use automatic h5py chunking
@@ -589,20 +795,39 @@ def overwrite_dataset(group, data, key, signal_axes=None, chunks=None, **kwds):
             # if the shape or dtype/etc do not match,
             # we delete the old one and create new in the next loop run
             del group[key]
-    if dset == data:
+    if isinstance(data, h5py.Dataset) and dset == data:
         # just a reference to already created thing
         pass
     else:
         _logger.info("Chunks used for saving: %s" % str(dset.chunks))
         if isinstance(data, da.Array):
             da.store(data.rechunk(dset.chunks), dset)
+        elif can_write_direct_chunks(dset, data):
+            write_direct_chunks(dset, data)
         elif data.flags.c_contiguous:
             dset.write_direct(data)
         else:
             dset[:] = data
 
 
-def hdfgroup2dict(group, dictionary=None, lazy=False):
+def hdfgroup2dict(group, dictionary=None, lazy=False, lazy_nodes=False):
+    """Read a group into a dictionary.
+
+    Parameters
+    ----------
+    group : h5py.Group or zarr.hierarchy.Group
+    dictionary : None or dict
+        The dictionary to add the items to, a new one if None.
+    lazy : bool
+        Read the datasets lazily using dask.
+    lazy_nodes : bool
+        If True, the sub-groups are read on first access, as lazy
+        :py:class:`~hyperspy.misc.utils.DictionaryTreeBrowser` nodes.
+
+    Returns
+    -------
+    dict
+    """
     if dictionary is None:
         dictionary = {}
     for key, value in group.attrs.items():
@@ -639,17 +864,21 @@ def hdfgroup2dict(group, dictionary=None, lazy=False):
             dictionary[key.replace("_datetime_", "")] = date_iso
         else:
             dictionary[key] = value
-    if not isinstance(group, h5py.Dataset):
+    if not _is_dataset(group):
         for key in group.keys():
             if key.startswith('_sig_'):
                 from hyperspy.io import dict2signal
                 dictionary[key[len('_sig_'):]] = (
                     dict2signal(hdfgroup2signaldict(
                         group[key], lazy=lazy)))
-            elif isinstance(group[key], h5py.Dataset):
+            elif _is_dataset(group[key]):
                 dat = group[key]
                 kn = key
-                if key.startswith("_list_"):
+                if key.startswith("_bs_"):
+                    # Binary strings of zarr files
+                    ans = np.array(dat).tobytes()
+                    kn = key[len('_bs_'):]
+                elif key.startswith("_list_"):
                     if (h5py.check_string_dtype(dat.dtype) and
                         hasattr(dat, 'asstr')):
                         # h5py 3.0 and newer
@@ -694,6 +923,9 @@ def hdfgroup2dict(group, dictionary=None, lazy=False):
                         hdfgroup2dict(
                             group[key], lazy=lazy).items()
                     ))])
+            elif lazy_nodes:
+                dictionary[key] = DictionaryTreeBrowser(
+                    _GroupReader(group[key]), lazy=True)
             else:
                 dictionary[key] = {}
                 hdfgroup2dict(
@@ -703,6 +935,43 @@ def hdfgroup2dict(group, dictionary=None, lazy=False):
     return dictionary
 
 
+class _GroupReader:
+    """Read a group as a dictionary whose sub-groups are read on first
+    access, for the lazy DictionaryTreeBrowser nodes of the original metadata.
+
+    Closed hdf5 files are opened again using the filename and the path of
+    the group. The reader can be pickled (or deep copied) with the node, in
+    which case the hdf5 group itself is not kept.
+    """
+
+    def __init__(self, group):
+        self.group = group
+        if _is_hdf5(group):
+            self.filename = group.file.filename
+            self.name = group.name
+
+    def __call__(self):
+        group = self.group
+        if group is None or (_is_hdf5(group) and not group.id.valid):
+            with h5py.File(self.filename, mode='r') as f:
+                return hdfgroup2dict(f[self.name], lazy_nodes=True)
+        return hdfgroup2dict(group, lazy_nodes=True)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if _is_hdf5(self.group):
+            # h5py objects can't be pickled
+            state['group'] = None
+        return state
+
+
+def _get_root(group):
+    if _is_hdf5(group):
+        return group.file
+    import zarr
+    return zarr.open_group(store=group.store, mode='a')
+
+
 def write_signal(signal, group, **kwds):
     "Writes a hyperspy signal to a hdf5 group"
 
@@ -714,8 +983,10 @@ def write_signal(signal, group, **kwds):
         metadata = "metadata"
         original_metadata = "original_metadata"
 
-    if 'compression' not in kwds:
-        kwds['compression'] = 'gzip'
+    if _is_hdf5(group):
+        if 'compression' not in kwds:
+            kwds['compression'] = 'gzip'
+        parse_compression(kwds)
 
     for axis in signal.axes_manager._axes:
         axis_dict = axis.get_axis_dictionary()
@@ -727,6 +998,13 @@ def write_signal(signal, group, **kwds):
     overwrite_dataset(group, signal.data, 'data',
                       signal_axes=signal.axes_manager.signal_indices_in_array,
                       **kwds)
+    if signal._lazy:
+        # Save the navigator, if computed, to reuse it when loading the file
+        navigator = get_cached_navigator(
+            signal.data,
+            tuple(signal.axes_manager._navigation_shape_in_array))
+        if navigator is not None:
+            group.create_dataset('navigator', data=navigator)
     if default_version < LooseVersion("1.2"):
         metadata_dict["_internal_parameters"] = \
             metadata_dict.pop("_HyperSpy")
@@ -744,7 +1022,7 @@ def write_signal(signal, group, **kwds):
                       peak_learning_results, **kwds)
 
     if len(signal.models):
-        model_group = group.file.require_group('Analysis/models')
+        model_group = _get_root(group).require_group('Analysis/models')
         dict2hdfgroup(signal.models._models.as_dictionary(),
                       model_group, **kwds)
         for model in model_group.values():
@@ -762,27 +1040,40 @@ def file_writer(filename, signal, *args, **kwds):
     **kwds, optional
     """
     with h5py.File(filename, mode='w') as f:
-        f.attrs['file_format'] = "HyperSpy"
-        f.attrs['file_format_version'] = version
-        exps = f.create_group('Experiments')
-        group_name = signal.metadata.General.title if \
-            signal.metadata.General.title else '__unnamed__'
-        # / is a invalid character, see #942
-        if "/" in group_name:
-            group_name = group_name.replace("/", "-")
-        expg = exps.create_group(group_name)
-
-        # Add record_by metadata for backward compatibility
-        smd = signal.metadata.Signal
-        if signal.axes_manager.signal_dimension == 1:
-            smd.record_by = "spectrum"
-        elif signal.axes_manager.signal_dimension == 2:
-            smd.record_by = "image"
-        else:
-            smd.record_by = ""
-        try:
-            write_signal(signal, expg, **kwds)
-        except BaseException:
-            raise
-        finally:
-            del smd.record_by
+        write_file(f, signal, **kwds)
+
+
+def write_file(f, signal, **kwds):
+    """Writes a signal to an opened file in hyperspy's format.
+
+    Parameters
+    ----------
+    f : h5py.File or zarr.hierarchy.Group
+        The root group of the file.
+    signal: a BaseSignal instance
+    **kwds, optional
+    """
+    f.attrs['file_format'] = "HyperSpy"
+    f.attrs['file_format_version'] = version
+    exps = f.create_group('Experiments')
+    group_name = signal.metadata.General.title if \
+        signal.metadata.General.title else '__unnamed__'
+    # / is a invalid character, see #942
+    if "/" in group_name:
+        group_name = group_name.replace("/", "-")
+    expg = exps.create_group(group_name)
+
+    # Add record_by metadata for backward compatibility
+    smd = signal.metadata.Signal
+    if signal.axes_manager.signal_dimension == 1:
+        smd.record_by = "spectrum"
+    elif signal.axes_manager.signal_dimension == 2:
+        smd.record_by = "image"
+    else:
+        smd.record_by = ""
+    try:
+        write_signal(signal, expg, **kwds)
+    except BaseException:
+        raise
+    finally:
+        del smd.record_by
@@ -24,7 +24,8 @@
 import h5py
 import pprint
 import traits.api as t
-from hyperspy.io_plugins.hspy import overwrite_dataset, get_signal_chunks
+from hyperspy.io_plugins.hspy import overwrite_dataset
+from hyperspy.misc.chunk_planner import get_reading_chunks
 from hyperspy.misc.utils import DictionaryTreeBrowser
 _logger = logging.getLogger(__name__)
 # Plugin characteristics
@@ -88,11 +89,7 @@ def _parse_from_file(value, lazy=False):
             toreturn = value[...].item()
         else:
             if lazy:
-                if value.chunks:
-                    toreturn = da.from_array(value, value.chunks)
-                else:
-                    chunks = get_signal_chunks(value.shape, value.dtype)
-                    toreturn = da.from_array(value, chunks)
+                toreturn = da.from_array(value, get_reading_chunks(value))
             else:
                 toreturn = np.array(value)
 
@@ -192,7 +189,7 @@ def _getlink(h5group, rootkey, key):
     return _target
 
 
-def _extract_hdf_dataset(group, dataset, lazy=False):
+def _extract_hdf_dataset(group, dataset, lazy=False, chunks=None):
     """Import data from hdf path.
 
     Parameters
@@ -203,6 +200,8 @@ def _extract_hdf_dataset(group, dataset, lazy=False):
         path to the dataset within the group
     lazy    : bool {default:True}
         If true use lazy opening, if false read into memory
+    chunks : None or dask chunks {default:None}
+        The chunks of the data when lazy, see :py:func:`file_reader`
 
     Returns
     -------
@@ -211,11 +210,10 @@ def _extract_hdf_dataset(group, dataset, lazy=False):
     """
     data = group[dataset]
     if lazy:
-        if "chunks" in data.attrs.keys():
+        if chunks is None and "chunks" in data.attrs.keys():
             chunks = data.attrs["chunks"]
-        else:
-            chunks = get_signal_chunks(data.shape, data.dtype)
-        data_lazy = da.from_array(data, chunks=chunks)
+        data_lazy = da.from_array(data,
+                                  chunks=get_reading_chunks(data, chunks))
     else:
         data_lazy = np.array(data)
 
@@ -236,7 +234,8 @@ def _extract_hdf_dataset(group, dataset, lazy=False):
     return dictionary
 
 
-def _nexus_dataset_to_signal(group, nexus_dataset_path, lazy=False):
+def _nexus_dataset_to_signal(group, nexus_dataset_path, lazy=False,
+                             chunks=None):
     """Load an NXdata set as a hyperspy signal.
 
     Parameters
@@ -246,6 +245,8 @@ def _nexus_dataset_to_signal(group, nexus_dataset_path, lazy=False):
         Path to the NXdata set in the group
     lazy : bool, default : True
         lazy loading of data
+    chunks : None or dask chunks, default : None
+        The chunks of the data when lazy, see :py:func:`file_reader`
 
     Returns
     -------
@@ -349,11 +350,10 @@ def _nexus_dataset_to_signal(group, nexus_dataset_path, lazy=False):
                     detector_index = detector_index+1
 
     if lazy:
-        if "chunks" in data.attrs.keys():
+        if chunks is None and "chunks" in data.attrs.keys():
             chunks = data.attrs["chunks"]
-        else:
-            chunks = get_signal_chunks(data.shape, data.dtype)
-        data_lazy = da.from_array(data, chunks=chunks)
+        data_lazy = da.from_array(data,
+                                  chunks=get_reading_chunks(data, chunks))
     else:
         data_lazy = np.array(data)
 
@@ -394,6 +394,7 @@ def file_reader(filename, lazy=False, dataset_keys=None,
                 nxdata_only=False,
                 hardlinks_only=False,
                 use_default=False,
+                chunks=None,
                 **kwds):
     """Read NXdata class or hdf datasets from a file and return signal(s).
 
@@ -431,6 +432,11 @@ def file_reader(filename, lazy=False, dataset_keys=None,
         signal. This will ignore the other keyword options. If True and no
         default is defined the file will be loaded according to
         the keyword options.
+    chunks : None or dask chunks, default : None
+        The chunks of the datasets when loaded lazily. If None, the
+        ``chunks`` attribute of the dataset is used if it exists, otherwise
+        whole chunks of the file are aggregated in dask chunks of up to
+        ``preferences.General.lazy_chunk_size``.
 
     Returns
     -------
@@ -489,7 +495,8 @@ def file_reader(filename, lazy=False, dataset_keys=None,
                        hardlinks_only=hardlinks_only)
 
     for data_path in nexus_data_paths:
-        dictionary = _nexus_dataset_to_signal(fin, data_path, lazy=lazy)
+        dictionary = _nexus_dataset_to_signal(fin, data_path, lazy=lazy,
+                                              chunks=chunks)
         entryname = _text_split(data_path, "/")[0]
         dictionary["mapping"] = mapping
         title = dictionary["metadata"]["General"]["title"]
@@ -538,7 +545,8 @@ def file_reader(filename, lazy=False, dataset_keys=None,
 
     if not nxdata_only:
         for data_path in hdf_data_paths:
-            datadict = _extract_hdf_dataset(fin, data_path, lazy=lazy)
+            datadict = _extract_hdf_dataset(fin, data_path, lazy=lazy,
+                                            chunks=chunks)
             if datadict:
                 title = data_path[1:].replace('/', '_')
                 basic_metadata = {'General':
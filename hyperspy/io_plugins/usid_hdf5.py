@@ -5,9 +5,12 @@
 from collections.abc import MutableMapping
 import h5py
 import numpy as np
+import dask.array as da
 import pyUSID as usid
 import sidpy
 
+from hyperspy.misc.chunk_planner import get_reading_chunks
+
 _logger = logging.getLogger(__name__)
 
 
@@ -212,7 +215,7 @@ def _convert_to_signal_dict(ndim_form, quantity, units, dim_dict_list,
 
 
 def _usidataset_to_signal(h5_main, ignore_non_linear_dims=True, lazy=True,
-                          *kwds):
+                          chunks=None, *kwds):
     """
     Converts a single specified USIDataset object to one or more Signal objects
 
@@ -229,6 +232,10 @@ def _usidataset_to_signal(h5_main, ignore_non_linear_dims=True, lazy=True,
     lazy : bool, Optional
         If set to True, data will be read as a Dask array.
         Else, data will be read in as a numpy array
+    chunks : None or dask chunks, Optional
+        The chunks of the main dataset when lazy. If None, whole chunks of
+        the file are aggregated in dask chunks of up to
+        ``preferences.General.lazy_chunk_size``.
 
     Returns
     -------
@@ -256,8 +263,15 @@ def _usidataset_to_signal(h5_main, ignore_non_linear_dims=True, lazy=True,
     _logger.info('Dimensions: Positions: {}, Spectroscopic: {}'
                  '.'.format(num_pos_dims, num_spec_dims))
 
-    ret_vals = usid.hdf_utils.reshape_to_n_dims(h5_main, get_labels=True,
-                                                lazy=lazy)
+    if lazy:
+        h5_data = da.from_array(h5_main,
+                                chunks=get_reading_chunks(h5_main, chunks))
+        ret_vals = usid.hdf_utils.reshape_to_n_dims(
+            h5_data, h5_pos=h5_main.h5_pos_inds, h5_spec=h5_main.h5_spec_inds,
+            get_labels=True, lazy=lazy)
+    else:
+        ret_vals = usid.hdf_utils.reshape_to_n_dims(h5_main, get_labels=True,
+                                                    lazy=lazy)
     ds_nd, success, dim_labs = ret_vals
 
     if success is not True:
@@ -381,7 +395,7 @@ def _axes_list_to_dimensions(axes_list, data_shape, is_spec):
 
 
 def file_reader(filename, dataset_path=None, ignore_non_linear_dims=True,
-                lazy=False, **kwds):
+                lazy=False, chunks=None, **kwds):
     """
     Reads a USID Main dataset present in an HDF5 file into a HyperSpy Signal
 
@@ -401,6 +415,10 @@ def file_reader(filename, dataset_path=None, ignore_non_linear_dims=True,
         dataset will result in Exceptions.
         Else, all such non-linearly varied parameters will be treated as
         linearly varied parameters and a Signal object will be generated.
+    chunks : None or dask chunks, Optional
+        The chunks of the main datasets when loaded lazily. If None, whole
+        chunks of the file are aggregated in dask chunks of up to
+        ``preferences.General.lazy_chunk_size``.
 
     Returns
     -------
@@ -423,7 +441,8 @@ def file_reader(filename, dataset_path=None, ignore_non_linear_dims=True,
             signals += _usidataset_to_signal(h5_dset,
                                              ignore_non_linear_dims=
                                              ignore_non_linear_dims,
-                                             lazy=lazy, **kwds)
+                                             lazy=lazy, chunks=chunks,
+                                             **kwds)
         return signals
     else:
         if not isinstance(dataset_path, str):
@@ -432,7 +451,7 @@ def file_reader(filename, dataset_path=None, ignore_non_linear_dims=True,
         return _usidataset_to_signal(h5_dset,
                                      ignore_non_linear_dims=
                                      ignore_non_linear_dims,
-                                     lazy=lazy, **kwds)
+                                     lazy=lazy, chunks=chunks, **kwds)
 
     # At least close the file handle if not lazy load
     if not lazy:
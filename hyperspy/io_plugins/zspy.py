@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+# Copyright 2007-2020 The HyperSpy developers
+#
+# This file is part of  HyperSpy.
+#
+#  HyperSpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+#  HyperSpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with  HyperSpy.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import os
+import tempfile
+
+import dask.array as da
+import numcodecs
+import numpy as np
+import zarr
+
+from hyperspy.io_plugins.hspy import get_signal_chunks, read_file, write_file
+from hyperspy.misc.dask_scheduler import compute
+
+_logger = logging.getLogger(__name__)
+
+
+# Plugin characteristics
+# ----------------------
+format_name = 'ZSPY'
+description = \
+    'A variant of the HyperSpy format based on the zarr standard, which ' \
+    'compresses and writes the chunks of the data in parallel'
+full_support = False
+# Recognised file extension
+file_extensions = ['zspy']
+default_extension = 0
+# Writing capabilities
+writes = True
+
+# -----------------------
+# File format description
+# -----------------------
+# The groups, datasets and attributes are the same as in the hspy format, see
+# hspy.py, but they are stored in a zarr store: a directory, in which each
+# chunk of each dataset is a file, or a zip file with the same content.
+# The attributes are stored as JSON, binary strings with null characters are
+# stored as uint8 datasets starting with _bs_ instead of attributes.
+
+STORES = ("directory", "zip")
+
+
+def _open_store(filename, mode='r'):
+    if os.path.isfile(filename):
+        return zarr.ZipStore(filename, mode=mode)
+    return zarr.NestedDirectoryStore(filename)
+
+
+def file_reader(filename, lazy=False, chunks=None, original_metadata=True,
+                **kwds):
+    """Read data from zspy files, a directory or a zip file.
+
+    Parameters
+    ----------
+    filename: str
+    lazy: bool
+        Load the data lazily using dask.
+    chunks: None or dask chunks
+        The chunks of the data when loaded lazily. If None, whole chunks of
+        the file are aggregated in dask chunks of up to
+        ``preferences.General.lazy_chunk_size``.
+    original_metadata: {True, "lazy"}
+        If "lazy", the groups of the original metadata are read when they
+        are first accessed, in which case zip files are not closed.
+    **kwds, optional
+    """
+    mode = kwds.pop('mode', 'r')
+    store = _open_store(filename, mode=mode)
+    f = zarr.open_group(store=store, mode=mode)
+    lazy_original_metadata = original_metadata == "lazy"
+    exp_dict_list = read_file(f, lazy=lazy, chunks=chunks,
+                              lazy_original_metadata=lazy_original_metadata)
+    if not (lazy or lazy_original_metadata) and \
+            isinstance(store, zarr.ZipStore):
+        store.close()
+    return exp_dict_list
+
+
+def overwrite_dataset(group, data, key, signal_axes=None, chunks=None,
+                      **kwds):
+    """Write `data` to the dataset `key` of a zarr group, replacing any
+    existing dataset.
+
+    The chunks are written with dask without lock, so that they are
+    compressed and written in parallel.
+
+    Parameters
+    ----------
+    group : zarr.hierarchy.Group
+    data : numpy.ndarray or dask.array.Array
+    key : str
+    signal_axes : {None, iterable of ints}
+    chunks : {None, True, tuple of ints}
+        See :py:func:`~hyperspy.io_plugins.hspy.get_signal_chunks`.
+    **kwds
+        Passed to :py:meth:`zarr.hierarchy.Group.create_dataset`, e.g.
+        ``compressor``.
+    """
+    if chunks is None:
+        if signal_axes is None:
+            # Use automatic zarr chunking
+            chunks = True
+        else:
+            # Optimise the chunking to contain at least one signal per chunk
+            chunks = get_signal_chunks(data.shape, data.dtype, signal_axes)
+    if data.dtype == np.dtype('O') and 'object_codec' not in kwds:
+        # Ragged array
+        first = data.ravel()[0]
+        if isinstance(first, da.Array):
+            first = first.compute()
+        kwds['object_codec'] = numcodecs.VLenArray(first.dtype)
+
+    dset = group.create_dataset(key, shape=data.shape, dtype=data.dtype,
+                                chunks=chunks, overwrite=True, **kwds)
+    _logger.info("Chunks used for saving: %s" % str(dset.chunks))
+    if isinstance(data, da.Array):
+        data = data.rechunk(dset.chunks)
+    else:
+        # Compress the chunks of data in memory in parallel too
+        data = da.from_array(data, chunks=dset.chunks)
+    compute(da.store(data, dset, lock=False, compute=False))
+
+
+def file_writer(filename, signal, store="directory", **kwds):
+    """Writes data to a zspy file.
+
+    Parameters
+    ----------
+    filename: str
+    signal: a BaseSignal instance
+    store: {"directory", "zip"}
+        Write a directory or a zip file. The zip file is written to a
+        temporary directory first, since zip files cannot be modified.
+    **kwds, optional
+        Passed to the writer of the datasets, e.g. ``chunks`` and
+        ``compressor``.
+    """
+    if store not in STORES:
+        raise ValueError(
+            f"`store` must be one of {STORES}, not '{store}'.")
+    if store == "directory":
+        f = zarr.group(store=zarr.NestedDirectoryStore(filename),
+                       overwrite=True)
+        write_file(f, signal, **kwds)
+        return
+    if os.path.isdir(filename):
+        raise IOError(f"{filename} is a directory.")
+    with tempfile.TemporaryDirectory(
+            dir=os.path.dirname(os.path.abspath(filename))) as tmp:
+        directory_store = zarr.NestedDirectoryStore(tmp)
+        write_file(zarr.group(store=directory_store), signal, **kwds)
+        with zarr.ZipStore(filename, mode='w') as zip_store:
+            zarr.copy_store(directory_store, zip_store)
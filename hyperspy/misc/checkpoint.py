@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+# Copyright 2007-2020 The HyperSpy developers
+#
+# This file is part of  HyperSpy.
+#
+#  HyperSpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+#  HyperSpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with  HyperSpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Incremental checkpoints of the fitting state of a model in HDF5 files."""
+
+import logging
+import os
+
+import h5py
+import numpy as np
+from numpy.lib.recfunctions import repack_fields
+
+_logger = logging.getLogger(__name__)
+
+# Increase when the layout of the file changes
+CHECKPOINT_VERSION = 1
+# Number of navigation positions per block for one-dimensional navigation
+BLOCK_SIZE_1D = 1024
+
+
+def _parameter_key(i, component, parameter):
+    cname = component.name.lower().replace(' ', '_').replace('/', '_')
+    pname = parameter.name.lower().replace(' ', '_')
+    return '%s_%s.%s' % (i, cname, pname)
+
+
+def _packed(array):
+    # The parameter maps can be views with padded fields
+    return repack_fields(array) if array.dtype.names else array
+
+
+class ModelCheckpoint:
+    """Incremental checkpoint of the fitting state of a model.
+
+    The HDF5 file is written in full only when it is created. Afterwards,
+    every :py:meth:`write` only writes the blocks of rows of the navigation
+    space (the first axis in array order) that changed since the previous
+    write. The file contains the following datasets:
+
+    * ``parameters/<index>_<component>.<parameter>``: the parameter maps.
+    * ``chisq`` and ``dof``: the goodness of the fits.
+    * ``done``: the positions whose fit is stored in the file.
+    * ``marker``: the SAMFire marker, if given.
+
+    Parameters
+    ----------
+    model : :py:class:`~hyperspy.model.BaseModel`
+        The model to checkpoint.
+    filename : str
+        The name of the HDF5 file.
+    resume : bool, default False
+        If True and the file exists, the state stored in the file is restored
+        in the model (and in the marker) and new writes are added to the file.
+        Otherwise, the file is created (or overwritten) with the current state
+        of the model.
+    marker : None or numpy.ndarray
+        The SAMFire marker, with the navigation shape in array order, to
+        checkpoint together with the model.
+
+    Attributes
+    ----------
+    done : numpy.ndarray of bool
+        The positions marked as done with :py:meth:`mark`, including the ones
+        restored from the file.
+
+    """
+
+    def __init__(self, model, filename, resume=False, marker=None):
+        self.model = model
+        self.filename = str(filename)
+        self.marker = marker
+        shape = tuple(model.axes_manager._navigation_shape_in_array)
+        # Treat the models without navigation as a single position
+        self._shape = shape or (1,)
+        self._block_size = (1 if len(self._shape) > 1 else
+                            min(self._shape[0], BLOCK_SIZE_1D))
+        self._dirty_blocks = set()
+        self._marker_written = None
+        if resume and os.path.isfile(self.filename):
+            self.file = h5py.File(self.filename, 'r+')
+            try:
+                self._restore()
+            except BaseException:
+                self.file.close()
+                raise
+        else:
+            self.file = h5py.File(self.filename, 'w')
+            self._create()
+
+    def _parameters(self):
+        for i, component in enumerate(self.model):
+            for parameter in component.parameters:
+                yield _parameter_key(i, component, parameter), parameter
+
+    def _arrays(self):
+        """The arrays of the model written in the file, with the navigation
+        shape in array order."""
+        arrays = {'parameters/' + key: parameter.map for key, parameter in
+                  self._parameters()}
+        arrays['chisq'] = self.model.chisq.data
+        arrays['dof'] = self.model.dof.data
+        arrays['done'] = self.done
+        return {key: array.reshape(self._shape) for key, array in
+                arrays.items()}
+
+    def _create(self):
+        self.done = np.zeros(self._shape, dtype=bool)
+        self.file.attrs['checkpoint_version'] = CHECKPOINT_VERSION
+        self.file.attrs['navigation_shape'] = self._shape
+        chunks = (self._block_size,) + self._shape[1:]
+        for key, array in self._arrays().items():
+            self.file.create_dataset(key, data=_packed(array), chunks=chunks)
+        if self.marker is not None:
+            self.file.create_dataset('marker', data=self.marker,
+                                     chunks=chunks)
+            self._marker_written = self.marker.copy()
+        self.file.flush()
+
+    def _restore(self):
+        if self.file.attrs.get('checkpoint_version') != CHECKPOINT_VERSION:
+            raise ValueError(
+                f"{self.filename} is not a checkpoint file written by this "
+                "version of HyperSpy.")
+        if tuple(self.file.attrs['navigation_shape']) != self._shape:
+            raise ValueError(
+                f"The navigation shape of the checkpoint {self.filename} does "
+                "not match the navigation shape of the model.")
+        keys = {'parameters/' + key for key, _ in self._parameters()}
+        if keys != {'parameters/' + key for key in self.file['parameters']}:
+            raise ValueError(
+                f"The components of the checkpoint {self.filename} do not "
+                "match the components of the model.")
+        self.done = self.file['done'][()]
+        for key, array in self._arrays().items():
+            # Write in place, the maps may be views of a larger array
+            array[...] = self.file[key][()]
+        if self.marker is not None and 'marker' in self.file:
+            self.marker[...] = self.file['marker'][()]
+            self._marker_written = self.marker.copy()
+        self.model.fetch_stored_values()
+        _logger.info(f"Restored {self.done.sum()} fitted positions from "
+                     f"{self.filename}")
+
+    def mark(self, index):
+        """Mark a navigation position as done, to be written in the next
+        :py:meth:`write`.
+
+        Parameters
+        ----------
+        index : tuple of int
+            The navigation index in array order.
+        """
+        index = tuple(index) or (0,)
+        self.done[index] = True
+        self._dirty_blocks.add(int(index[0]) // self._block_size)
+
+    def mark_rows(self, start, stop, mask=None):
+        """Mark the rows ``start:stop`` (the first axis in array order) of the
+        navigation space as done.
+
+        Parameters
+        ----------
+        start, stop : int
+        mask : None or numpy.ndarray of bool
+            If given, the positions of the rows where `mask` is True are not
+            marked as done.
+        """
+        if mask is None:
+            self.done[start:stop] = True
+        else:
+            self.done[start:stop] |= ~mask.reshape(self.done[start:stop].shape)
+        self._dirty_blocks.update(
+            range(start // self._block_size,
+                  (stop - 1) // self._block_size + 1))
+
+    def _block_slice(self, block):
+        start = block * self._block_size
+        return slice(start, min(start + self._block_size, self._shape[0]))
+
+    def _changed_marker_blocks(self):
+        marker = self.marker.reshape(self._shape[0], -1)
+        written = self._marker_written.reshape(self._shape[0], -1)
+        changed = ~((marker == written) |
+                    (np.isnan(marker) & np.isnan(written)))
+        rows = np.flatnonzero(changed.any(axis=1))
+        return set(rows // self._block_size)
+
+    def write(self):
+        """Write the blocks of rows that changed since the last write."""
+        arrays = self._arrays()
+        for block in sorted(self._dirty_blocks):
+            rows = self._block_slice(block)
+            for key, array in arrays.items():
+                self.file[key][rows] = _packed(array[rows])
+        self._dirty_blocks.clear()
+        if self.marker is not None and 'marker' in self.file:
+            for block in sorted(self._changed_marker_blocks()):
+                rows = self._block_slice(block)
+                self.file['marker'][rows] = self.marker[rows]
+                self._marker_written[rows] = self.marker[rows]
+        self.file.flush()
+
+    def close(self):
+        """Write the pending changes and close the file."""
+        if self.file:
+            self.write()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
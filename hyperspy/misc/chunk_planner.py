@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+# Copyright 2007-2020 The HyperSpy developers
+#
+# This file is part of  HyperSpy.
+#
+#  HyperSpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+#  HyperSpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with  HyperSpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Planning of the chunks of lazy signals.
+
+The chunks are planned for the operation that is going to be performed:
+
+* Operations that iterate over the navigation space (``map``,
+  ``decomposition``, ``transpose(optimize=True)``...) need the signal axes
+  (or the axes they operate along) in a single chunk.
+* Reductions need no axis in a single chunk, but are faster with few large
+  chunks along the reduced axes.
+
+The other axes are split in chunks that are multiples of the chunks of the
+file the data is read from, if any, and as large as possible within
+``preferences.General.lazy_chunk_size``. The chunks of the data are only
+changed when they do not suit the operation, so that a chain of lazy
+operations does not rechunk the data at every step.
+
+When loading files lazily, the dask chunks are made of whole chunks of the
+file, aggregated up to the same size, see :py:func:`get_reading_chunks`.
+
+"""
+
+import math
+
+import numpy as np
+from dask.array.core import normalize_chunks
+
+from hyperspy.defaults_parser import preferences
+from hyperspy.misc.utils import multiply
+
+# The data is rechunked if the planned chunks are this many times fewer
+SMALL_CHUNKS_FACTOR = 4
+
+
+def get_storage_chunks(data):
+    """Return the chunks of the file that the dask array `data` reads, or
+    None if it does not read a chunked dataset with its shape.
+
+    Parameters
+    ----------
+    data : dask.array.Array
+
+    Returns
+    -------
+    None or tuple of int
+    """
+    for name, layer in data.dask.layers.items():
+        if not name.startswith("original-"):
+            continue
+        for source in layer.values():
+            chunks = getattr(source, "chunks", None)
+            if getattr(source, "shape", None) == data.shape and \
+                    isinstance(chunks, tuple) and \
+                    all(isinstance(c, (int, np.integer)) for c in chunks):
+                return tuple(int(c) for c in chunks)
+    return None
+
+
+def plan_chunks(shape, itemsize, max_nbytes, keep_axes=(), grow_axes=(),
+                start=None, units=None):
+    """Plan the chunks of an array for an operation.
+
+    The chunk sizes of the axes in `keep_axes` are their full size. The
+    chunk sizes of the other axes start from `start` and are halved, in
+    multiples of `units` if possible, until the chunks fit in `max_nbytes`.
+    Then they are grown by integer factors until the chunks fill
+    `max_nbytes`, the axes in `grow_axes` first and then the other axes from
+    the last to the first (the contiguous axes first).
+
+    Parameters
+    ----------
+    shape : tuple of int
+    itemsize : int
+        The number of bytes per item.
+    max_nbytes : int
+        The maximum size of the chunks in bytes. The chunks can be larger if
+        the axes in `keep_axes` do not fit.
+    keep_axes : iterable of int
+        The axes that must not be split.
+    grow_axes : iterable of int
+        The axes whose chunks are grown first.
+    start : None or tuple of int
+        The initial chunk sizes, by default `units`.
+    units : None or tuple of int
+        The chunk sizes of the storage of the data, 1 by default.
+
+    Returns
+    -------
+    tuple of tuples
+        Dask chunks.
+    """
+    ndim = len(shape)
+    keep_axes = [i % ndim for i in keep_axes]
+    grow_axes = [i % ndim for i in grow_axes if i % ndim not in keep_axes]
+
+    def clip(sizes):
+        return [min(max(int(c), 1), s) for c, s in zip(sizes, shape)]
+
+    units = clip([1] * ndim if units is None else units)
+    sizes = list(units) if start is None else clip(start)
+    for i in keep_axes:
+        sizes[i] = shape[i]
+    free = [i for i in range(ndim) if i not in keep_axes]
+
+    def nbytes():
+        return multiply(sizes) * itemsize
+
+    while nbytes() > max_nbytes:
+        candidates = [i for i in free if sizes[i] > 1]
+        if not candidates:
+            break
+        i = max(candidates, key=lambda i: sizes[i])
+        half = math.ceil(sizes[i] / 2)
+        if half >= units[i] > 0:
+            # Stay a multiple of the storage chunks
+            half = half // units[i] * units[i]
+        sizes[i] = half
+
+    for i in grow_axes + [i for i in reversed(free) if i not in grow_axes]:
+        if sizes[i] >= shape[i]:
+            continue
+        if not nbytes():
+            sizes[i] = shape[i]
+            continue
+        factor = max_nbytes // nbytes()
+        if factor * sizes[i] >= shape[i]:
+            sizes[i] = shape[i]
+        else:
+            sizes[i] *= max(factor, 1)
+            break
+    return normalize_chunks(tuple(sizes), shape)
+
+
+def chunks_fit(chunks, itemsize, max_nbytes, planned, keep_axes=()):
+    """Whether the existing chunks suit an operation, in which case there
+    is no need to rechunk the data to the planned chunks.
+
+    The chunks do not suit the operation if an axis in `keep_axes` is split,
+    if the largest chunk does not fit in `max_nbytes` while the planned
+    chunks do or if there are many times more chunks than planned.
+
+    Parameters
+    ----------
+    chunks, planned : tuple of tuples
+        The existing and the planned dask chunks.
+    itemsize, max_nbytes, keep_axes
+        See :py:func:`plan_chunks`.
+    """
+    if chunks == planned:
+        return True
+    if any(len(chunks[i]) > 1 for i in keep_axes):
+        return False
+
+    def largest(chunks):
+        return multiply([max(c) if c else 0 for c in chunks]) * itemsize
+
+    if largest(chunks) > max(max_nbytes, largest(planned)):
+        return False
+    nchunks = multiply([len(c) for c in chunks])
+    nplanned = multiply([len(c) for c in planned])
+    return nchunks <= SMALL_CHUNKS_FACTOR * nplanned
+
+
+def aggregate_storage_chunks(shape, itemsize, storage_chunks=None,
+                             max_nbytes=None):
+    """Plan dask chunks made of whole storage chunks, as large as possible
+    within `max_nbytes`.
+
+    Parameters
+    ----------
+    shape : tuple of int
+    itemsize : int
+        The number of bytes per item.
+    storage_chunks : None or tuple of int
+        The chunks of the dataset in the file, None if it is contiguous.
+    max_nbytes : None or int
+        The maximum size of the dask chunks in bytes, by default
+        ``preferences.General.lazy_chunk_size``. The storage chunks are
+        never split, even if they are larger.
+
+    Returns
+    -------
+    tuple of tuples
+        Dask chunks.
+    """
+    if max_nbytes is None:
+        max_nbytes = int(preferences.General.lazy_chunk_size * 2**20)
+    if storage_chunks is not None and \
+            multiply(storage_chunks) * itemsize >= max_nbytes:
+        return normalize_chunks(tuple(storage_chunks), shape)
+    return plan_chunks(shape, itemsize, max_nbytes, start=storage_chunks,
+                       units=storage_chunks)
+
+
+def get_reading_chunks(dataset, chunks=None):
+    """The chunks to read a dataset of a file lazily with.
+
+    Parameters
+    ----------
+    dataset : h5py.Dataset or zarr.Array
+    chunks : None or dask chunks
+        If None, the chunks of the dataset are aggregated, see
+        :py:func:`aggregate_storage_chunks`. Otherwise, they are returned
+        unchanged.
+
+    Returns
+    -------
+    dask chunks
+    """
+    if chunks is not None:
+        return chunks
+    return aggregate_storage_chunks(dataset.shape, dataset.dtype.itemsize,
+                                    dataset.chunks)
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+# Copyright 2007-2020 The HyperSpy developers
+#
+# This file is part of  HyperSpy.
+#
+#  HyperSpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+#  HyperSpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with  HyperSpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Selection of the dask scheduler used to compute lazy signals.
+
+The scheduler is given per call with the ``scheduler`` argument of the
+methods of lazy signals or, by default, by
+``preferences.General.dask_scheduler``:
+
+* ``"default"``: the scheduler configured in dask (the threaded scheduler
+  unless changed with :py:func:`dask.config.set` or by creating a
+  ``dask.distributed.Client``).
+* ``"threads"``, ``"processes"`` or ``"synchronous"``: the corresponding
+  local scheduler of dask. The synchronous scheduler runs in the calling
+  thread, which is useful for debugging and profiling.
+* ``"distributed"``: a ``dask.distributed`` client, connected to
+  ``preferences.General.dask_scheduler_address`` if set. Otherwise, the
+  current client is used or, if there is none, a ``LocalCluster`` is started
+  for the session.
+
+A ``dask.distributed.Client`` or a dask ``get`` function can also be given
+as the scheduler.
+
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import logging
+
+import dask
+
+from hyperspy.defaults_parser import preferences
+
+_logger = logging.getLogger(__name__)
+
+SCHEDULERS = ("default", "threads", "processes", "synchronous",
+              "distributed")
+
+# The client of the LocalCluster started by HyperSpy
+_local_client = None
+# The address and the client connected to
+# preferences.General.dask_scheduler_address
+_address_client = (None, None)
+
+
+def _import_distributed():
+    try:
+        import distributed
+    except ImportError:
+        raise ImportError(
+            "The 'distributed' scheduler requires the `distributed` package, "
+            "install it with `pip install distributed`.")
+    return distributed
+
+
+def is_client(scheduler):
+    """Whether `scheduler` is a ``dask.distributed.Client``."""
+    return type(scheduler).__name__ == "Client" and \
+        hasattr(scheduler, "submit")
+
+
+def _get_client():
+    global _local_client, _address_client
+    distributed = _import_distributed()
+    address = preferences.General.dask_scheduler_address
+    if address:
+        # Connect once and reconnect if the client was closed or the address
+        # changed
+        client_address, client = _address_client
+        if client is not None and (client_address != address or
+                                   client.status == "closed"):
+            client.close()
+            client = None
+        if client is None:
+            _logger.info(f"Connecting to the dask scheduler at {address}")
+            client = distributed.Client(address, set_as_default=False)
+            _address_client = (address, client)
+        return client
+    try:
+        return distributed.default_client()
+    except ValueError:
+        pass
+    if _local_client is None or _local_client.status == "closed":
+        _logger.info("Starting a dask.distributed LocalCluster")
+        _local_client = distributed.Client(
+            distributed.LocalCluster(), set_as_default=False)
+    return _local_client
+
+
+def get_scheduler(scheduler=None):
+    """Return the scheduler to pass to dask.
+
+    Parameters
+    ----------
+    scheduler : None, str, dask.distributed.Client or callable
+        If None, ``preferences.General.dask_scheduler`` is used. See the
+        module docstring for the accepted strings.
+
+    Returns
+    -------
+    None, str, dask.distributed.Client or callable
+        None for the scheduler configured in dask.
+    """
+    if scheduler is None:
+        scheduler = preferences.General.dask_scheduler
+    if not isinstance(scheduler, str):
+        return scheduler
+    if scheduler not in SCHEDULERS:
+        raise ValueError(
+            f"'{scheduler}' is not a valid scheduler, it must be one of "
+            f"{SCHEDULERS}, a `dask.distributed.Client` or a dask `get` "
+            "function.")
+    if scheduler == "default":
+        if dask.config.get("scheduler", None) == "dask.distributed":
+            return _get_client()
+        return None
+    if scheduler == "distributed":
+        return _get_client()
+    return scheduler
+
+
+def compute(*args, scheduler=None, **kwargs):
+    """Compute dask collections with the given scheduler, see
+    :py:func:`dask.compute`.
+
+    Parameters
+    ----------
+    *args : dask collections
+    scheduler : None, str, dask.distributed.Client or callable
+        See :py:func:`get_scheduler`.
+    **kwargs
+        Passed to :py:func:`dask.compute`.
+    """
+    scheduler = get_scheduler(scheduler)
+    if scheduler is not None:
+        kwargs["scheduler"] = scheduler
+    return dask.compute(*args, **kwargs)
+
+
+def compute_iter(collections, scheduler=None, max_in_flight=2):
+    """Compute dask collections, yielding the results in order while the
+    following collections are computed.
+
+    At most `max_in_flight` collections are computed, or kept in memory
+    waiting to be yielded, at any time. With a ``dask.distributed`` client
+    the collections are submitted as futures with ``client.compute``;
+    otherwise they are computed in a pool of threads, each computation using
+    the given scheduler. The synchronous scheduler computes one collection
+    at a time, when it is requested.
+
+    Parameters
+    ----------
+    collections : iterable
+        The collections to compute. Tuples of collections are computed
+        together and yielded as tuples.
+    scheduler : None, str, dask.distributed.Client or callable
+        See :py:func:`get_scheduler`.
+    max_in_flight : int, default 2
+        With the default, the next collection is computed while the current
+        one is used. Each computation uses all the workers of the scheduler,
+        so larger values mostly increase the memory used.
+
+    Yields
+    ------
+    The computed collections.
+    """
+    scheduler = get_scheduler(scheduler)
+    max_in_flight = max(int(max_in_flight), 1)
+    collections = iter(collections)
+    if scheduler == "synchronous" or max_in_flight == 1:
+        for collection in collections:
+            yield _compute_one(collection, scheduler)
+        return
+    if is_client(scheduler):
+        executor = None
+
+        def submit(collection):
+            if isinstance(collection, tuple):
+                return scheduler.compute(list(collection))
+            return scheduler.compute(collection)
+    else:
+        executor = ThreadPoolExecutor(max_workers=max_in_flight)
+
+        def submit(collection):
+            return executor.submit(_compute_one, collection, scheduler)
+
+    pending = deque()
+    try:
+        for collection in collections:
+            pending.append(submit(collection))
+            if len(pending) == max_in_flight:
+                yield _result(pending.popleft())
+        while pending:
+            yield _result(pending.popleft())
+    finally:
+        for future in pending:
+            for f in (future if isinstance(future, list) else [future]):
+                f.cancel()
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+def _result(future):
+    # A list of futures for a tuple of collections computed with a client
+    if isinstance(future, list):
+        return tuple(f.result() for f in future)
+    return future.result()
+
+
+def _compute_one(collection, scheduler):
+    kwargs = {} if scheduler is None else {"scheduler": scheduler}
+    if isinstance(collection, tuple):
+        return dask.compute(*collection, **kwargs)
+    return dask.compute(collection, **kwargs)[0]
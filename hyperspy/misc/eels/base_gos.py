@@ -17,13 +17,60 @@
 # along with  HyperSpy.  If not, see <http://www.gnu.org/licenses/>.
 
 import numpy as np
+import scipy.interpolate
 
+from hyperspy.misc.eels import gos_cache
 from hyperspy.misc.math_tools import get_linear_interpolation
 from hyperspy.misc.elements import elements
 
 
 class GOSBase(object):
 
+    _interpolation_kind = "linear"
+
+    def _get_cache_key(self):
+        """Return a tuple identifying the tabulated GOS. Used, together
+        with the integration parameters, as key of the GOS cache."""
+        return (self._name, self.element, self.subshell)
+
+    def _integrateq(self, angle, E0):
+        """Return the GOS integrated over q at each energy of the energy
+        axis shifted by `energy_shift`."""
+        raise NotImplementedError
+
+    def integrateq(self, onset_energy, angle, E0):
+        """Integrate the GOS over q.
+
+        The result is cached, see :py:mod:`hyperspy.misc.eels.gos_cache`.
+
+        Parameters
+        ----------
+        onset_energy : float
+            The onset energy of the edge in eV.
+        angle : float
+            The effective collection semi-angle in rad.
+        E0 : float
+            The beam energy in keV.
+
+        Returns
+        -------
+        scipy.interpolate.interp1d
+            The energy differential cross section in barn/eV/atom as a
+            function of the energy loss.
+
+        """
+        self.energy_shift = onset_energy - self.onset_energy
+        key = self._get_cache_key() + (
+            float(onset_energy), float(angle), float(E0))
+        qint = gos_cache.get_integrated(key)
+        if qint is None:
+            qint = self._integrateq(angle, E0)
+            gos_cache.set_integrated(key, qint)
+        self.qint = qint
+        return scipy.interpolate.interp1d(
+            self.energy_axis + self.energy_shift, qint,
+            kind=self._interpolation_kind)
+
     def read_elements(self):
         element = self.element
         subshell = self.subshell
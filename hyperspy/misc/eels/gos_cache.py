@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+# Copyright 2007-2020 The HyperSpy developers
+#
+# This file is part of  HyperSpy.
+#
+#  HyperSpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+#  HyperSpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with  HyperSpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Cache of parsed GOS tables and of integrated GOS.
+
+The integrated GOS are kept in memory and, if
+`preferences.EELS.eels_gos_disk_cache` is True, also stored on disk in
+`cache_path` so that they can be reused between sessions.
+
+"""
+
+from collections import OrderedDict
+import hashlib
+import logging
+from pathlib import Path
+
+import numpy as np
+
+from hyperspy.defaults_parser import preferences
+from hyperspy.misc.config_dir import config_path
+
+_logger = logging.getLogger(__name__)
+
+# Increase when the integration changes to invalidate the disk cache
+CACHE_VERSION = 1
+MEMORY_CACHE_SIZE = 1024
+# Number of parsed GOS files kept in memory
+GOS_FILES_CACHE_SIZE = 32
+
+cache_path = Path(config_path, "EELS_GOS_cache")
+
+_gos_files = OrderedDict()
+_integrated = OrderedDict()
+
+
+def _key_to_filename(key):
+    digest = hashlib.sha1(repr((CACHE_VERSION,) + key).encode()).hexdigest()
+    return Path(cache_path, digest + ".npy")
+
+
+def read_gos_file(filename, parse):
+    """Return the parsed GOS file, parsing it only the first time.
+
+    Parameters
+    ----------
+    filename : pathlib.Path
+    parse : callable
+        Function that takes `filename` and returns the parsed tables. The
+        returned arrays are shared and must not be modified in place.
+
+    """
+    filename = Path(filename)
+    key = (str(filename.resolve()), filename.stat().st_mtime)
+    if key in _gos_files:
+        _gos_files.move_to_end(key)
+    else:
+        _gos_files[key] = parse(filename)
+        while len(_gos_files) > GOS_FILES_CACHE_SIZE:
+            _gos_files.popitem(last=False)
+    return _gos_files[key]
+
+
+def get_integrated(key):
+    """Return the cached integrated GOS for `key` or None if not cached.
+
+    Parameters
+    ----------
+    key : tuple
+        Hashable tuple, whose repr uniquely identifies the integration.
+
+    """
+    if key in _integrated:
+        _integrated.move_to_end(key)
+        return _integrated[key]
+    if preferences.EELS.eels_gos_disk_cache:
+        filename = _key_to_filename(key)
+        if filename.is_file():
+            try:
+                qint = np.load(filename, allow_pickle=False)
+            except (OSError, ValueError):
+                _logger.warning(f"Ignoring corrupted GOS cache {filename}")
+            else:
+                _store_in_memory(key, qint)
+                return qint
+    return None
+
+
+def set_integrated(key, qint):
+    """Store the integrated GOS `qint` for `key`.
+
+    Parameters
+    ----------
+    key : tuple
+    qint : numpy array
+
+    """
+    qint = np.array(qint)
+    qint.flags.writeable = False
+    _store_in_memory(key, qint)
+    if preferences.EELS.eels_gos_disk_cache:
+        filename = _key_to_filename(key)
+        try:
+            cache_path.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first to never leave a partially
+            # written file behind
+            tmp = filename.with_suffix(".tmp.npy")
+            np.save(tmp, qint, allow_pickle=False)
+            tmp.replace(filename)
+        except OSError as error:
+            _logger.warning(f"The GOS could not be cached on disk: {error}")
+
+
+def _store_in_memory(key, qint):
+    _integrated[key] = qint
+    _integrated.move_to_end(key)
+    while len(_integrated) > MEMORY_CACHE_SIZE:
+        _integrated.popitem(last=False)
+
+
+def clear(disk=False):
+    """Clear the GOS cache.
+
+    Parameters
+    ----------
+    disk : bool
+        If True, also delete the integrated GOS cached on disk.
+
+    """
+    _gos_files.clear()
+    _integrated.clear()
+    if disk and cache_path.is_dir():
+        for filename in cache_path.glob("*.npy"):
+            filename.unlink()
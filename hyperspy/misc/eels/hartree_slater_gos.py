@@ -16,6 +16,7 @@
 # You should have received a copy of the GNU General Public License
 # along with  HyperSpy.  If not, see <http://www.gnu.org/licenses/>.
 
+import hashlib
 import math
 import logging
 
@@ -25,6 +26,7 @@
 from pathlib import Path
 
 from hyperspy.defaults_parser import preferences
+from hyperspy.misc.eels import gos_cache
 from hyperspy.misc.eels.base_gos import GOSBase
 from hyperspy.misc.elements import elements
 from hyperspy.misc.export_dictionary import (
@@ -78,6 +80,7 @@ class HartreeSlaterGOS(GOSBase):
     """
 
     _name = 'Hartree-Slater'
+    _interpolation_kind = 3
 
     def __init__(self, element_subshell):
         """
@@ -144,6 +147,12 @@ def readgosfile(self):
                 "`preferences.EELS.eels_gos_files_path`."
             )
 
+        # The parsed files are cached as parsing them is relatively slow
+        self.gos_array, self.rel_energy_axis, self.qaxis = (
+            gos_cache.read_gos_file(gos_file, self._parse_gos_file))
+        self.energy_axis = self.rel_energy_axis + self.onset_energy
+
+    def _parse_gos_file(self, gos_file):
         with open(gos_file) as f:
             GOS_list = f.read().replace('\r', '').split()
 
@@ -154,22 +163,35 @@ def readgosfile(self):
         info2_1 = float(GOS_list[6])
         info2_2 = float(GOS_list[7])
         nrow = int(GOS_list[8])
-        self.gos_array = np.array(GOS_list[9:], dtype=np.float64)
+        gos_array = np.array(GOS_list[9:], dtype=np.float64)
         # The division by R is not in the equations, but it seems that
         # the the GOS was tabulated this way
-        self.gos_array = self.gos_array.reshape(nrow, ncol) / R
+        gos_array = gos_array.reshape(nrow, ncol) / R
         del GOS_list
 
         # Calculate the scale of the matrix
-        self.rel_energy_axis = self.get_parametrized_energy_axis(
+        rel_energy_axis = self.get_parametrized_energy_axis(
             info2_1, info2_2, nrow)
-        self.qaxis = self.get_parametrized_qaxis(
+        qaxis = self.get_parametrized_qaxis(
             info1_1, info1_2, ncol)
-        self.energy_axis = self.rel_energy_axis + self.onset_energy
-
-    def integrateq(self, onset_energy, angle, E0):
-        energy_shift = onset_energy - self.onset_energy
-        self.energy_shift = energy_shift
+        return gos_array, rel_energy_axis, qaxis
+
+    def _get_cache_key(self):
+        # The GOS can be read from different files or from a dictionary,
+        # therefore the tabulated values are used to identify them
+        tables = (self.gos_array, self.rel_energy_axis, self.qaxis)
+        cached = getattr(self, "_tables", ())
+        if len(cached) != len(tables) or any(
+                a is not b for a, b in zip(cached, tables)):
+            digest = hashlib.sha1()
+            for array in tables:
+                digest.update(np.ascontiguousarray(array).tobytes())
+            self._tables = tables
+            self._tables_digest = digest.hexdigest()
+        return super()._get_cache_key() + (self._tables_digest,)
+
+    def _integrateq(self, angle, E0):
+        energy_shift = self.energy_shift
         qint = np.zeros((self.energy_axis.shape[0]))
         # Calculate the cross section at each energy position of the
         # tabulated GOS
@@ -194,5 +216,4 @@ def integrateq(self, onset_energy, angle, E0):
         # Energy differential cross section in (barn/eV/atom)
         qint *= (4.0 * np.pi * a0 ** 2.0 * R ** 2 / E / T *
                  self.subshell_factor) * 1e28
-        self.qint = qint
-        return sp.interpolate.interp1d(E, qint, kind=3)
+        return qint
@@ -124,9 +124,8 @@ def __init__(self, element_subshell):
             ("\tOnset Energy = %s " % self.onset_energy))
         _logger.info(info_str)
 
-    def integrateq(self, onset_energy, angle, E0):
-        energy_shift = onset_energy - self.onset_energy
-        self.energy_shift = energy_shift
+    def _integrateq(self, angle, E0):
+        energy_shift = self.energy_shift
         gamma = 1 + E0 / 511.06
         T = 511060 * (1 - 1 / gamma ** 2) / 2
         qint = np.zeros((self.energy_axis.shape[0]))
@@ -143,9 +142,7 @@ def integrateq(self, onset_energy, angle, E0):
                 scipy.integrate.quad(
                     lambda x: self.gosfunc(E, np.exp(x)),
                     math.log(qa0sqmin), math.log(qa0sqmax))[0])
-        self.qint = qint
-        return sp.interpolate.interp1d(self.energy_axis + energy_shift,
-                                       qint)
+        return qint
 
     def gosfuncK(self, E, qa02):
         # gosfunc calculates (=DF/DE) which IS PER EV AND PER ATOM
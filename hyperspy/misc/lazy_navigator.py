@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+# Copyright 2007-2020 The HyperSpy developers
+#
+# This file is part of  HyperSpy.
+#
+#  HyperSpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+#  HyperSpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with  HyperSpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Computation and cache of the navigators of lazy signals.
+
+The navigator of a lazy signal, the sum over its signal axes, is computed
+one navigation chunk at a time, optionally in a background thread so that
+the plot can be displayed (and updated) before it is complete. The complete
+navigators are kept in memory for the session, keyed by the name of the
+dask array, and are saved in hspy files.
+
+"""
+
+from collections import OrderedDict
+from itertools import product
+import logging
+import threading
+
+import numpy as np
+
+from hyperspy.external.progressbar import progressbar
+from hyperspy.misc.dask_scheduler import compute
+
+_logger = logging.getLogger(__name__)
+
+# Number of navigators kept in memory
+MAX_CACHED_NAVIGATORS = 32
+
+_navigators = OrderedDict()
+
+
+def get_cached_navigator(data, shape=None):
+    """Return the navigator of the dask array `data` computed in this session
+    (or read from its file), or None.
+
+    Parameters
+    ----------
+    data : dask.array.Array
+    shape : None or tuple of int
+        If given, the navigator is only returned if it has this shape.
+    """
+    navigator = _navigators.get(getattr(data, "name", None))
+    if navigator is None or (shape is not None and navigator.shape != shape):
+        return None
+    _navigators.move_to_end(data.name)
+    return navigator
+
+
+def cache_navigator(data, navigator):
+    """Keep the navigator of the dask array `data` in memory.
+
+    Parameters
+    ----------
+    data : dask.array.Array
+    navigator : numpy.ndarray
+        The navigator, with the navigation shape of `data` in array order.
+    """
+    navigator = np.asarray(navigator)
+    navigator.flags.writeable = False
+    _navigators[data.name] = navigator
+    _navigators.move_to_end(data.name)
+    while len(_navigators) > MAX_CACHED_NAVIGATORS:
+        _navigators.popitem(last=False)
+
+
+def clear_cache():
+    """Remove all the navigators from memory."""
+    _navigators.clear()
+
+
+class NavigatorComputation:
+    """Compute the sum over the signal axes of a lazy signal one navigation
+    chunk at a time.
+
+    The result is written in `navigator`, which is filled with NaN until
+    computed. When all the chunks are computed, the navigator is cached, see
+    :py:func:`cache_navigator`.
+
+    Parameters
+    ----------
+    signal : LazySignal
+
+    Attributes
+    ----------
+    navigator : numpy.ndarray
+        The navigator, with the navigation shape in array order.
+    computed : int
+        The number of chunks computed.
+    size : int
+        The total number of chunks.
+    """
+
+    def __init__(self, signal):
+        signal._make_lazy()
+        self._key = signal.data
+        am = signal.axes_manager
+        nav_dim = am.navigation_dimension
+        # Navigation axes first, in array order, followed by the signal axes
+        self.data = signal._data_aligned_with_axes
+        self._signal_axes = tuple(range(nav_dim, self.data.ndim))
+        dtype = np.result_type(self.data.dtype, np.float64)
+        self.navigator = np.full(self.data.shape[:nav_dim], np.nan,
+                                 dtype=dtype)
+        chunks = self.data.chunks[:nav_dim]
+        self._edges = [np.cumsum((0, ) + c) for c in chunks]
+        self._blocks = list(product(*[range(len(c)) for c in chunks]))
+        self.size = len(self._blocks)
+        self.computed = 0
+        self._stop = threading.Event()
+        self.thread = None
+
+    @property
+    def done(self):
+        return self.computed == self.size
+
+    def compute_block(self):
+        """Compute the next chunk."""
+        block = self._blocks[self.computed]
+        getitem = tuple(slice(edge[i], edge[i + 1])
+                        for edge, i in zip(self._edges, block))
+        self.navigator[getitem], = compute(
+            self.data[getitem].sum(axis=self._signal_axes))
+        self.computed += 1
+        if self.done:
+            cache_navigator(self._key, self.navigator)
+
+    def run(self, show_progressbar=False):
+        """Compute the remaining chunks, unless stopped."""
+        with progressbar(total=self.size, initial=self.computed,
+                         disable=not show_progressbar, leave=True) as pbar:
+            while not self.done and not self._stop.is_set():
+                self.compute_block()
+                pbar.update(1)
+
+    def start(self):
+        """Compute the remaining chunks in a background thread."""
+        self.thread = threading.Thread(target=self._run_in_thread,
+                                       daemon=True)
+        self.thread.start()
+
+    def _run_in_thread(self):
+        try:
+            self.run()
+        except Exception:
+            _logger.exception("The navigator could not be computed.")
+
+    def stop(self):
+        """Stop the computation in the background thread."""
+        self._stop.set()
+        if self.thread is not None:
+            self.thread.join()
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+# Copyright 2007-2020 The HyperSpy developers
+#
+# This file is part of  HyperSpy.
+#
+#  HyperSpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+#  HyperSpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with  HyperSpy.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Storage of the intermediate results of lazy signals on disk, in zarr
+directories or HDF5 files, see
+:py:meth:`~hyperspy._signals.lazy.LazySignal.persist`."""
+
+import logging
+import os
+import shutil
+import tempfile
+import weakref
+
+import dask.array as da
+import h5py
+from dask import local, threaded
+
+from hyperspy.misc.dask_scheduler import compute, get_scheduler
+
+try:
+    import zarr
+except ImportError:
+    zarr = None
+
+_logger = logging.getLogger(__name__)
+
+
+def _remove_file(file, path):
+    try:
+        file.close()
+    except Exception:
+        pass
+    try:
+        os.remove(path)
+    except OSError:
+        _logger.warning(f"The temporary file {path} could not be removed.")
+
+
+def _remove_directory(path):
+    try:
+        shutil.rmtree(path)
+    except OSError:
+        _logger.warning(f"The temporary directory {path} could not be "
+                        "removed.")
+
+
+def _is_threaded(scheduler):
+    """Whether the scheduler runs the tasks in threads of this process,
+    which is required to use open h5py datasets."""
+    return scheduler in (None, "threads", "synchronous", "single-threaded",
+                         "sync", threaded.get, local.get_sync)
+
+
+def _is_regular(chunks):
+    # All the chunks but the last one have the same size along every axis
+    return all(len(set(c[:-1])) <= 1 and c[-1] <= c[0] for c in chunks
+               if c)
+
+
+def persist_to_disk(data, path=None, scheduler=None):
+    """Compute a dask array into a chunked zarr array or HDF5 dataset and
+    return a dask array reading it, with the same chunks.
+
+    Parameters
+    ----------
+    data : dask.array.Array
+    path : None or str
+        If None, the data is written in a temporary zarr directory if zarr is
+        installed and in a temporary HDF5 file otherwise, which is removed
+        when the data is no longer used by any dask array, or at the end of
+        the session. If the path ends with ".zarr", the data is written in a
+        zarr directory and otherwise in an HDF5 file.
+    scheduler : None, str or dask.distributed.Client
+        See :py:func:`~hyperspy.misc.dask_scheduler.get_scheduler`.
+
+    Returns
+    -------
+    dask.array.Array
+    """
+    if path is None and zarr is not None or \
+            path is not None and str(path).endswith(".zarr"):
+        return persist_to_zarr(data, path=path, scheduler=scheduler)
+    return persist_to_hdf5(data, path=path, scheduler=scheduler)
+
+
+def persist_to_zarr(data, path=None, scheduler=None):
+    """Compute a dask array into a chunked zarr array and return a dask
+    array reading it, with the same chunks.
+
+    Unlike HDF5 datasets, the zarr arrays can be read by the workers of any
+    scheduler. See :py:func:`persist_to_disk` for the parameters.
+    """
+    if zarr is None:
+        raise ImportError(
+            "Persisting to a zarr directory requires the `zarr` package, "
+            "install it with `pip install zarr`.")
+    temporary = path is None
+    if temporary:
+        path = tempfile.mkdtemp(prefix="hyperspy_", suffix=".zarr")
+    chunks = tuple(max(c + (1,)) for c in data.chunks)
+    try:
+        array = zarr.open_array(
+            zarr.DirectoryStore(str(path)), mode="w", shape=data.shape,
+            dtype=data.dtype, chunks=chunks)
+        # Without a lock, every zarr chunk must be written by one task
+        source = data if _is_regular(data.chunks) else data.rechunk(chunks)
+        compute(da.store(source, array, lock=False, compute=False),
+                scheduler=scheduler)
+    except BaseException:
+        if temporary:
+            _remove_directory(path)
+        raise
+    if temporary:
+        weakref.finalize(array, _remove_directory, path)
+    # The name identifies the data, e.g. in the chunk cache
+    return da.from_array(array, chunks=data.chunks,
+                         name="persisted-" + data.name)
+
+
+def persist_to_hdf5(data, path=None, scheduler=None):
+    """Compute a dask array into a chunked HDF5 dataset and return a dask
+    array reading it, with the same chunks.
+
+    The open h5py dataset can not be sent to other processes, so the data
+    can only be computed with the threaded or synchronous schedulers. See
+    :py:func:`persist_to_disk` for the parameters.
+    """
+    if not _is_threaded(get_scheduler(scheduler)):
+        raise ValueError(
+            "Persisting to an HDF5 file requires the 'threads' or "
+            "'synchronous' scheduler, since the HDF5 file can not be read "
+            "from other processes. Install zarr to persist to a zarr "
+            "directory instead.")
+    temporary = path is None
+    if temporary:
+        fd, path = tempfile.mkstemp(prefix="hyperspy_", suffix=".h5")
+        os.close(fd)
+    f = h5py.File(path, "w")
+    try:
+        dset = f.create_dataset(
+            "data", shape=data.shape, dtype=data.dtype,
+            chunks=tuple(max(c) for c in data.chunks) if data.size else None)
+        compute(da.store(data, dset, lock=True, compute=False),
+                scheduler=scheduler)
+    except BaseException:
+        if temporary:
+            _remove_file(f, path)
+        else:
+            f.close()
+        raise
+    f.flush()
+    if temporary:
+        weakref.finalize(dset, _remove_file, f, path)
+    # The name identifies the data, e.g. in the chunk cache
+    return da.from_array(dset, chunks=data.chunks,
+                         name="persisted-" + data.name)
@@ -28,6 +28,7 @@
 from contextlib import contextmanager
 import importlib
 import logging
+import os
 
 import numpy as np
 
@@ -262,14 +263,69 @@ class DictionaryTreeBrowser(object):
     False
     >>>
 
+    The nodes can be created lazily, in which case the dictionary, or the
+    callable returning it, is only processed when the node is first accessed:
+
+    >>> tree = DictionaryTreeBrowser(lambda: {"Branch": {"Leaf": 1}},
+    ...                              lazy=True)
+    >>> tree.Branch.Leaf
+    1
+
     """
 
-    def __init__(self, dictionary=None, double_lines=False):
+    def __init__(self, dictionary=None, double_lines=False, lazy=False):
+        """
+        Parameters
+        ----------
+        dictionary : {None, dict, callable}
+            The items of the tree. If `lazy`, it can also be a callable
+            without argument returning a dictionary, e.g. a function parsing
+            the metadata of a file.
+        double_lines : bool
+        lazy : bool
+            If True, the dictionary is processed when the node is first
+            accessed and its sub-nodes are lazy too.
+        """
         self._double_lines = double_lines
         if not dictionary:
             dictionary = {}
         super(DictionaryTreeBrowser, self).__init__()
-        self.add_dictionary(dictionary, double_lines=double_lines)
+        if lazy:
+            self.__dict__['_lazy_attributes'] = dictionary
+        else:
+            self.add_dictionary(dictionary, double_lines=double_lines)
+
+    def _process_lazy_attributes(self):
+        """Add the items of a lazy node, calling the callable returning them
+        if needed."""
+        __dict__ = object.__getattribute__(self, '__dict__')
+        if '_lazy_attributes' not in __dict__:
+            return
+        dictionary = __dict__.pop('_lazy_attributes')
+        if callable(dictionary):
+            try:
+                dictionary = dictionary()
+            except BaseException:
+                # Keep the node lazy to try again on next access
+                __dict__['_lazy_attributes'] = dictionary
+                raise
+        double_lines = self._double_lines
+        for key, value in dictionary.items():
+            # As in add_dictionary, the signals are created by __setattr__
+            if key == '_double_lines':
+                value = double_lines
+            elif isinstance(value, dict) and not key.startswith('_sig_'):
+                value = DictionaryTreeBrowser(
+                    value, double_lines=double_lines, lazy=True)
+            self.__setattr__(key, value)
+
+    def _process_all_lazy_attributes(self):
+        """Add the items of the node and of all its sub-nodes, which are not
+        lazy afterwards."""
+        for item in self.__dict__.values():
+            if isinstance(item, dict) and isinstance(
+                    item.get('_dtb_value_'), DictionaryTreeBrowser):
+                item['_dtb_value_']._process_all_lazy_attributes()
 
     def add_dictionary(self, dictionary, double_lines=False):
         """Add new items from dictionary.
@@ -419,6 +475,10 @@ def __getattribute__(self, name):
         if isinstance(name, bytes):
             name = name.decode()
         name = slugify(name, valid_variable_name=True)
+        if name == '__dict__' or not (
+                name.startswith('__') or hasattr(DictionaryTreeBrowser, name)):
+            # The items of lazy nodes are needed, not the methods
+            DictionaryTreeBrowser._process_lazy_attributes(self)
         item = super(DictionaryTreeBrowser, self).__getattribute__(name)
         if isinstance(item, dict) and '_dtb_value_' in item and "key" in item:
             return item['_dtb_value_']
@@ -426,6 +486,7 @@ def __getattribute__(self, name):
             return item
 
     def __setattr__(self, key, value):
+        DictionaryTreeBrowser._process_lazy_attributes(self)
         if key.startswith('_sig_'):
             key = key[5:]
             from hyperspy.signal import BaseSignal
@@ -1071,6 +1132,10 @@ def create_map_objects(function, nav_size, iterating_kwargs, **kwargs):
                       for signal in iterating_kwargs)
     # make all kwargs iterating for simplicity:
     iterating = tuple(key for key, value in iterating_kwargs)
+    # only keep the keys, so that the signals are not captured by ``func``,
+    # which may be serialised to be sent to other processes
+    signal_keys = tuple(key for key, value in iterating_kwargs
+                        if isinstance(value, BaseSignal))
     for k, v in kwargs.items():
         if k not in iterating:
             iterating += k,
@@ -1078,9 +1143,8 @@ def create_map_objects(function, nav_size, iterating_kwargs, **kwargs):
 
     def figure_out_kwargs(data):
         _kwargs = {k: v for k, v in zip(iterating, data[1:])}
-        for k, v in iterating_kwargs:
-            if (isinstance(v, BaseSignal) and
-                isinstance(_kwargs[k], np.ndarray) and
+        for k in signal_keys:
+            if (isinstance(_kwargs[k], np.ndarray) and
                     len(_kwargs[k]) == 1):
                 _kwargs[k] = _kwargs[k][0]
         return data[0], _kwargs
@@ -1092,6 +1156,357 @@ def func(*args):
     return func, iterators
 
 
+def collect_map_results(results, nav_shape, ragged=None, callback=None,
+                        filename=None):
+    """Gather the results of a mapped function into an array.
+
+    To be used in _map_iterate of BaseSignal.
+
+    Unless ``ragged`` is True, the shape and dtype of the output are inferred
+    from the first result and every result is written directly into a
+    preallocated array of shape ``(size,) + result_shape``, avoiding the
+    intermediate object array and the final stacking step. If a result of a
+    different shape is found and ``ragged`` is None, the results collected so
+    far are moved to an object array and the collection carries on in ragged
+    mode.
+
+    Parameters
+    ----------
+    results : iterable
+        The results of the function, in navigation (C) order.
+    nav_shape : tuple of int
+        The navigation shape in array order.
+    ragged : None or bool, default None
+        If True, the results are stored in an object array. If False, a
+        ValueError is raised when the result shapes are not identical. If
+        None, the appropriate choice is made while collecting.
+    callback : None or callable
+        Called without arguments after each result is stored, e.g. to update
+        a progress bar.
+    filename : None or str
+        If given, the non-ragged output array is a :py:class:`numpy.memmap`
+        backed by this file instead of an array in memory. It stays backed
+        by this file if its dtype needs to be promoted.
+
+    Returns
+    -------
+    data : numpy.ndarray
+        Array of shape ``nav_shape + sig_shape``, or an object array of shape
+        ``nav_shape`` if the results are ragged.
+    sig_shape : tuple of int or None
+        The shape of each result, ``()`` for results of shape ``(1,)``, or
+        None if the results are ragged.
+    ragged : bool
+        Whether the results are ragged.
+
+    """
+    size = max(1, multiply(nav_shape))
+    results = iter(results)
+    data = None
+    index = 0
+    res = None
+
+    if not ragged:
+        for index, res in enumerate(results):
+            res = np.asarray(res)
+            if data is None:
+                shape = (size,) + res.shape
+                if filename is None:
+                    data = np.empty(shape, dtype=res.dtype)
+                else:
+                    data = np.memmap(filename, dtype=res.dtype, mode="w+",
+                                     shape=shape)
+            elif res.shape != data.shape[1:]:
+                if ragged is False:
+                    raise ValueError(
+                        "The result shapes are not identical, but ragged=False"
+                    )
+                break
+            elif not np.can_cast(res.dtype, data.dtype):
+                # e.g. integer results followed by a float one
+                data = _promote_map_results(
+                    data, np.result_type(data.dtype, res.dtype), index,
+                    filename)
+            data[index] = res
+            res = None
+            if callback is not None:
+                callback()
+        if res is None:
+            sig_shape = data.shape[1:]
+            if sig_shape == (1,):
+                sig_shape = ()
+            return data.reshape(tuple(nav_shape) + sig_shape), sig_shape, False
+
+    # Ragged results: move what was already collected to an object array
+    res_data = np.empty(size, dtype="O")
+    for i in range(index):
+        res_data[i] = data[i]
+    if res is not None:
+        res_data[index] = res
+        if callback is not None:
+            callback()
+        index += 1
+    for index, res in enumerate(results, start=index):
+        res_data[index] = np.asarray(res)
+        if callback is not None:
+            callback()
+    # Without navigation, ragged results keep a single element navigation
+    return res_data.reshape(tuple(nav_shape) or (1,)), None, True
+
+
+def _promote_map_results(data, dtype, index, filename=None):
+    """Return the first `index` results of `data` in an array of `dtype`,
+    a :py:class:`numpy.memmap` backed by `filename` if given."""
+    if filename is None:
+        return data.astype(dtype)
+    # Copy to a new file, which then replaces the file of the results
+    tmp_filename = str(filename) + ".tmp"
+    promoted = np.memmap(tmp_filename, dtype=dtype, mode="w+",
+                         shape=data.shape)
+    promoted[:index] = data[:index]
+    promoted.flush()
+    shape = data.shape
+    del promoted, data
+    os.replace(tmp_filename, filename)
+    return np.memmap(filename, dtype=dtype, mode="r+", shape=shape)
+
+
+class SharedArray:
+    """Numpy array in memory that can be shared with other processes.
+
+    The memory is allocated with :py:mod:`multiprocessing.shared_memory` or,
+    when it is not available (Python < 3.8), with a :py:class:`numpy.memmap`
+    in a temporary file. Other processes attach to it using the picklable
+    ``spec`` attribute and :py:meth:`SharedArray.attach`.
+
+    The array must only be accessed through the ``array`` attribute, since
+    the memory can not be released while other references to it exist.
+
+    """
+
+    def __init__(self, shape, dtype):
+        dtype = np.dtype(dtype)
+        shape = tuple(shape)
+        nbytes = max(1, multiply(shape) * dtype.itemsize)
+        try:
+            from multiprocessing import shared_memory
+        except ImportError:  # pragma: no cover
+            shared_memory = None
+        if shared_memory is not None:
+            self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+            self._filename = None
+            self.array = np.ndarray(shape, dtype=dtype, buffer=self._shm.buf)
+            self.spec = ("shared_memory", self._shm.name, shape, dtype.str)
+        else:  # pragma: no cover
+            import tempfile
+            import os
+            fd, self._filename = tempfile.mkstemp(suffix=".dat")
+            os.close(fd)
+            self._shm = None
+            self.array = np.memmap(self._filename, dtype=dtype, mode="w+",
+                                   shape=shape)
+            self.spec = ("memmap", self._filename, shape, dtype.str)
+
+    @staticmethod
+    def attach(spec):
+        """Return the array described by ``spec`` and the object holding the
+        memory, which must be kept alive while the array is in use."""
+        kind, name, shape, dtype = spec
+        if kind == "shared_memory":
+            from multiprocessing import shared_memory
+            shm = shared_memory.SharedMemory(name=name)
+            return np.ndarray(shape, dtype=dtype, buffer=shm.buf), shm
+        else:  # pragma: no cover
+            array = np.memmap(name, dtype=dtype, mode="r+", shape=shape)
+            return array, array
+
+    def close(self):
+        """Release the memory."""
+        self.array = None
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+        else:  # pragma: no cover
+            import os
+            try:
+                os.remove(self._filename)
+            except OSError:
+                _logger.warning(f"The temporary file {self._filename} could "
+                                "not be removed.")
+
+
+# State of the worker processes of `map_with_process_pool`
+_map_worker_state = {}
+
+
+def _init_map_worker(function_dump, data_spec, out_spec):
+    import dill
+    _map_worker_state["function"] = dill.loads(function_dump)
+    _map_worker_state["data"], _map_worker_state["data_memory"] = \
+        SharedArray.attach(data_spec)
+    if out_spec is None:
+        _map_worker_state["out"] = None
+    else:
+        _map_worker_state["out"], _map_worker_state["out_memory"] = \
+            SharedArray.attach(out_spec)
+
+
+def _map_chunk(start, stop, values):
+    """Apply the function to the navigation pixels ``start`` to ``stop``.
+
+    The results are written to the shared output array. If a result can not
+    be written to it (e.g. ragged results), this and all the following
+    results of the chunk are returned instead, together with the index of
+    the first returned result.
+    """
+    from itertools import repeat
+
+    function = _map_worker_state["function"]
+    data = _map_worker_state["data"]
+    out = _map_worker_state["out"]
+    if values is None:
+        values = repeat(())
+    results = []
+    for i, value in zip(range(start, stop), values):
+        res = function((data[i],) + value)
+        if out is not None and not results:
+            res = np.asarray(res)
+            if (res.shape == out.shape[1:] and
+                    np.can_cast(res.dtype, out.dtype)):
+                out[i] = res
+                continue
+        results.append(res)
+    return stop - len(results), results
+
+
+def map_with_process_pool(function, data, iterators, nav_shape, ragged=None,
+                          max_workers=None, callback=None, chunksize=None,
+                          filename=None):
+    """Apply a function to all the navigation pixels in a pool of processes.
+
+    To be used in _map_iterate of BaseSignal.
+
+    The data is copied once to shared memory and each worker process
+    receives chunks of navigation indices together with the values of the
+    iterating keyword arguments for these pixels. The shape and dtype of
+    the output are inferred from the result of the first pixel, which is
+    computed in this process, and the workers write their results directly
+    into a shared output array.
+
+    Parameters
+    ----------
+    function : callable
+        Function taking a tuple ``(pixel_data, *iterating_values)``, as
+        returned by :py:func:`create_map_objects`. It is serialised with
+        :py:mod:`dill` to be sent to the workers.
+    data : numpy.ndarray
+        The signal data of shape ``(navigation_size,) + pixel_shape``.
+    iterators : tuple of iterables
+        The iterating keyword arguments values.
+    nav_shape : tuple of int
+        The navigation shape in array order.
+    ragged : None or bool, default None
+        See :py:func:`collect_map_results`.
+    max_workers : None or int
+        The number of processes. If None, defaults to
+        ``min(32, os.cpu_count())``.
+    callback : None or callable
+        Called with the number of pixels processed, e.g. to update a progress
+        bar.
+    chunksize : None or int
+        The number of pixels sent to the workers in each job. If None, the
+        navigation space is divided in about four chunks per worker.
+    filename : None or str
+        See :py:func:`collect_map_results`. The results are gathered in
+        shared memory before being copied to the file, so they must fit in
+        memory.
+
+    Returns
+    -------
+    data, sig_shape, ragged
+        See :py:func:`collect_map_results`.
+
+    """
+    import dill
+    from os import cpu_count
+    from itertools import islice
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    if max_workers is None:
+        max_workers = min(32, cpu_count())
+    size = len(data)
+    if chunksize is None:
+        chunksize = max(1, -(-(size - 1) // (4 * max_workers)))
+    values = zip(*iterators) if iterators else None
+
+    first = function((data[0],) + (next(values) if values else ()))
+    if callback is not None:
+        callback(1)
+
+    shared_data = SharedArray(data.shape, data.dtype)
+    shared_out = None
+    try:
+        shared_data.array[:] = data
+        if not ragged:
+            first = np.asarray(first)
+            if first.dtype.kind != "O" and first.size:
+                shared_out = SharedArray((size,) + first.shape, first.dtype)
+                shared_out.array[0] = first
+
+        starts = range(1, size, chunksize)
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_map_worker,
+            initargs=(dill.dumps(function), shared_data.spec,
+                      shared_out.spec if shared_out else None),
+        ) as executor:
+            futures = {}
+            for start in starts:
+                stop = min(start + chunksize, size)
+                chunk_values = (list(islice(values, stop - start))
+                                if values else None)
+                future = executor.submit(_map_chunk, start, stop,
+                                         chunk_values)
+                futures[future] = stop - start
+            for future in as_completed(futures):
+                # raise any exception of the workers as soon as possible
+                future.result()
+                if callback is not None:
+                    callback(futures[future])
+            chunks = [future.result() for future in futures]
+
+        if shared_out is not None and not any(res for _, res in chunks):
+            # all the results have been written in the shared array
+            if filename is None:
+                res_data = np.array(shared_out.array)
+            else:
+                res_data = np.memmap(filename, dtype=shared_out.array.dtype,
+                                     mode="w+", shape=shared_out.array.shape)
+                res_data[:] = shared_out.array
+            sig_shape = res_data.shape[1:]
+            if sig_shape == (1,):
+                sig_shape = ()
+            return res_data.reshape(tuple(nav_shape) + sig_shape), \
+                sig_shape, False
+
+        def results():
+            if shared_out is None:
+                yield first
+            else:
+                yield shared_out.array[0].copy()
+            for start, (written_stop, chunk_results) in zip(starts, chunks):
+                for i in range(start, written_stop):
+                    yield shared_out.array[i].copy()
+                yield from chunk_results
+
+        return collect_map_results(results(), nav_shape, ragged=ragged,
+                                   filename=filename)
+    finally:
+        shared_data.close()
+        if shared_out is not None:
+            shared_out.close()
+
+
 def map_result_construction(signal,
                             inplace,
                             result,
@@ -1112,8 +1527,10 @@ def map_result_construction(signal,
         sig.__class__ = LazySignal if lazy else BaseSignal
         sig.__init__(**sig._to_dictionary(add_models=True))
     else:
+        # A memmap result is kept, not copied into the data in memory
         if not sig._lazy and sig.data.shape == result.shape and np.can_cast(
-                result.dtype, sig.data.dtype):
+                result.dtype, sig.data.dtype) and \
+                not isinstance(result, np.memmap):
             sig.data[:] = result
         else:
             sig.data = result
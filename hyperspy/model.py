@@ -22,15 +22,18 @@
 import os
 import tempfile
 import warnings
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from contextlib import contextmanager
 from distutils.version import LooseVersion
 from functools import partial
+from itertools import islice
 
 import dill
 import numpy as np
 import scipy
 import scipy.odr as odr
 from IPython.display import display, display_pretty
+from numpy.lib.recfunctions import repack_fields
 from scipy.linalg import svd
 from scipy.optimize import (
     differential_evolution,
@@ -40,7 +43,8 @@
     OptimizeResult
 )
 
-from hyperspy.component import Component
+from hyperspy._signals.lazy import NavigationBlockStream
+from hyperspy.component import Component, Parameter
 from hyperspy.defaults_parser import preferences
 from hyperspy.docstrings.model import FIT_PARAMETERS_ARG
 from hyperspy.docstrings.signal import SHOW_PROGRESSBAR_ARG
@@ -49,6 +53,7 @@
 from hyperspy.extensions import ALL_EXTENSIONS
 from hyperspy.external.mpfit.mpfit import mpfit
 from hyperspy.external.progressbar import progressbar
+from hyperspy.misc.checkpoint import ModelCheckpoint
 from hyperspy.misc.export_dictionary import (export_to_dictionary,
                                              load_from_dictionary,
                                              parse_flag_string,
@@ -91,6 +96,33 @@ def _check_deprecated_optimizer(optimizer):
 
     return optimizer
 
+
+def _is_affine(twin_function_expr):
+    """Whether a twin function expression is affine, i.e. whether the twinned
+    parameter depends linearly on its twin. An empty expression is the
+    identity."""
+    if not twin_function_expr:
+        return True
+    import sympy
+    expr = sympy.sympify(twin_function_expr)
+    return all(sympy.diff(expr, symbol, 2) == 0
+               for symbol in expr.free_symbols)
+
+
+def _multifit_block(signal_dict, kwargs):
+    """Fit a model stored in a signal dictionary, in a worker process, and
+    return the parameter maps, the chi-squared and the degrees of freedom."""
+    signal = BaseSignal(**signal_dict)
+    signal._assign_subclass()
+    model = signal.models["multifit"].restore()
+    model.multifit(**kwargs)
+    # The maps are views into the parameter store of the model: only send
+    # back their own fields
+    maps = [[repack_fields(parameter.map) for parameter in
+             component.parameters] for component in model]
+    return maps, model.chisq.data, model.dof.data
+
+
 def reconstruct_component(comp_dictionary, **init_args):
     _id = comp_dictionary['_id_name']
     if _id in _COMPONENTS:
@@ -147,6 +179,77 @@ def __repr__(self):
         return ans
 
 
+class ParameterStore(object):
+
+    """Contiguous storage of the maps of all the parameters of a model.
+
+    The values and standard deviations of all the parameters are stored in
+    a single structured array of navigation shape, whose ``values`` and
+    ``std`` fields have shape ``(nav..., n)`` where ``n`` is the total
+    number of elements of the parameters and whose ``is_set`` field has
+    shape ``(nav..., number of parameters)``. The ``map`` attribute of the
+    parameters is replaced by a view into this array with the same fields
+    as before, so that storing or fetching the values of all the parameters
+    at a given pixel only indexes the array once.
+
+    Parameters
+    ----------
+    parameters : list of Parameter
+    shape : tuple
+        The shape of the parameter maps.
+
+    """
+
+    def __init__(self, parameters, shape):
+        self.parameters = tuple(parameters)
+        sizes = [parameter._number_of_elements for parameter in parameters]
+        n = sum(sizes)
+        self.data = np.zeros(shape, dtype=[
+            ('values', 'float', (n,)),
+            ('std', 'float', (n,)),
+            ('is_set', 'bool', (len(sizes),))])
+        self.data['std'].fill(np.nan)
+        self.slices = []
+        self.views = []
+        itemsize = np.dtype('float').itemsize
+        offset = 0
+        for i, (parameter, size) in enumerate(zip(parameters, sizes)):
+            format_ = ('float', size) if size > 1 else 'float'
+            view = self.data.view(np.dtype({
+                'names': ['values', 'std', 'is_set'],
+                'formats': [format_, format_, 'bool'],
+                'offsets': [itemsize * offset,
+                            itemsize * (n + offset),
+                            2 * itemsize * n + i],
+                'itemsize': self.data.dtype.itemsize}))
+            if (isinstance(parameter.map, np.ndarray) and
+                    parameter.map.shape == view.shape):
+                view[...] = parameter.map
+            parameter.map = view
+            self.views.append(view)
+            self.slices.append(slice(offset, offset + size))
+            offset += size
+
+    @property
+    def values(self):
+        return self.data['values']
+
+    @property
+    def std(self):
+        return self.data['std']
+
+    @property
+    def is_set(self):
+        return self.data['is_set']
+
+    def is_valid(self, parameters):
+        """Whether the store holds the maps of `parameters`, i.e. the
+        parameters did not change and their maps were not replaced."""
+        return (len(parameters) == len(self.parameters) and
+                all(p1 is p2 and p1.map is view for p1, p2, view in
+                    zip(parameters, self.parameters, self.views)))
+
+
 @add_gui_method(toolkey="hyperspy.Model")
 class BaseModel(list):
 
@@ -251,6 +354,12 @@ class BaseModel(list):
 
     """
 
+    # See _fixed_components_cached
+    _cache_fixed_components = False
+    _fixed_components_cache = None
+    # See _get_parameter_store
+    _parameter_store = None
+
     def __init__(self):
 
         self.events = Events()
@@ -654,6 +763,67 @@ def suspend_update(self, update_on_resume=True):
                         obj=position, value=position.value)
             self.update_plot(render_figure=True, update_ylimits=False)
 
+    @contextmanager
+    def _fixed_components_cached(self):
+        """Cache the summed contribution of the active components whose
+        parameters are all fixed until the 'with' clause completes, e.g.
+        during a fit. The cache is invalidated when the value of any of their
+        parameters or their active state changes.
+        """
+        old = self._cache_fixed_components
+        self._cache_fixed_components = True
+        try:
+            yield
+        finally:
+            self._cache_fixed_components = old
+            if not old:
+                self._clear_fixed_components_cache()
+
+    def _clear_fixed_components_cache(self):
+        cache = self._fixed_components_cache
+        if cache is None:
+            return
+        self._fixed_components_cache = None
+        for component in cache["components"]:
+            component.events.active_changed.disconnect(
+                self._clear_fixed_components_cache)
+        for parameter in cache["parameters"]:
+            parameter.events.value_changed.disconnect(
+                self._clear_fixed_components_cache)
+
+    def _get_fixed_components_cache(self, components, key):
+        """Return the cached contribution of the fixed components of
+        `components` or None if it is not cached for them and `key`.
+        """
+        cache = self._fixed_components_cache
+        if (cache is not None and cache["components"] == components and
+                cache["key"] == key and np.array_equal(
+                    cache["channel_switches"], self.channel_switches)):
+            return cache["contribution"]
+
+    def _set_fixed_components_cache(self, components, key, contribution):
+        self._clear_fixed_components_cache()
+        parameters = set()
+        for component in components:
+            for parameter in component.parameters:
+                # Twinned parameters change with their twin
+                while parameter is not None:
+                    parameters.add(parameter)
+                    parameter = parameter.twin
+        for component in components:
+            component.events.active_changed.connect(
+                self._clear_fixed_components_cache, [])
+        for parameter in parameters:
+            parameter.events.value_changed.connect(
+                self._clear_fixed_components_cache, [])
+        self._fixed_components_cache = {
+            "components": components,
+            "parameters": parameters,
+            "key": key,
+            "channel_switches": self.channel_switches.copy(),
+            "contribution": contribution,
+        }
+
     def _close_plot(self):
         if self._plot_components is True:
             self.disable_plot_components()
@@ -806,15 +976,70 @@ def ensure_parameters_in_bounds(self):
                             values[maxmask] = bmax
                         param.value = tuple(values)
 
+    def _get_parameter_store(self):
+        """Return the ParameterStore holding the maps of all parameters,
+        creating it if the components or the maps changed since it was last
+        created.
+
+        Returns None if the model has no parameters or if some maps cannot
+        be moved to the store because they are not numpy arrays or they
+        share memory with other arrays, e.g. the maps of a model obtained by
+        slicing another model with `inav`.
+
+        """
+        parameters = [parameter for component in self
+                      for parameter in component.parameters]
+        if not parameters:
+            return None
+        store = self._parameter_store
+        if store is None or not store.is_valid(parameters):
+            old_data = store.data if store is not None else None
+            for parameter in parameters:
+                map_ = parameter.map
+                if map_ is not None and not (
+                        isinstance(map_, np.ndarray) and
+                        (map_.base is None or map_.base is old_data)):
+                    self._parameter_store = None
+                    return None
+            shape = self.axes_manager._navigation_shape_in_array
+            if not shape:
+                shape = (1, )
+            store = ParameterStore(parameters, shape)
+            self._parameter_store = store
+        return store
+
+    def _get_store_index(self):
+        indices = self.axes_manager.indices[::-1]
+        # If it is a single spectrum indices is ()
+        return indices if indices else (0,)
+
     def store_current_values(self):
         """ Store the parameters of the current coordinates into the
         parameters array.
 
         If the parameters array has not being defined yet it creates it filling
         it with the current parameters."""
+        store = self._get_parameter_store()
+        if store is None:
+            for component in self:
+                if component.active:
+                    component.store_current_parameters_in_map()
+            return
+        index = self._get_store_index()
+        values = store.values[index]
+        std = store.std[index]
+        is_set = store.is_set[index]
+        i = 0
         for component in self:
+            nparameters = len(component.parameters)
             if component.active:
-                component.store_current_parameters_in_map()
+                for parameter, sl in zip(
+                        component.parameters, store.slices[i:]):
+                    values[sl] = parameter.value
+                    if parameter.std is not None:
+                        std[sl] = parameter.std
+                is_set[i:i + nparameters] = True
+            i += nparameters
 
     def fetch_stored_values(self, only_fixed=False, update_on_resume=True):
         """Fetch the value of the parameters that has been previously stored.
@@ -833,9 +1058,35 @@ def fetch_stored_values(self, only_fixed=False, update_on_resume=True):
 
         """
         cm = self.suspend_update if self._plot_active else dummy_context_manager
+        store = self._get_parameter_store()
+        if store is None:
+            with cm(update_on_resume=update_on_resume):
+                for component in self:
+                    component.fetch_stored_values(only_fixed=only_fixed)
+            return
+        index = self._get_store_index()
+        # Copy the values of all the parameters at once
+        values = store.values[index].copy()
+        std = store.std[index].copy()
+        is_set = store.is_set[index].copy()
         with cm(update_on_resume=update_on_resume):
+            i = 0
             for component in self:
-                component.fetch_stored_values(only_fixed=only_fixed)
+                if component.active_is_multidimensional:
+                    # Store the stored value in component._active and
+                    # trigger the connected functions.
+                    component.active = component.active
+                free = component.free_parameters if only_fixed else ()
+                for parameter, sl in zip(
+                        component.parameters, store.slices[i:]):
+                    if (is_set[i] and parameter not in free and
+                            not isinstance(parameter.twin, Parameter)):
+                        value, std_ = values[sl], std[sl]
+                        if parameter._number_of_elements == 1:
+                            value, std_ = value[0], std_[0]
+                        parameter.value = value
+                        parameter.std = std_
+                    i += 1
 
     def _on_navigating(self):
         """Same as fetch_stored_values but without update_on_resume since
@@ -927,9 +1178,8 @@ def _get_variance(self, only_current=True):
         if variance is not None:
             if isinstance(variance, BaseSignal):
                 if only_current:
-                    variance = variance.data.__getitem__(
-                        self.axes_manager._getitem_tuple
-                        )[np.where(self.channel_switches)]
+                    variance = variance(self.axes_manager)[
+                        np.where(self.channel_switches)]
                 else:
                     variance = variance.data[..., np.where(
                         self.channel_switches)[0]]
@@ -993,7 +1243,7 @@ def _convert_variance_to_weights(self):
 
         if variance is not None:
             if isinstance(variance, BaseSignal):
-                variance = variance.data.__getitem__(self.axes_manager._getitem_tuple)[
+                variance = variance(self.axes_manager)[
                     np.where(self.channel_switches)
                 ]
 
@@ -1004,6 +1254,52 @@ def _convert_variance_to_weights(self):
 
         return weights
 
+    def _check_linear_parameters(self):
+        """Raise a ValueError if the model is not linear in its free
+        parameters, which is required by the "linear" optimizer.
+        """
+        nonlinear = []
+        for component in self:
+            if not component.active:
+                continue
+            for parameter in component.parameters:
+                if parameter.free:
+                    if not parameter._linear:
+                        nonlinear.append(parameter)
+                elif (isinstance(parameter.twin, Parameter) and
+                      parameter.twin.free and parameter.twin.component.active):
+                    # The twin must enter the model linearly too
+                    if not (parameter._linear and
+                            _is_affine(parameter.twin_function_expr)):
+                        nonlinear.append(parameter)
+        if nonlinear:
+            names = ", ".join(
+                f"{parameter.component.name}.{parameter.name}"
+                for parameter in nonlinear)
+            raise ValueError(
+                "`optimizer='linear'` requires a model that is linear in its "
+                f"free parameters, but it is not linear in: {names}. Fix these "
+                "parameters or use a different optimizer.")
+
+    def _linear_design_matrix(self):
+        """Return the model evaluated with all the free parameters set to
+        zero and the contribution of a unit change of each free parameter,
+        as columns of the design matrix.
+
+        The model is evaluated through :py:meth:`_model_function` so that
+        twins, convolution, binning and the signal range are taken into
+        account.
+        """
+        self._set_p0()
+        param = np.zeros(len(self.p0))
+        offset = np.asarray(self._model_function(param), dtype=float).ravel()
+        design = np.empty((offset.size, param.size))
+        for i in range(param.size):
+            param[i] = 1.
+            design[:, i] = np.ravel(self._model_function(param)) - offset
+            param[i] = 0.
+        return offset, design
+
     def fit(
         self,
         optimizer="lm",
@@ -1184,7 +1480,8 @@ def fit(
                 f"loss_function must be one of {_supported_losses} "
                 f"or callable, not '{loss_function}'"
             )
-        elif loss_function != "ls" and optimizer in ["lm", "trf", "dogbox", "odr"]:
+        elif loss_function != "ls" and optimizer in [
+                "lm", "trf", "dogbox", "odr", "linear"]:
             raise NotImplementedError(
                 f"`optimizer='{optimizer}'` only supports "
                 "least-squares fitting (`loss_function='ls'`)"
@@ -1249,7 +1546,7 @@ def fit(
                 f"'{grad}'."
             )
 
-        with cm(update_on_resume=True):
+        with cm(update_on_resume=True), self._fixed_components_cached():
             self.p_std = None
             self._set_p0()
             old_p0 = self.p0
@@ -1374,6 +1671,26 @@ def _wrap_jac(*args, **kwargs):
                 # Calculate estimated parameter standard deviation
                 self.p_std = self._calculate_parameter_std(pcov, cost, ysize)
 
+            elif optimizer == "linear":
+                self._check_linear_parameters()
+                y = args[0]
+                offset, design = self._linear_design_matrix()
+                weights = np.broadcast_to(
+                    1.0 if weights is None else weights, y.shape)
+                design_w = design * weights[:, np.newaxis]
+                y_w = (y - offset) * weights
+                p, _, rank, _ = np.linalg.lstsq(design_w, y_w, rcond=None)
+                fun = design_w @ p - y_w
+                cost = np.sum(fun ** 2)
+                pcov = np.linalg.pinv(design_w.T @ design_w)
+
+                self.fit_output = OptimizeResult(
+                    x=p, fun=fun, rank=rank, success=True, status=0,
+                    message="Linear least-squares solution found.")
+                self.p0 = p
+                # Calculate estimated parameter standard deviation
+                self.p_std = self._calculate_parameter_std(pcov, cost, y.size)
+
             elif optimizer == "odr":
                 if not hasattr(self, "axis"):
                     raise NotImplementedError(
@@ -1499,6 +1816,9 @@ def multifit(
         show_progressbar=None,
         interactive_plot=False,
         iterpath=None,
+        parallel=False,
+        max_workers=None,
+        resume=False,
         **kwargs,
     ):
         """Fit the data to the model at all positions of the navigation dimensions.
@@ -1512,9 +1832,14 @@ def multifit(
         fetch_only_fixed : bool, default False
             If True, only the fixed parameters values will be updated
             when changing the positon.
-        autosave : bool, default False
+        autosave : bool or str, default False
             If True, the result of the fit will be saved automatically
-            with a frequency defined by autosave_every.
+            with a frequency defined by autosave_every to a temporary HDF5
+            file, which is deleted when multifit finishes. If a string, the
+            name of the HDF5 file, which is kept and can be used to resume the
+            fit with ``resume=True``. Only the rows of the navigation space
+            fitted since the previous save are written, see
+            :py:class:`~hyperspy.misc.checkpoint.ModelCheckpoint`.
         autosave_every : int, default 10
             Save the result of fitting every given number of spectra.
         %s
@@ -1534,6 +1859,22 @@ def multifit(
                 Currently ``None -> "flyback"``. The default argument will use
                 the ``"flyback"`` iterpath, but shows a warning that this will
                 change to ``"serpentine"`` in version 2.0.
+        parallel : bool, default False
+            If True, split the navigation space in blocks of contiguous rows
+            and fit each block in a separate process. Within each block, the
+            positions are fitted in the order given by ``iterpath``, so that
+            the result of a fit is the starting point of the next one as in
+            the serial case. The blocks are sent to the processes as they
+            become free, so that the data of lazy signals is not loaded in
+            memory at once. Not compatible with ``interactive_plot``.
+        max_workers : None or int
+            Maximum number of processes used when ``parallel=True``. If None,
+            defaults to ``os.cpu_count()``.
+        resume : bool, default False
+            If True, ``autosave`` must be the name of a file written by a
+            previous (e.g. interrupted) call of multifit. The results stored
+            in the file are restored and only the remaining positions are
+            fitted. If the file does not exist, all positions are fitted.
         **kwargs : keyword arguments
             Any extra keyword argument will be passed to the fit method.
             See the documentation for :py:meth:`~hyperspy.model.BaseModel.fit`
@@ -1551,17 +1892,6 @@ def multifit(
         if show_progressbar is None:
             show_progressbar = preferences.General.show_progressbar
 
-        if autosave:
-            fd, autosave_fn = tempfile.mkstemp(
-                prefix="hyperspy_autosave-", dir=".", suffix=".npz"
-            )
-            os.close(fd)
-            autosave_fn = autosave_fn[:-4]
-            _logger.info(
-                f"Autosaving every {autosave_every} pixels to {autosave_fn}.npz. "
-                "When multifit finishes, this file will be deleted."
-            )
-
         if mask is not None and (
             mask.shape != tuple(self.axes_manager._navigation_shape_in_array)
         ):
@@ -1570,6 +1900,37 @@ def multifit(
                 f"shape: {self.axes_manager._navigation_shape_in_array}"
             )
 
+        if parallel and interactive_plot:
+            raise ValueError(
+                "`interactive_plot=True` is not supported when `parallel=True`."
+            )
+
+        if resume and not isinstance(autosave, str):
+            raise ValueError(
+                "`resume=True` requires `autosave` to be the name of the file "
+                "to resume from."
+            )
+
+        checkpoint = None
+        if autosave:
+            if isinstance(autosave, str):
+                autosave_fn = autosave
+            else:
+                fd, autosave_fn = tempfile.mkstemp(
+                    prefix="hyperspy_autosave-", dir=".", suffix=".h5"
+                )
+                os.close(fd)
+                _logger.info(
+                    f"Autosaving every {autosave_every} pixels to "
+                    f"{autosave_fn}. When multifit finishes, this file will be "
+                    "deleted."
+                )
+            checkpoint = ModelCheckpoint(self, autosave_fn, resume=resume)
+            if checkpoint.done.any():
+                done = checkpoint.done.reshape(
+                    self.axes_manager._navigation_shape_in_array)
+                mask = done if mask is None else np.logical_or(mask, done)
+
         masked_elements = 0 if mask is None else mask.sum()
         maxval = self.axes_manager.navigation_size - masked_elements
         show_progressbar = show_progressbar and (maxval > 0)
@@ -1585,40 +1946,329 @@ def multifit(
         else:
             self.axes_manager._iterpath = iterpath
 
-        i = 0
-        with self.axes_manager.events.indices_changed.suppress_callback(
-            self.fetch_stored_values
-        ):
-            if interactive_plot:
-                outer = dummy_context_manager
-                inner = self.suspend_update
+        try:
+            if (kwargs.get("optimizer", None) == "linear" and
+                    self._linear_multifit_is_uniform()):
+                # All pixels share the same design matrix: solve them at once
+                self._multifit_linear(
+                    mask=mask, show_progressbar=show_progressbar, **kwargs)
+                if checkpoint is not None:
+                    checkpoint.mark_rows(0, checkpoint.done.shape[0], mask)
+            elif parallel and maxval > 1:
+                self._multifit_parallel(
+                    mask=mask,
+                    fetch_only_fixed=fetch_only_fixed,
+                    checkpoint=checkpoint,
+                    show_progressbar=show_progressbar,
+                    max_workers=max_workers,
+                    **kwargs,
+                )
             else:
-                outer = self.suspend_update
-                inner = dummy_context_manager
-
-            with outer(update_on_resume=True):
-                with progressbar(
-                    total=maxval, disable=not show_progressbar, leave=True
-                ) as pbar:
-                    for index in self.axes_manager:
-                        with inner(update_on_resume=True):
-                            if mask is None or not mask[index[::-1]]:
-                                self.fetch_stored_values(only_fixed=fetch_only_fixed)
-                                self.fit(**kwargs)
-                                i += 1
-                                pbar.update(1)
-
-                            if autosave and i % autosave_every == 0:
-                                self.save_parameters2file(autosave_fn)
-            # Trigger the indices_changed event to update to current indices,
-            # since the callback was suppressed
-            self.axes_manager.events.indices_changed.trigger(self.axes_manager)
+                i = 0
+                # Lazy data is computed one block of the navigation space at a
+                # time, see NavigationBlockStream
+                blocks = NavigationBlockStream(self._get_fitted_signals())
+                indices_changed = self.axes_manager.events.indices_changed
+                with blocks, indices_changed.suppress_callback(
+                        self.fetch_stored_values):
+                    if interactive_plot:
+                        outer = dummy_context_manager
+                        inner = self.suspend_update
+                    else:
+                        outer = self.suspend_update
+                        inner = dummy_context_manager
+
+                    with outer(update_on_resume=True):
+                        with progressbar(
+                            total=maxval, disable=not show_progressbar,
+                            leave=True
+                        ) as pbar:
+                            for index in self.axes_manager:
+                                with inner(update_on_resume=True):
+                                    if mask is None or not mask[index[::-1]]:
+                                        if index:
+                                            blocks.load(index[-1])
+                                        self.fetch_stored_values(
+                                            only_fixed=fetch_only_fixed)
+                                        self.fit(**kwargs)
+                                        i += 1
+                                        pbar.update(1)
+
+                                        if checkpoint is not None:
+                                            checkpoint.mark(index[::-1])
+                                            if i % autosave_every == 0:
+                                                checkpoint.write()
+                    # Trigger the indices_changed event to update to current
+                    # indices, since the callback was suppressed
+                    indices_changed.trigger(self.axes_manager)
+        except BaseException:
+            # Keep the fits done since the last write, to resume from them
+            if checkpoint is not None:
+                checkpoint.close()
+            raise
+
+        if checkpoint is not None:
+            self._close_autosave(checkpoint, autosave)
+
+    multifit.__doc__ %= (SHOW_PROGRESSBAR_ARG)
 
+    def _get_fitted_signals(self):
+        """Return the signals whose data is read at every position when
+        fitting: the signal, its noise variance and the low-loss, if any.
+        """
+        variance = self.signal.metadata.get_item(
+            "Signal.Noise_properties.variance")
+        signals = [self.signal, variance, getattr(self, "_low_loss", None)]
+        return [signal for signal in signals
+                if isinstance(signal, BaseSignal)]
+
+    def _close_autosave(self, checkpoint, autosave):
         if autosave is True:
-            _logger.info(f"Deleting temporary file: {autosave_fn}.npz")
-            os.remove(autosave_fn + ".npz")
+            checkpoint.file.close()
+            _logger.info(f"Deleting temporary file: {checkpoint.filename}")
+            os.remove(checkpoint.filename)
+        else:
+            checkpoint.close()
+
+    def _multifit_parallel(self, mask=None, fetch_only_fixed=False,
+                           checkpoint=None, show_progressbar=None,
+                           max_workers=None, **kwargs):
+        """Run :py:meth:`multifit` in blocks of rows of the navigation space,
+        each in a separate process, and merge the results in the parameter
+        maps of this model.
+
+        The blocks are smaller than ``preferences.General.lazy_chunk_size``
+        and there are several per worker. A new block is only prepared
+        (sliced, computed if lazy and serialised) when the result of another
+        one is merged, so that at most ``max_workers + 1`` blocks are in the
+        memory of this process at any time.
+        """
+        from hyperspy.samfire_utils.samfire_pool import _walk_compute
+
+        nrows = self.axes_manager._navigation_shape_in_array[0]
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        row_nbytes = sum(signal.data.nbytes for signal in
+                         self._get_fitted_signals()) // nrows
+        max_rows = int(preferences.General.lazy_chunk_size * 2 ** 20) // \
+            max(row_nbytes, 1)
+        # Several blocks per worker, to balance the load
+        rows = max(1, min(max_rows, -(-nrows // (4 * max_workers))))
+        edges = np.append(np.arange(0, nrows, rows), nrows)
+        blocks = iter(zip(edges[:-1], edges[1:]))
+        ndim = self.axes_manager.navigation_dimension
+        kwargs.update(
+            fetch_only_fixed=fetch_only_fixed,
+            iterpath=self.axes_manager._iterpath,
+            show_progressbar=False,
+        )
 
-    multifit.__doc__ %= (SHOW_PROGRESSBAR_ARG)
+        def submit(executor, start, stop):
+            block = self.inav[(slice(None),) * (ndim - 1) +
+                              (slice(start, stop),)]
+            # The worker processes must not use the dask scheduler of
+            # this process, so send them the data in memory
+            for signal in block._get_fitted_signals():
+                if signal._lazy:
+                    signal.compute(show_progressbar=False)
+            block.store("multifit")
+            signal_dict = block.signal._to_dictionary(False)
+            signal_dict["models"] = block.signal.models._models.as_dictionary()
+            signal_dict = _walk_compute(signal_dict)
+            block_kwargs = dict(
+                kwargs, mask=None if mask is None else mask[start:stop])
+            future = executor.submit(_multifit_block, signal_dict,
+                                     block_kwargs)
+            size = block.axes_manager.navigation_size or 1
+            if mask is not None:
+                size -= mask[start:stop].sum()
+            futures[future] = (start, stop, size)
+
+        total = self.axes_manager.navigation_size
+        if mask is not None:
+            total -= mask.sum()
+        futures = {}
+        with ProcessPoolExecutor(max_workers=max_workers) as executor, \
+                progressbar(total=total, disable=not show_progressbar,
+                            leave=True) as pbar:
+            for start, stop in islice(blocks, max_workers + 1):
+                submit(executor, start, stop)
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    start, stop, size = futures.pop(future)
+                    maps, chisq, dof = future.result()
+                    for component, component_maps in zip(self, maps):
+                        for parameter, map_ in zip(component.parameters,
+                                                   component_maps):
+                            parameter.map[start:stop] = map_
+                    self.chisq.data[start:stop] = chisq
+                    self.dof.data[start:stop] = dof
+                    pbar.update(size)
+                    if checkpoint is not None:
+                        checkpoint.mark_rows(
+                            start, stop,
+                            None if mask is None else mask[start:stop])
+                        checkpoint.write()
+                    next_block = next(blocks, None)
+                    if next_block is not None:
+                        submit(executor, *next_block)
+
+        self.fetch_stored_values()
+        self.events.fitted.trigger(self)
+
+    def _linear_multifit_is_uniform(self):
+        """Whether the design matrix of the "linear" optimizer is the same at
+        all navigation indices, i.e. whether the active components and the
+        values of the parameters that are not fitted do not change across the
+        navigation space.
+        """
+        if getattr(self, "convolved", False):
+            # The low-loss spectrum can change at every position
+            return False
+        for component in self:
+            if component.active_is_multidimensional:
+                return False
+            if not component.active:
+                continue
+            for parameter in component.parameters:
+                while parameter.twin is not None:
+                    parameter = parameter.twin
+                if parameter.free:
+                    continue
+                values = parameter.map["values"][parameter.map["is_set"]]
+                if not np.all(values == parameter.value):
+                    return False
+        return True
+
+    def _multifit_linear(self, mask=None, show_progressbar=None,
+                         bounded=False, loss_function="ls", **kwargs):
+        """Fit all the navigation indices at once with the "linear" optimizer.
+
+        This is only valid when :py:meth:`_linear_multifit_is_uniform` is True.
+        The design matrix is computed once and the (weighted) linear least
+        squares problems of all the pixels are solved in chunks.
+        """
+        if bounded:
+            raise ValueError(
+                "Bounded optimization is not supported by `optimizer='linear'`."
+            )
+        if loss_function != "ls":
+            raise NotImplementedError(
+                "`optimizer='linear'` only supports least-squares fitting "
+                "(`loss_function='ls'`)"
+            )
+        self._check_linear_parameters()
+
+        with self.suspend_update(update_on_resume=True):
+            offset, design = self._linear_design_matrix()
+            nparam = design.shape[1]
+            size = max(self.axes_manager.navigation_size, 1)
+            channels = np.where(self.channel_switches.ravel())[0]
+            data = self.signal._data_aligned_with_axes.reshape((size, -1))
+            variance = self.signal.get_noise_variance()
+            if isinstance(variance, BaseSignal):
+                variance = variance._data_aligned_with_axes.reshape((size, -1))
+                pinv = None
+            else:
+                pinv = np.linalg.pinv(design)
+                pcov = pinv @ pinv.T
+            if mask is None:
+                rows = np.arange(size)
+            else:
+                rows = np.flatnonzero(~np.asarray(mask, dtype=bool).ravel())
+
+            free_parameters = []
+            for component in self:
+                if component.active:
+                    free_parameters.extend(component.free_parameters)
+
+            # Keep the temporary arrays of each chunk to a few tens of MB
+            chunk_size = max(1, 2 ** 21 // (channels.size * max(nparam, 1)))
+            warn_cov = False
+            with progressbar(total=rows.size, disable=not show_progressbar,
+                             leave=True) as pbar:
+                for start in range(0, rows.size, chunk_size):
+                    chunk = rows[start:start + chunk_size]
+                    y = np.asarray(data[chunk][:, channels], dtype=float)
+                    y -= offset
+                    if pinv is None:
+                        w2 = 1.0 / np.asarray(
+                            variance[chunk][:, channels], dtype=float)
+                        pcov_ = np.linalg.pinv(
+                            np.einsum("nm,mi,mj->nij", w2, design, design))
+                        p = np.einsum(
+                            "nij,nj->ni", pcov_,
+                            np.einsum("nm,mi->ni", w2 * y, design))
+                        p_var = np.diagonal(pcov_, axis1=1, axis2=2)
+                    else:
+                        w2 = 1.0 if variance is None else 1.0 / variance
+                        p = y @ pinv.T
+                        p_var = np.diag(pcov)[np.newaxis] / w2
+                    fun = p @ design.T - y
+                    cost = np.sum(w2 * fun ** 2, axis=1)
+                    if channels.size > nparam:
+                        with np.errstate(invalid="ignore"):
+                            p_std = np.sqrt(
+                                p_var * (cost / (channels.size - nparam))
+                                [:, np.newaxis])
+                    else:
+                        p_std = np.full_like(p, np.nan)
+                    invalid = ~np.all(np.isfinite(p_std), axis=1)
+                    p_std[invalid] = np.nan
+                    warn_cov |= bool(invalid.any())
+
+                    i = 0
+                    for parameter in free_parameters:
+                        n = parameter._number_of_elements
+                        index = np.unravel_index(chunk, parameter.map.shape)
+                        sl = i if n == 1 else slice(i, i + n)
+                        parameter.map["values"][index] = p[:, sl]
+                        parameter.map["std"][index] = p_std[:, sl]
+                        parameter.map["is_set"][index] = True
+                        i += n
+                    index = np.unravel_index(chunk, self.chisq.data.shape)
+                    self.chisq.data[index] = cost
+                    self.dof.data[index] = nparam
+                    pbar.update(chunk.size)
+
+            if warn_cov:
+                _logger.warning(
+                    "Covariance of the parameters could not be estimated "
+                    "for some navigation indices. Estimated parameter "
+                    "standard deviations will be np.nan."
+                )
+
+            # Store the values of the parameters that are not fitted as
+            # `fit` does
+            free_parameters = set(free_parameters)
+
+            def get_values(parameter, index):
+                if parameter in free_parameters:
+                    return parameter.map["values"][index]
+                elif parameter.twin is not None:
+                    values = get_values(parameter.twin, index)
+                    if parameter.twin_function:
+                        values = parameter.twin_function(values)
+                    return values
+                else:
+                    return parameter.value
+
+            for component in self:
+                if not component.active:
+                    continue
+                for parameter in component.parameters:
+                    if parameter in free_parameters:
+                        continue
+                    index = np.unravel_index(rows, parameter.map.shape)
+                    parameter.map["values"][index] = get_values(
+                        parameter, index)
+                    parameter.map["is_set"][index] = True
+                    if parameter.std is not None:
+                        parameter.map["std"][index] = parameter.std
+
+            self.fetch_stored_values()
+        self.events.fitted.trigger(self)
 
     def save_parameters2file(self, filename):
         """Save the parameters array in binary format.
@@ -1649,7 +2299,8 @@ def save_parameters2file(self, filename):
             cname = component.name.lower().replace(' ', '_')
             for param in component.parameters:
                 pname = param.name.lower().replace(' ', '_')
-                kwds['%s_%s.%s' % (i, cname, pname)] = param.map
+                # The maps are views with the fields of all the parameters
+                kwds['%s_%s.%s' % (i, cname, pname)] = repack_fields(param.map)
             i += 1
         np.savez(filename, **kwds)
 
@@ -22,6 +22,7 @@
 from scipy.special import huber
 
 import hyperspy.drawing.signal1d
+from hyperspy._components.expression import Expression, _FusedExpressions
 from hyperspy.axes import generate_axis
 from hyperspy.decorators import interactive_range_selector
 from hyperspy.drawing.widgets import LabelWidget, VerticalLineWidget
@@ -30,9 +31,21 @@
 from hyperspy.model import BaseModel, ModelComponents, ModelSpecialSlicers
 from hyperspy.signal_tools import SpanSelectorInSignal1D
 from hyperspy.ui_registry import DISPLAY_DT, TOOLKIT_DT, add_gui_method
+from hyperspy.misc.math_tools import optimal_fft_size
 from hyperspy.misc.utils import dummy_context_manager
 
 
+def _is_fixed(component):
+    """Whether none of the parameters of the component, or of their twins,
+    are free."""
+    for parameter in component.parameters:
+        while parameter.twin is not None:
+            parameter = parameter.twin
+        if parameter.free:
+            return False
+    return True
+
+
 @add_gui_method(toolkey="hyperspy.Model1D.fit_component")
 class ComponentFit(SpanSelectorInSignal1D):
 
@@ -205,6 +218,9 @@ class Model1D(BaseModel):
     enable_adjust_position, disable_adjust_position
         Enable/disable interactive adjustment of the position of the components
         that have a well defined position. (Use after `plot`).
+    enable_fused_evaluation, disable_fused_evaluation
+        Enable/disable evaluating the Expression components as a single
+        compiled function.
     fit_component
         Fit just the given component in the given signal range, that can be
         set interactively.
@@ -279,6 +295,9 @@ def __init__(self, signal1D, dictionary=None):
             self.signal.metadata.General.title + ' degrees of freedom')
         self.free_parameters_boundaries = None
         self._low_loss = None
+        self._low_loss_fft = None
+        self._fused_module = None
+        self._fused_expressions = {}
         self.convolved = False
         self.components = ModelComponents(self)
         if dictionary is not None:
@@ -316,20 +335,30 @@ def low_loss(self):
 
     @low_loss.setter
     def low_loss(self, value):
+        if value is not None and (
+                value.axes_manager.navigation_shape !=
+                self.signal.axes_manager.navigation_shape):
+            raise ValueError('The low-loss does not have '
+                             'the same navigation dimension as the '
+                             'core-loss')
+        if self._low_loss is not None:
+            self._low_loss.events.data_changed.disconnect(
+                self._on_low_loss_data_changed)
+        self._low_loss = value
+        self._low_loss_fft = None
         if value is not None:
-            if (value.axes_manager.navigation_shape !=
-                    self.signal.axes_manager.navigation_shape):
-                raise ValueError('The low-loss does not have '
-                                 'the same navigation dimension as the '
-                                 'core-loss')
-            self._low_loss = value
+            value.events.data_changed.connect(
+                self._on_low_loss_data_changed, [])
             self.set_convolution_axis()
             self.convolved = True
         else:
-            self._low_loss = value
             self.convolution_axis = None
             self.convolved = False
 
+    def _on_low_loss_data_changed(self):
+        # The cached FFT of the low-loss spectrum is out of date
+        self._low_loss_fft = None
+
     # Extend the list methods to call the _touch when the model is modified
 
     def set_convolution_axis(self):
@@ -344,6 +373,38 @@ def set_convolution_axis(self):
         knot_position = ll_axis.size - ll_axis.value2index(0) - 1
         self.convolution_axis = generate_axis(self.axis.offset, step,
                                               dimension, knot_position)
+        self._low_loss_fft = None
+
+    def _convolve_low_loss(self, array):
+        """Convolve `array`, sampled on the convolution axis, with the
+        low-loss spectrum of the current pixel.
+
+        This is equivalent to ``np.convolve(low_loss, array, mode="valid")``
+        but is computed using FFTs. The rFFT of the zero-padded low-loss
+        spectrum is cached and only recomputed when the navigation indices
+        or the low-loss data change.
+
+        Parameters
+        ----------
+        array : numpy array
+            Array of the same length as `convolution_axis`.
+
+        Returns
+        -------
+        numpy array of the same length as the signal axis.
+
+        """
+        size = len(array)
+        key = (id(self._low_loss), self.axes_manager.indices, size)
+        if self._low_loss_fft is None or self._low_loss_fft[0] != key:
+            ll = np.atleast_1d(self.low_loss(self.axes_manager))
+            fft_size = optimal_fft_size(size + ll.size - 1, real=True)
+            self._low_loss_fft = (
+                key, ll.size, fft_size, np.fft.rfft(ll, n=fft_size))
+        _, ll_size, fft_size, ll_fft = self._low_loss_fft
+        convolved = np.fft.irfft(
+            np.fft.rfft(array, n=fft_size) * ll_fft, n=fft_size)
+        return convolved[ll_size - 1:size]
 
     def append(self, thing):
         cm = self.suspend_update if self._plot_active else dummy_context_manager
@@ -396,6 +457,8 @@ def __call__(self, non_convolved=False, onlyactive=False,
         numpy array
         """
 
+        use_cache = (self._cache_fixed_components and onlyactive and
+                     component_list is None)
         if component_list is None:
             component_list = self
         if not isinstance(component_list, (list, tuple)):
@@ -406,29 +469,118 @@ def __call__(self, non_convolved=False, onlyactive=False,
             component_list = [
                 component for component in component_list if component.active]
 
-        if self.convolved is False or non_convolved is True:
+        convolved = self.convolved is True and non_convolved is False
+        fixed = ()
+        if use_cache:
+            fixed = tuple(component for component in component_list
+                          if _is_fixed(component))
+            component_list = [component for component in component_list
+                              if component not in fixed]
+            if fixed:
+                # The low-loss changes with the navigation indices
+                key = (convolved, self.axes_manager.indices)
+                fixed_sum = self._get_fixed_components_cache(fixed, key)
+                if fixed_sum is None:
+                    fixed_sum = self._components_sum(fixed, convolved)
+                    self._set_fixed_components_cache(fixed, key, fixed_sum)
+
+        to_return = self._components_sum(component_list, convolved)
+        if fixed:
+            to_return += fixed_sum
+        if self.signal.metadata.Signal.binned is True:
+            to_return *= self.signal.axes_manager[-1].scale
+        return to_return
+
+    def _components_sum(self, component_list, convolved):
+        """Return the sum of the components in the signal range, convolving
+        those with `convolved` set if `convolved` is True."""
+        if not convolved:
             axis = self.axis.axis[self.channel_switches]
+            fused = self._get_fused_expressions(component_list)
+            if fused is not None:
+                return np.broadcast_to(
+                    fused.function(axis), axis.shape).astype(float)
             sum_ = np.zeros(len(axis))
             for component in component_list:
                 sum_ += component.function(axis)
-            to_return = sum_
+            return sum_
+
+        sum_convolved = np.zeros(len(self.convolution_axis))
+        sum_ = np.zeros(len(self.axis.axis))
+        for component in component_list:
+            if component.convolved:
+                sum_convolved += component.function(self.convolution_axis)
+            else:
+                sum_ += component.function(self.axis.axis)
+
+        to_return = sum_ + self._convolve_low_loss(sum_convolved)
+        return to_return[self.channel_switches]
+
+    def enable_fused_evaluation(self, module="numpy"):
+        """Evaluate the sum of the components and its gradients as a single
+        compiled function when all of them are
+        :py:class:`~._components.expression.Expression` components.
+
+        The expressions of the components are added symbolically and compiled
+        with sympy, removing the overhead of evaluating the components one by
+        one, which can be significant when fitting models with many
+        components. The compiled function is cached and only recompiled when
+        the components, their active state or the twins of their parameters
+        change. Convolved models and models containing components that are
+        not 1D Expression components are evaluated as usual.
 
-        else:  # convolved
-            sum_convolved = np.zeros(len(self.convolution_axis))
-            sum_ = np.zeros(len(self.axis.axis))
-            for component in component_list:
-                if component.convolved:
-                    sum_convolved += component.function(self.convolution_axis)
-                else:
-                    sum_ += component.function(self.axis.axis)
+        Parameters
+        ----------
+        module : {"numpy", "numexpr"}, default "numpy"
+            Module used to evaluate the compiled function. numexpr
+            evaluates the full sum in a single pass without creating
+            intermediate arrays, but it supports fewer functions and
+            requires installing numexpr.
 
-            to_return = sum_ + np.convolve(
-                self.low_loss(self.axes_manager),
-                sum_convolved, mode="valid")
-            to_return = to_return[self.channel_switches]
-        if self.signal.metadata.Signal.binned is True:
-            to_return *= self.signal.axes_manager[-1].scale
-        return to_return
+        See Also
+        --------
+        disable_fused_evaluation
+
+        """
+        self._fused_module = module
+        self._fused_expressions = {}
+
+    def disable_fused_evaluation(self):
+        """Evaluate the components one by one.
+
+        See Also
+        --------
+        enable_fused_evaluation
+
+        """
+        self._fused_module = None
+        self._fused_expressions = {}
+
+    def _get_fused_expressions(self, components):
+        """Return the _FusedExpressions of `components` or None if the
+        fused evaluation is disabled or the components cannot be fused."""
+        # Fusing a single component brings nothing
+        if self._fused_module is None or len(components) < 2:
+            return None
+        for component in components:
+            if not isinstance(component, Expression) or component._is2D:
+                return None
+            for parameter in component.parameters:
+                if (parameter.twin is not None and
+                        not parameter.twin_function_expr and
+                        parameter.twin_function is not None):
+                    # The twin function is not symbolic
+                    return None
+        components = tuple(components)
+        key = tuple((component._sympy_expression,) + tuple(
+            (parameter.twin, parameter.twin_function_expr)
+            for parameter in component.parameters)
+            for component in components)
+        cached = self._fused_expressions.get(components)
+        if cached is None or cached[0] != key:
+            cached = (key, _FusedExpressions(components, self._fused_module))
+            self._fused_expressions[components] = cached
+        return cached[1]
 
     def _errfunc(self, param, y, weights=None):
         if weights is None:
@@ -590,20 +742,18 @@ def _jacobian(self, param, y, weights=None):
 
                     if component.convolved:
                         for parameter in component.free_parameters:
-                            par_grad = np.convolve(
-                                parameter.grad(self.convolution_axis),
-                                self.low_loss(self.axes_manager),
-                                mode="valid")
+                            par_grad = parameter.grad(self.convolution_axis)
 
                             if parameter._twins:
+                                # The convolution is linear, so the twins'
+                                # gradients are added before convolving
+                                par_grad = np.array(par_grad, dtype=float)
                                 for par in parameter._twins:
-                                    np.add(par_grad, np.convolve(
-                                        par.grad(
-                                            self.convolution_axis),
-                                        self.low_loss(self.axes_manager),
-                                        mode="valid"), par_grad)
+                                    np.add(par_grad, par.grad(
+                                        self.convolution_axis), par_grad)
 
-                            grad = np.vstack((grad, par_grad))
+                            grad = np.vstack(
+                                (grad, self._convolve_low_loss(par_grad)))
 
                     else:
                         for parameter in component.free_parameters:
@@ -621,6 +771,10 @@ def _jacobian(self, param, y, weights=None):
 
         else:
             axis = self.axis.axis[self.channel_switches]
+            fused = self._get_fused_expressions(
+                [component for component in self if component.active])
+            if fused is not None and fused.has_gradients:
+                return self._fused_jacobian(fused, param, axis, weights)
             counter = 0
             grad = axis
             for component in self:  # Cut the parameters list
@@ -648,6 +802,27 @@ def _jacobian(self, param, y, weights=None):
 
         return to_return
 
+    def _fused_jacobian(self, fused, param, axis, weights):
+        counter = 0
+        rows = []
+        for component in self:
+            if component.active:
+                component.fetch_values_from_array(
+                    param[counter:counter + component._nfree_param],
+                    onlyfree=True)
+                counter += component._nfree_param
+        gradients = fused.gradients(axis)
+        # The derivatives with respect to the free parameters include the
+        # contribution of their twins
+        for component in self:
+            if component.active:
+                rows.extend(gradients[parameter]
+                            for parameter in component.free_parameters)
+        to_return = np.array(rows, dtype=float) * weights
+        if self.signal.metadata.Signal.binned is True:
+            to_return *= self.signal.axes_manager[-1].scale
+        return to_return
+
     def _function4odr(self, param, x):
         return self._model_function(param)
 
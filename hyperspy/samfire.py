@@ -22,6 +22,7 @@
 import dill
 import numpy as np
 
+from hyperspy.misc.checkpoint import ModelCheckpoint
 from hyperspy.misc.utils import DictionaryTreeBrowser
 from hyperspy.misc.utils import slugify
 from hyperspy.misc.math_tools import check_random_state
@@ -116,6 +117,11 @@ class Samfire:
     save_every : int
         When running, samfire saves results every time save_every good fits are
         found.
+    incremental_backup : bool
+        If False (default), :py:meth:`backup` saves the model in the signal
+        file, which can be loaded as any other saved model. If True, the
+        model and the marker are checkpointed incrementally in an HDF5 file
+        instead, which can be used to resume an interrupted run.
     random_state : None or int or RandomState instance, default None
         Random seed used to select the next pixels.
 
@@ -133,6 +139,8 @@ class Samfire:
         preserved
     backup
         backs up the current version of the model
+    restore_backup
+        restores the model from a backup
     change_strategy
         changes strategy to a new one. Certain rules apply
     append
@@ -157,8 +165,10 @@ class Samfire:
     running_pixels = []
     plot_every = 0
     save_every = np.nan
+    incremental_backup = False
     _workers = None
     _args = None
+    _checkpoint = None
     count = 0
 
     def __init__(self, model, workers=None, setup=True, random_state=None, **kwargs):
@@ -167,6 +177,7 @@ def __init__(self, model, workers=None, setup=True, random_state=None, **kwargs)
             workers = max(1, cpu_count() - 1)
         self.model = model
         self.metadata = DictionaryTreeBrowser()
+        self.running_pixels = []
 
         self._scale = 1.0
         # -1 -> done pixel, use
@@ -227,14 +238,21 @@ def _setup(self, **kwargs):
             self._workers = self.pool.num_workers
             self.pool.prepare_workers(self)
 
-    def start(self, **kwargs):
+    def start(self, resume=False, **kwargs):
         """Starts SAMFire.
 
         Parameters
         ----------
+        resume : bool or str, default False
+            If True or a filename, restore the model and the marker from the
+            file written by :py:meth:`backup` with ``incremental_backup=True``
+            (if True, the default backup file) and only fit the remaining
+            pixels, see :py:meth:`restore_backup`.
         **kwargs : key-word arguments
             Any key-word arguments to be passed to Model.fit() call
         """
+        if resume:
+            self.restore_backup(None if resume is True else resume)
         self._setup()
         if self._workers and self.pool is not None:
             self.pool.update_parameters()
@@ -325,6 +343,8 @@ def _run_active_strategy_one(self):
             ind = self._next_pixels(1)[0]
             vals = self.active_strategy.values(ind)
             self.running_pixels.append(ind)
+            # as in generate_values, so that bad fits are not picked again
+            self.metadata.marker[ind] = 0.
             isgood = self.single_kernel(self.model,
                                         ind,
                                         vals,
@@ -335,6 +355,8 @@ def _run_active_strategy_one(self):
             self.count += 1
             if isgood:
                 self._progressbar.update(1)
+                if self._checkpoint is not None:
+                    self._checkpoint.mark(ind)
             self.active_strategy.update(ind, isgood)
             self.plot(on_count=True)
             self.backup(on_count=True)
@@ -342,23 +364,68 @@ def _run_active_strategy_one(self):
     def backup(self, filename=None, on_count=True):
         """Backs-up the samfire results in a file
 
+        By default, the model is saved with the name "samfire_backup" in the
+        file of the signal, from which it can be restored with
+        ``s.models.restore("samfire_backup")``. If ``incremental_backup`` is
+        True, the parameter maps, the goodness of fit and the marker are
+        written to an HDF5 file instead, which is kept open. Only the rows of
+        the navigation space that changed since the previous backup are
+        written, see :py:class:`~hyperspy.misc.checkpoint.ModelCheckpoint`.
+        This backup can be restored with ``start(resume=filename)``.
+
         Parameters
         ----------
         filename: {str, None}
             the filename. If None, a default value of "backup_"+signal_title
-            is used.
+            is used (with the ".h5" extension if ``incremental_backup`` is
+            True).
         on_count: bool
             if True (default), only saves on the required count of steps
         """
-        if filename is None:
-            title = self.model.signal.metadata.General.title
-            filename = slugify('backup_' + title)
-        # maybe add saving marker + strategies as well?
         if self.count % self.save_every == 0 or not on_count:
+            if self.incremental_backup:
+                self._get_checkpoint(filename).write()
+                return
+            if filename is None:
+                title = self.model.signal.metadata.General.title
+                filename = slugify('backup_' + title)
+            # maybe add saving marker + strategies as well?
             self.model.save(filename,
                             name='samfire_backup', overwrite=True)
             self.model.signal.models.remove('samfire_backup')
 
+    def restore_backup(self, filename=None):
+        """Restores the model and the marker from a file written by
+        :py:meth:`backup` with ``incremental_backup=True``, e.g. to continue
+        fitting after a crash. ``incremental_backup`` is set to True and the
+        following backups are written to the same file.
+
+        Parameters
+        ----------
+        filename: {str, None}
+            the filename. If None, the default filename of :py:meth:`backup`
+            is used.
+        """
+        self._get_checkpoint(filename, resume=True)
+        self.incremental_backup = True
+        # the pixels that were running when the backup was written are
+        # queued again
+        self.active_strategy.refresh(False)
+
+    def _get_checkpoint(self, filename=None, resume=False):
+        """Returns the checkpoint of the given file, opening it if needed"""
+        if filename is None:
+            title = self.model.signal.metadata.General.title
+            filename = slugify('backup_' + title) + '.h5'
+        if self._checkpoint is not None:
+            if self._checkpoint.filename == str(filename) and not resume:
+                return self._checkpoint
+            self._checkpoint.close()
+        self._checkpoint = ModelCheckpoint(self.model, filename,
+                                           resume=resume,
+                                           marker=self.metadata.marker)
+        return self._checkpoint
+
     def update(self, ind, results=None, isgood=None):
         """Updates the current model with the results, received from the
         workers. Results are only stored if the results are good enough
@@ -382,6 +449,8 @@ def update(self, ind, results=None, isgood=None):
         self.count += 1
         if isgood and self._progressbar is not None:
             self._progressbar.update(1)
+        if isgood and self._checkpoint is not None:
+            self._checkpoint.mark(ind)
 
         self.active_strategy.update(ind, isgood)
         if not isgood and results is not None:
@@ -456,7 +525,7 @@ def change_strategy(self, new_strat):
             current.close_plot()
         self._active_strategy_ind = new_strat
 
-    def generate_values(self, need_inds):
+    def generate_values(self, need_inds, include_data=True):
         """Returns an iterator that yields the index of the pixel and the
         value dictionary to be sent to the workers.
 
@@ -464,6 +533,9 @@ def generate_values(self, need_inds):
         ----------
         need_inds: int
             the number of pixels to be returned in the generator
+        include_data: bool
+            if False, the data of the pixels is not added to the value
+            dictionary, e.g. because the workers read it from shared memory
         """
         if need_inds:
             # get pixel index
@@ -471,23 +543,24 @@ def generate_values(self, need_inds):
                 # get starting parameters / array of possible values
                 value_dict = self.active_strategy.values(ind)
                 value_dict['fitting_kwargs'] = self._args
-                value_dict['signal.data'] = \
-                    self.model.signal.data[ind + (...,)]
-                if self.model.signal._lazy:
-                    value_dict['signal.data'] = value_dict[
-                        'signal.data'].compute()
-                if self.model.signal.metadata.has_item(
-                        'Signal.Noise_properties.variance'):
-                    var = self.model.signal.metadata.Signal.Noise_properties.variance
-                    if isinstance(var, BaseSignal):
-                        dat = var.data[ind + (...,)]
-                        value_dict['variance.data'] = dat.compute(
-                        ) if var._lazy else dat
-                if hasattr(self.model,
-                           'low_loss') and self.model.low_loss is not None:
-                    dat = self.model.low_loss.data[ind + (...,)]
-                    value_dict['low_loss.data'] = dat.compute(
-                    ) if self.model.low_loss._lazy else dat
+                if include_data:
+                    value_dict['signal.data'] = \
+                        self.model.signal.data[ind + (...,)]
+                    if self.model.signal._lazy:
+                        value_dict['signal.data'] = value_dict[
+                            'signal.data'].compute()
+                    if self.model.signal.metadata.has_item(
+                            'Signal.Noise_properties.variance'):
+                        var = self.model.signal.metadata.Signal.Noise_properties.variance
+                        if isinstance(var, BaseSignal):
+                            dat = var.data[ind + (...,)]
+                            value_dict['variance.data'] = dat.compute(
+                            ) if var._lazy else dat
+                    if hasattr(self.model,
+                               'low_loss') and self.model.low_loss is not None:
+                        dat = self.model.low_loss.data[ind + (...,)]
+                        value_dict['low_loss.data'] = dat.compute(
+                        ) if self.model.low_loss._lazy else dat
 
                 self.running_pixels.append(ind)
                 self.metadata.marker[ind] = 0.
@@ -637,3 +710,6 @@ def __repr__(self):
     def stop(self):
         if hasattr(self, "pool") and self.pool is not None:
             self.pool.stop()
+        if self._checkpoint is not None:
+            self._checkpoint.close()
+            self._checkpoint = None
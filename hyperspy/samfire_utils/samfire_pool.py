@@ -19,16 +19,35 @@
 
 import time
 import logging
-from multiprocessing import Manager
+import weakref
+from multiprocessing import Pool, Queue, cpu_count
 import numpy as np
 from dask.array import Array as dar
 
+from hyperspy.signal import BaseSignal
 from hyperspy.utils.parallel_pool import ParallelPool
-from hyperspy.samfire_utils.samfire_worker import create_worker
+from hyperspy.samfire_utils.samfire_worker import (create_pool_worker,
+                                                   set_worker_queues)
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # pragma: no cover
+    # Python < 3.8
+    shared_memory = None
 
 _logger = logging.getLogger(__name__)
 
 
+def _release_shared_memory(blocks):
+    for shm in blocks:
+        shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+    blocks.clear()
+
+
 def _walk_compute(athing):
     if isinstance(athing, dict):
         this = {}
@@ -55,16 +74,22 @@ class SamfirePool(ParallelPool):
     and sets up ipyparallel load_balanced_view.
 
     Ipyparallel is managed directly, but multiprocessing pool is managed via
-    three of queues:
+    three of queues, which are passed to the workers when the pool is
+    created:
 
     * Shared by all (master and workers) for distributing "load-balanced"
-      work.
+      work. The pixels are sent in batches of `batch_size` pixels.
     * Shared by all (master and workers) for sending results back to the
-      master
+      master. The results of a batch are sent together.
     * Individual queues from master to each worker. For setting up and
       addressing individual workers in general. This one is checked with
       higher priority in workers.
 
+    When using multiprocessing, the signal data (and the variance and low-loss
+    data if any) are published once in shared memory, from which the workers
+    read the pixels that they fit, instead of being sent with every pixel.
+    This requires Python >= 3.8 and non-lazy data.
+
     Methods
     -------
     prepare_workers
@@ -110,6 +135,13 @@ class SamfirePool(ParallelPool):
         The timestep between "ticks" that the result queues are checked. Higher
         timestep means less frequent checking, which may reduce CPU load for
         difficult fits that take a long time to finish.
+    batch_size : int, default 4
+        The number of pixels sent to a multiprocessing worker in a single
+        message. Larger batches reduce the communication overhead when the
+        pixels are fast to fit, but the starting values of the pixels depend
+        on the results of fewer neighbours. Up to two batches per worker are
+        sent at a time, so that every worker has the next batch queued when
+        it finishes one.
     ping : dict
         If recorded, stores one-way trip time of each worker
     pid : dict
@@ -119,17 +151,67 @@ class SamfirePool(ParallelPool):
     def __init__(self, **kwargs):
         """Creates a ParallelPool with additional methods for SAMFire. All
         arguments are passed to ParallelPool"""
+        self.workers = {}
+        self.result_queue = None
+        self.shared_queue = None
+        self.batch_size = 4
+        self._shared_memory = []
+        self._release_shared_memory = None
         super(SamfirePool, self).__init__(**kwargs)
         self.samf = None
         self.ping = {}
         self.pid = {}
-        self.workers = {}
         self.rworker = None
-        self.result_queue = None
-        self.shared_queue = None
         self._last_time = 0
         self.results = []
 
+    def _setup_multiprocessing(self):
+        _logger.debug('Calling _setup_multiprocessing')
+        self.num_workers = min(self.num_workers, cpu_count() - 1)
+        # Plain multiprocessing queues can only be passed to the workers when
+        # they are created
+        self.shared_queue = Queue()
+        self.result_queue = Queue()
+        self.workers = {i: Queue() for i in range(self.num_workers)}
+        self.pool = Pool(processes=self.num_workers,
+                         initializer=set_worker_queues,
+                         initargs=(self.workers, self.shared_queue,
+                                   self.result_queue))
+        return True
+
+    def _share_array(self, array):
+        """Copy `array` to a new shared memory block and return the
+        description of the array used by the workers to access it."""
+        array = np.ascontiguousarray(array)
+        shm = shared_memory.SharedMemory(create=True,
+                                         size=max(array.nbytes, 1))
+        self._shared_memory.append(shm)
+        np.ndarray(array.shape, array.dtype, buffer=shm.buf)[...] = array
+        return shm.name, array.shape, array.dtype.str
+
+    def _share_data(self, samfire):
+        """Publish the data of the signal, variance and low-loss in shared
+        memory. Returns the dictionary of descriptions of the arrays or None
+        if the data cannot be shared."""
+        model = samfire.model
+        signals = {'signal.data': model.signal}
+        if model.signal.metadata.has_item(
+                'Signal.Noise_properties.variance'):
+            var = model.signal.metadata.Signal.Noise_properties.variance
+            if isinstance(var, BaseSignal):
+                signals['variance.data'] = var
+        if getattr(model, 'low_loss', None) is not None:
+            signals['low_loss.data'] = model.low_loss
+        if shared_memory is None or any(
+                signal._lazy for signal in signals.values()):
+            return None
+        # Released when stopping the pool, or at the latest when it is
+        # garbage collected or the interpreter exits
+        self._release_shared_memory = weakref.finalize(
+            self, _release_shared_memory, self._shared_memory)
+        return {key: self._share_array(signal.data) for key, signal in
+                signals.items()}
+
     def _timestep_set(self, value):
         value = np.abs(value)
         self._timestep = value
@@ -183,18 +265,14 @@ def prepare_workers(self, samfire):
 
         if self.is_multiprocessing:
             _logger.debug('preparing multiprocessing workers')
-            manager = Manager()
-            self.shared_queue = manager.Queue()
-            self.result_queue = manager.Queue()
-            for i in range(self.num_workers):
-                this_queue = manager.Queue()
-                self.workers[i] = this_queue
+            shared_data = self._share_data(samfire)
+            for i, this_queue in self.workers.items():
                 this_queue.put(('setup_test', (samfire.metadata._gt_dump,)))
                 this_queue.put(('create_model', (m_dict, 'z')))
                 this_queue.put(('set_optional_names', (optional_names,)))
-                self.pool.apply_async(create_worker, args=(i, this_queue,
-                                                           self.shared_queue,
-                                                           self.result_queue))
+                if shared_data is not None:
+                    this_queue.put(('attach_shared_data', (shared_data,)))
+                self.pool.apply_async(create_pool_worker, args=(i,))
 
     def update_parameters(self):
         """Updates various worker parameters.
@@ -256,7 +334,8 @@ def __len__(self):
         if self.is_ipyparallel:
             return self.pool.client.queue_status()['unassigned']
         elif self.is_multiprocessing:
-            return self.shared_queue.qsize()
+            # The pixels sent to the workers whose results did not come back
+            return len(self.samf.running_pixels)
 
     def add_jobs(self, needed_number=None):
         """Adds jobs to the job queue that is consumed by the workers.
@@ -270,10 +349,15 @@ def test_func(worker, ind, value_dict):
             return worker.run_pixel(ind, value_dict)
         if needed_number is None:
             needed_number = self.need_pixels
+        if self.is_multiprocessing:
+            jobs = list(self.samf.generate_values(
+                needed_number, include_data=not self._shared_memory))
+            for i in range(0, len(jobs), self.batch_size):
+                self.shared_queue.put(
+                    ('run_pixels', (jobs[i:i + self.batch_size],)))
+            return
         for ind, value_dict in self.samf.generate_values(needed_number):
-            if self.is_multiprocessing:
-                self.shared_queue.put(('run_pixel', (ind, value_dict)))
-            elif self.is_ipyparallel:
+            if self.is_ipyparallel:
                 self.results.append((self.pool.apply_async(test_func,
                                                            self.rworker, ind,
                                                            value_dict), ind))
@@ -284,15 +368,17 @@ def parse(self, value):
         Parameters
         ----------
         value: tuple of the form (keyword, the_rest)
-            Keyword currently can be one of ['pong', 'Error', 'result']. For
-            each of the keywords, "the_rest" is a tuple of different elements,
-            but generally the first one is always the worker_id that the result
-            came from. In particular:
+            Keyword currently can be one of ['pong', 'Error', 'result',
+            'results']. For each of the keywords, "the_rest" is a tuple of
+            different elements, but generally the first one is always the
+            worker_id that the result came from. In particular:
 
             * ('pong', (worker_id, pid, pong_time, optional_message_str))
             * ('Error', (worker_id, error_message_string))
             * ('result', (worker_id, pixel_index, result_dict,
               bool_if_result_converged))
+            * ('results', list_of_values), where each value is one of the
+              above, typically the results of a batch of pixels.
         """
         if value is None:
             keyword = 'Failed'
@@ -309,6 +395,9 @@ def parse(self, value):
         elif keyword == 'Error':
             _id, err_message = the_rest
             _logger.error('Error in worker %s\n%s' % (str(_id), err_message))
+        elif keyword == 'results':
+            for this_value in the_rest:
+                self.parse(this_value)
         elif keyword == 'result':
             _id, ind, result, isgood = the_rest
             _logger.debug('Got result from pixel {} and it is good:'
@@ -368,10 +457,17 @@ def collect_results(self, timeout=None):
     @property
     def need_pixels(self):
         """Returns the number of pixels that should be added to the processing
-        queue. At most is equal to the number of workers.
+        queue. At most is equal to the number of workers (for multiprocessing
+        pools, two batches of `batch_size` pixels per worker minus the pixels
+        whose results did not come back yet).
         """
+        max_pixels = self.num_workers
+        if self.is_multiprocessing:
+            # One batch running and one queued per worker, so that the
+            # workers do not wait for the master between batches
+            max_pixels *= 2 * self.batch_size
         return min(self.samf.pixels_done * self.samf.metadata.marker.ndim,
-                   self.num_workers - len(self))
+                   max_pixels - len(self))
 
     @property
     def _not_too_long(self):
@@ -412,5 +508,11 @@ def stop(self):
             self.pool.close()
             self.pool.terminate()
             self.pool.join()
+            # Do not wait for the unread messages when exiting
+            for queue in (self.shared_queue, self.result_queue,
+                          *self.workers.values()):
+                queue.cancel_join_thread()
+            if self._release_shared_memory is not None:
+                self._release_shared_memory()
         elif self.is_ipyparallel:
             self.pool.client.clear()
@@ -50,6 +50,8 @@ def __init__(self, identity, individual_queue=None, shared_queue=None,
         self.optional_names = set()
         self.model = None
         self.parameters = {}
+        self.shared_data = {}
+        self._shared_memory = []
 
     def create_model(self, signal_dict, model_letter):
         _logger.debug('Creating model in worker {}'.format(self.identity))
@@ -81,6 +83,33 @@ def _array_views_to_copies(self):
             if isinstance(v, np.ndarray):
                 dct[k] = v.copy()
 
+    def attach_shared_data(self, descriptions):
+        """Attach to the data published in shared memory by the pool.
+
+        Parameters
+        ----------
+        descriptions : dict
+            Dictionary of ``(shared_memory_name, shape, dtype)`` tuples
+            describing the arrays, with keys ``'signal.data'`` and optionally
+            ``'variance.data'`` and ``'low_loss.data'``.
+        """
+        from multiprocessing import shared_memory
+        for key, (name, shape, dtype) in descriptions.items():
+            shm = shared_memory.SharedMemory(name=name)
+            try:
+                # The pool owns the block and unlinks it when stopping
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(shm._name, 'shared_memory')
+            except (ImportError, AttributeError, KeyError):  # pragma: no cover
+                pass
+            self._shared_memory.append(shm)
+            self.shared_data[key] = np.ndarray(shape, dtype, buffer=shm.buf)
+
+    def _get_pixel_data(self, key):
+        if key in self.value_dict:
+            return self.value_dict.pop(key)
+        return self.shared_data[key][self.ind + (...,)]
+
     def set_optional_names(self, optional_names):
         self.optional_names = optional_names
         _logger.debug('Setting optional names in worker {} to '
@@ -160,7 +189,7 @@ def reset(self):
         self.best_values = []
         self.best_dof = np.inf
 
-    def run_pixel(self, ind, value_dict):
+    def _fit_pixel(self, ind, value_dict):
         self.reset()
         self.ind = ind
         self.value_dict = value_dict
@@ -173,26 +202,44 @@ def run_pixel(self, ind, value_dict):
                 self.fitting_kwargs['min_function_grad'], bytes):
             self.fitting_kwargs['min_function_grad'] = dill.loads(
                 self.fitting_kwargs['min_function_grad'])
-        self.model.signal.data[:] = self.value_dict.pop('signal.data')
+        self.model.signal.data[:] = self._get_pixel_data('signal.data')
 
         if self.model.signal.metadata.has_item(
                 'Signal.Noise_properties.variance'):
             var = self.model.signal.metadata.Signal.Noise_properties.variance
             if isinstance(var, BaseSignal):
-                var.data[:] = self.value_dict.pop('variance.data')
+                var.data[:] = self._get_pixel_data('variance.data')
 
-        if 'low_loss.data' in self.value_dict:
-            self.model.low_loss.data[:] = self.value_dict.pop('low_loss.data')
+        if ('low_loss.data' in self.value_dict or
+                'low_loss.data' in self.shared_data):
+            self.model.low_loss.data[:] = self._get_pixel_data(
+                'low_loss.data')
 
         for component_comb in self.generate_component_combinations():
             good_fit = self.fit(component_comb)
 
             if good_fit:
                 if len(self.optional_names) == 0:
-                    return self.send_results(current=True)
+                    return self._collect_results(current=True)
                 else:
                     self.compare_models()
-        return self.send_results()
+        return self._collect_results()
+
+    def run_pixel(self, ind, value_dict):
+        return self._send(self._fit_pixel(ind, value_dict))
+
+    def run_pixels(self, jobs):
+        """Fit a batch of pixels and send all their results at once.
+
+        Parameters
+        ----------
+        jobs : list
+            List of ``(ind, value_dict)`` tuples, as accepted by
+            :py:meth:`run_pixel`.
+        """
+        results = [self._fit_pixel(ind, value_dict) for ind, value_dict in
+                   jobs]
+        return self._send(('results', results))
 
     def _collect_values(self):
         result = {component.name: {parameter.name: parameter.map.copy() for
@@ -216,7 +263,15 @@ def compare_models(self):
             for k in self.parameters.keys():
                 self.parameters[k] = getattr(self.model, k).data[0]
 
+    def _send(self, to_send):
+        if self.individual_queue is None:
+            return to_send
+        self.result_queue.put(to_send)
+
     def send_results(self, current=False):
+        return self._send(self._collect_results(current))
+
+    def _collect_results(self, current=False):
         if current:
             self.best_values = self._collect_values()
             for k in self.parameters.keys():
@@ -233,10 +288,7 @@ def send_results(self, current=False):
                           "{}".format(self.identity))
             result = None
             found_solution = False
-        to_send = ('result', (self.identity, self.ind, result, found_solution))
-        if self.individual_queue is None:
-            return to_send
-        self.result_queue.put(to_send)
+        return ('result', (self.identity, self.ind, result, found_solution))
 
     def setup_test(self, test_string):
         self.fit_test = dill.loads(test_string)
@@ -247,6 +299,10 @@ def start_listening(self):
 
     def stop_listening(self):
         self._listening = False
+        self.shared_data = {}
+        for shm in self._shared_memory:
+            shm.close()
+        self._shared_memory = []
 
     def parse(self, result):
         function = result
@@ -302,3 +358,21 @@ def create_worker(identity, individual_queue=None,
         return w
     w.start_listening()
     return 1
+
+
+_pool_queues = None
+
+
+def set_worker_queues(individual_queues, shared_queue, result_queue):
+    """Store the queues of the pool in the worker process. Used as the
+    initializer of the multiprocessing pool."""
+    global _pool_queues
+    _pool_queues = individual_queues, shared_queue, result_queue
+
+
+def create_pool_worker(identity):
+    """Create a listening worker in a multiprocessing pool process, using
+    the queues passed to :py:func:`set_worker_queues`."""
+    individual_queues, shared_queue, result_queue = _pool_queues
+    return create_worker(identity, individual_queues[identity], shared_queue,
+                         result_queue)
@@ -17,6 +17,7 @@
 # along with  HyperSpy.  If not, see <http://www.gnu.org/licenses/>.
 
 import numpy as np
+from scipy import ndimage
 
 
 def make_sure_ind(inds, req_len=None):
@@ -130,6 +131,8 @@ class LocalStrategy(SamfireStrategy):
     _mask_all = None
     _weight = None
     _samf = None
+    _decay_function = None
+    _sums = None
 
     def __init__(self, name):
         self.name = name
@@ -146,6 +149,19 @@ def samf(self, value):
         if value is not None and self.weight is not None:
             self._weight.model = value.model
         self._samf = value
+        self._sums = None
+
+    @property
+    def decay_function(self):
+        """The function that converts distances and weights to the
+        significance of the pixels.
+        """
+        return self._decay_function
+
+    @decay_function.setter
+    def decay_function(self, value):
+        self._decay_function = value
+        self._sums = None
 
     @property
     def weight(self):
@@ -159,6 +175,7 @@ def weight(self, value):
         if self._weight is not None:
             self._weight.model = None
         self._weight = value
+        self._sums = None
         if value is not None and self.samf is not None:
             value.model = self.samf.model
 
@@ -168,6 +185,7 @@ def clean(self):
         self._untruncated = None
         self._mask_all = None
         self._radii_changed = True
+        self._sums = None
 
     @property
     def radii(self):
@@ -184,6 +202,7 @@ def radii(self, value):
         if value != self._radii:
             self._radii_changed = True
             self._radii = value
+            self._sums = None
 
     def _update_database(self, ind, count):
         """Dummy method for compatibility
@@ -228,42 +247,69 @@ def refresh(self, overwrite, given_pixels=None):
                         scale,
                         calc_pixels))
 
-        done_number = np.sum(calc_pixels)
-        todo_number = np.sum(todo_pixels)
-
         marker[todo_pixels] = 0.
         marker[calc_pixels] = -scale
 
         weights_all = self.decay_function(self.weight.map(calc_pixels))
+        weights_all = np.where(calc_pixels, weights_all, 0.)
+        # propagate from all fitted pixels at once
+        propagated = ndimage.correlate(weights_all,
+                                       self._get_kernel(len(shape)),
+                                       mode='constant')
+        marker[todo_pixels] = propagated[todo_pixels]
+        # the running sums are rebuilt when needed
+        self._sums = None
+
+    def _update_distances(self, ndim):
+        """Calculates the distances from the centre of the neighbourhood and
+        the mask of the pixels within radii, if needed.
 
-        if done_number <= todo_number:
-            # most efficient to propagate FROM fitted pixels
-            ind_list = np.where(calc_pixels)
-            for iindex in range(ind_list[0].size):
-                ind = [one_list[iindex] for one_list in ind_list]
-
-                distances, slices, _, mask = self._get_distance_array(
-                    shape, ind)
-
-                mask = np.logical_and(mask, todo_pixels[slices])
-
-                weight = weights_all[tuple(ind)]
-                distance_f = self.decay_function(distances)
-                marker[slices][mask] += weight * distance_f[mask]
-        else:
-            # most efficient to propagate TO unknown pixels
-            ind_list = np.where(todo_pixels)
-            for iindex in range(ind_list[0].size):
-                ind = [one_list[iindex] for one_list in ind_list]
+        Parameters
+        ----------
+        ndim : int
+            the number of navigation dimensions
 
-                distances, slices, centre, mask = self._get_distance_array(
-                    shape, ind)
+        Returns
+        -------
+        radii : tuple of floats
+            the radii in all dimensions
+        """
+        radii = make_sure_ind(self.radii, ndim)
+        # This should be unnecessary.......................
+        if self._untruncated is not None and self._untruncated.ndim != ndim:
+            self._untruncated = None
+            self._mask_all = None
+        if self._radii_changed or \
+           self._untruncated is None or \
+           self._mask_all is None:
+            par = []
+            for radius in radii:
+                radius_top = np.ceil(radius)
+                par.append(np.abs(np.arange(-radius_top, radius_top + 1)))
+            meshg = np.array(np.meshgrid(*par, indexing='ij'))
+            self._untruncated = np.sqrt(np.sum(meshg ** 2.0, axis=0))
+            distance_mask = np.array(
+                [c / float(radii[i]) for i, c in enumerate(meshg)])
+            self._mask_all = np.sum(distance_mask ** 2.0, axis=0)
+            self._radii_changed = False
+            self._sums = None
+        return radii
 
-                mask = np.logical_and(mask, calc_pixels[slices])
+    def _get_kernel(self, ndim):
+        """Returns the decayed distances within radii from the centre of
+        the neighbourhood, and zero outside radii and in the centre.
 
-                weight = weights_all[slices]
-                distance_f = self.decay_function(distances)
-                marker[tuple(ind)] = np.sum(weight[mask] * distance_f[mask])
+        Parameters
+        ----------
+        ndim : int
+            the number of navigation dimensions
+        """
+        self._update_distances(ndim)
+        inside = self._mask_all <= 1.0
+        inside[tuple(np.array(inside.shape) // 2)] = False
+        with np.errstate(invalid='ignore'):
+            kernel = self.decay_function(self._untruncated)
+        return np.where(inside, kernel, 0.)
 
     def _get_distance_array(self, shape, ind):
         """Calculatex the array of distances (withing radii) from the given
@@ -288,26 +334,7 @@ def _get_distance_array(self, shape, ind):
         mask : boolean numpy array
             a binary mask for the values to consider
         """
-        radii = make_sure_ind(self.radii, len(ind))
-        # This should be unnecessary.......................
-        if self._untruncated is not None and self._untruncated.ndim != len(
-                ind):
-            self._untruncated = None
-            self._mask_all = None
-        if self._radii_changed or \
-           self._untruncated is None or \
-           self._mask_all is None:
-            par = []
-            for radius in radii:
-                radius_top = np.ceil(radius)
-                par.append(np.abs(np.arange(-radius_top, radius_top + 1)))
-            meshg = np.array(np.meshgrid(*par, indexing='ij'))
-            self._untruncated = np.sqrt(np.sum(meshg ** 2.0, axis=0))
-            distance_mask = np.array(
-                [c / float(radii[i]) for i, c in enumerate(meshg)])
-            self._mask_all = np.sum(distance_mask ** 2.0, axis=0)
-            self._radii_changed = False
-
+        radii = self._update_distances(len(ind))
         slices_return, centre = nearest_indices(shape, ind, np.ceil(radii))
 
         slices_temp = ()
@@ -347,12 +374,157 @@ def _update_marker(self, ind):
         for i in self.samf.running_pixels:
             marker[i] = 0
         marker[ind] = -scale
+        self._update_sums(ind, weight)
+
+    def _build_sums(self):
+        """Calculates the running sums of the weights and of the weighted
+        parameter values of the fitted pixels from scratch.
+
+        The weight and the values that each fitted pixel contributes are
+        stored too, so that they can be removed exactly from the sums.
+        """
+        marker = self.samf.metadata.marker
+        model = self.samf.model
+        calc_pixels = marker == -self.samf._scale
+        kernel = self._get_kernel(marker.ndim)
+        kernel_mask = (kernel != 0).astype(float)
+        weights_all = self.decay_function(self.weight.map(calc_pixels))
+        weights_all = np.where(calc_pixels, weights_all, 0.)
+
+        components = []
+        for component in model:
+            calc = calc_pixels
+            if component.active_is_multidimensional:
+                calc = np.logical_and(calc, component._active_array)
+            weights = np.where(calc, weights_all, 0.)
+            # the values of all parameters are stacked along the last axis
+            values = self._get_component_values(component, Ellipsis)
+            total = np.empty(values.shape)
+            for i in range(values.shape[-1]):
+                total[..., i] = ndimage.correlate(
+                    np.where(calc, values[..., i], 0.) * weights, kernel,
+                    mode='constant')
+            components.append({
+                'count': ndimage.correlate(calc.astype(float), kernel_mask,
+                                           mode='constant'),
+                'weight': ndimage.correlate(weights, kernel, mode='constant'),
+                'values': total,
+                'contributed': np.where(calc[..., np.newaxis], values, 0.),
+                'active': calc.copy()})
+        self._sums = {
+            'components': components,
+            'key': self._get_sums_key(),
+            'pixels': calc_pixels,
+            'weights': weights_all}
+
+    def _get_component_values(self, component, ind):
+        """Returns the values of all parameters of the component in the
+        given pixel(s), stacked along the last axis.
+        """
+        shape = self.samf.metadata.marker[ind].shape
+        return np.concatenate([
+            np.reshape(par.map['values'][ind], shape + (-1,)) for par in
+            component.parameters], axis=-1)
+
+    def _get_sums_key(self):
+        return tuple((id(component), component.active_is_multidimensional)
+                     for component in self.samf.model)
+
+    def _add_pixel(self, ind, weight=None):
+        """Adds the contribution of a fitted pixel with the given (decayed)
+        weight to the running sums of its neighbours, or removes it if the
+        weight is None.
+
+        A pixel is removed with the weight and values it was added with, not
+        with its current ones.
+        """
+        marker = self.samf.metadata.marker
+        distances, slices, _, mask = self._get_distance_array(
+            marker.shape, ind)
+        sign = 1 if weight is not None else -1
+        if sign > 0:
+            self._sums['weights'][ind] = weight
+        else:
+            weight = self._sums['weights'][ind]
+            self._sums['weights'][ind] = 0.
+        with np.errstate(invalid='ignore'):
+            contribution = np.where(
+                mask, sign * weight * self.decay_function(distances), 0.)
+        for component, sums in zip(self.samf.model,
+                                   self._sums['components']):
+            if sign > 0:
+                active = not component.active_is_multidimensional or \
+                    component._active_array[ind]
+                values = self._get_component_values(component, ind)
+                sums['active'][ind] = active
+                sums['contributed'][ind] = values if active else 0.
+            else:
+                active = sums['active'][ind]
+                values = sums['contributed'][ind].copy()
+                sums['active'][ind] = False
+                sums['contributed'][ind] = 0.
+            if not active:
+                continue
+            sums['count'][slices] += sign * mask
+            sums['weight'][slices] += contribution
+            sums['values'][slices] += contribution[..., np.newaxis] * values
+        self._sums['pixels'][ind] = sign > 0
+
+    def _update_sums(self, ind, weight):
+        """Updates the running sums with the new results of the given pixel.
+
+        Parameters
+        ----------
+        ind : tuple
+            the index of the pixel that was (re)fitted.
+        weight : float
+            the decayed weight of the pixel.
+        """
+        if self._sums is None or self._sums['key'] != self._get_sums_key():
+            # rebuilt from scratch when the estimates are requested
+            self._sums = None
+            return
+        summed = self._sums['pixels']
+        for i in self.samf.running_pixels:
+            if summed[i]:
+                self._add_pixel(i)
+        if summed[ind]:
+            self._add_pixel(ind)
+        self._add_pixel(ind, weight)
+
+    def _sync_marker(self, ind):
+        """Adds to (or removes from) the running sums the pixels around the
+        given one that were marked as fitted (or unmarked) by editing the
+        marker directly, rather than with `_update_marker`.
+        """
+        marker = self.samf.metadata.marker
+        radii = self._update_distances(marker.ndim)
+        slices, _ = nearest_indices(marker.shape, ind, np.ceil(radii))
+        calc_pixels = marker[slices] == -self.samf._scale
+        summed = self._sums['pixels'][slices]
+        if np.array_equal(calc_pixels, summed):
+            return
+        offset = np.array([_slice.start for _slice in slices])
+        for local_ind in np.argwhere(summed & ~calc_pixels):
+            self._add_pixel(tuple(local_ind + offset))
+        for local_ind in np.argwhere(calc_pixels & ~summed):
+            pixel = tuple(local_ind + offset)
+            self._add_pixel(
+                pixel, self.decay_function(self.weight.function(pixel)))
 
     def values(self, ind):
         """Returns the current starting value estimates for the given pixel.
         Calculated as the weighted local average. Only returns components that
         are active, and parameters that are free.
 
+        The weighted sums of the parameter values of the fitted pixels are
+        kept for all pixels and updated when the results of a pixel are
+        accepted (see `update`), so that the estimates are simply looked up.
+        Pixels marked as fitted (or unmarked) by editing the marker directly
+        are picked up from the neighbourhood of the pixel. If the parameter
+        values of already fitted pixels are changed otherwise, call `refresh`
+        to recalculate the sums.
+
         Parameters
         ----------
         ind : tuple
@@ -366,45 +538,33 @@ def values(self, ind):
             for active components and free parameters.
 
         """
-        marker = self.samf.metadata.marker
-        shape = marker.shape
-        model = self.samf.model
-
-        distances, slices, _, mask_dist = self._get_distance_array(
-            shape, ind)
-
-        # only use pixels that are calculated and "active"
-        mask_dist_calc = np.logical_and(
-            mask_dist,
-            marker[slices] == -
-            self.samf._scale)
-
-        distance_f = self.decay_function(distances)
-        weights_values = self.decay_function(
-            self.weight.map(
-                mask_dist_calc,
-                slices))
+        ind = tuple(int(i) for i in ind)
+        self._update_distances(self.samf.metadata.marker.ndim)
+        if self._sums is None or self._sums['key'] != self._get_sums_key():
+            self._build_sums()
+        else:
+            self._sync_marker(ind)
         ans = {}
-        for component in model:
-            if component.active_is_multidimensional:
-                mask = np.logical_and(
-                    component._active_array[slices],
-                    mask_dist_calc)
-            else:
-                if component.active:
-                    mask = mask_dist_calc
-                else:  # not multidim and not active, skip
-                    continue
+        for component, sums in zip(self.samf.model,
+                                   self._sums['components']):
+            if not (component.active_is_multidimensional or
+                    component.active):
+                # not multidim and not active, skip
+                continue
+            if not sums['count'][ind]:
+                continue
+            values = sums['values'][ind] / sums['weight'][ind]
             comp_dict = {}
-            weight = distance_f[mask] * weights_values[mask]
-            if weight.size:  # should never happen that np.sum(weight) == 0
-                for par in component.parameters:
-                    if par.free:
-                        comp_dict[par.name] = np.average(
-                            par.map[slices][mask]['values'],
-                            weights=weight,
-                            axis=0)
-                ans[component.name] = comp_dict
+            start = 0
+            for par in component.parameters:
+                stop = start + par._number_of_elements
+                if par.free:
+                    if par.map['values'].ndim == len(ind):
+                        comp_dict[par.name] = values[start]
+                    else:
+                        comp_dict[par.name] = values[start:stop]
+                start = stop
+            ans[component.name] = comp_dict
         return ans
 
     def plot(self, fig=None):
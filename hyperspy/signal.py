@@ -20,6 +20,7 @@
 import warnings
 import inspect
 from contextlib import contextmanager
+from functools import partial
 from datetime import datetime
 import logging
 from pint import UnitRegistry, UndefinedUnitError
@@ -2600,10 +2601,29 @@ def get_dynamic_explorer_wrapper(*args, **kwargs):
             else:
                 return navigator()
 
+        navigator_computation = None
+        update_lazy_navigator = None
         if not isinstance(navigator, BaseSignal) and navigator == "auto":
             if (self.axes_manager.navigation_dimension == 1 and
                     self.axes_manager.signal_dimension == 1):
                 navigator = "data"
+            elif (self.axes_manager.navigation_dimension > 0 and
+                    self.axes_manager.signal_dimension > 0 and self._lazy):
+                # The navigator is computed in the background while plotting,
+                # see LazySignal.compute_navigator
+                navigator, navigator_computation = self._get_navigator(
+                    background=True)
+
+                def update_lazy_navigator():
+                    # Compute the navigator of the changed data, as the
+                    # interactive sum does for non-lazy signals
+                    nonlocal navigator
+                    navigator, computation = self._get_navigator(
+                        background=True, cached=False)
+                    if computation.done:
+                        self._stop_navigator_update()
+                    else:
+                        self._update_navigator_plot(computation)
             elif self.axes_manager.navigation_dimension > 0:
                 if self.axes_manager.signal_dimension == 0:
                     navigator = self.deepcopy()
@@ -2666,11 +2686,21 @@ def get_dynamic_explorer_wrapper(*args, **kwargs):
                     '"slider", None, a Signal instance')
 
         self._plot.plot(**kwargs)
+        if (navigator_computation is not None and
+                not navigator_computation.done):
+            self._update_navigator_plot(navigator_computation)
+        if update_lazy_navigator is not None:
+            # Before update_plot, which updates the navigator plot
+            self.events.data_changed.connect(update_lazy_navigator, [])
         self.events.data_changed.connect(self.update_plot, [])
         if self._plot.signal_plot:
             self._plot.signal_plot.events.closed.connect(
                 lambda: self.events.data_changed.disconnect(self.update_plot),
                 [])
+            if update_lazy_navigator is not None:
+                self._plot.signal_plot.events.closed.connect(
+                    lambda: self.events.data_changed.disconnect(
+                        update_lazy_navigator), [])
 
         if plot_markers:
             if self.metadata.has_item('Markers'):
@@ -4387,6 +4417,7 @@ def map(
         max_workers=None,
         inplace=True,
         ragged=None,
+        out_filename=None,
         **kwargs
     ):
         """Apply a function to the signal data at all the navigation
@@ -4421,6 +4452,15 @@ def map(
             the appropriate choice is made while processing. If True in case
             of lazy signal, the signal will be compute at the end of the
             mapping. Note: ``None`` is not allowed for Lazy signals!
+        out_filename : None or str, default None
+            If given and the results are not ragged, they are written to a
+            :py:class:`numpy.memmap` backed by this file instead of an array
+            in memory, which is useful when the result does not fit in
+            memory. The memmap is the data of the signal if `inplace` is
+            True, or of the returned signal otherwise. With
+            ``parallel="processes"``, the results are gathered in shared
+            memory before being written to the file, so they must fit in
+            memory. Not supported for lazy signals.
         **kwargs : dict
             All extra keyword arguments are passed to the provided function
 
@@ -4432,6 +4472,18 @@ def map(
         such, most functions are not able to operate on the result and the data
         should be used directly.
 
+        For lazy signals, the dtype of the result must be known before the
+        function is applied to all the pixels and is the dtype of the result
+        at the first pixel, except that integers are promoted to float so
+        that the results of the other pixels are not truncated.
+
+        Functions that hold the Python global interpreter lock do not benefit
+        from multithreading. For these, ``parallel="processes"`` applies the
+        function in a pool of ``max_workers`` processes, which receive chunks
+        of navigation pixels and read the signal data from shared memory. The
+        function and the keyword arguments must be serialisable with
+        :py:mod:`dill`.
+
         This method is similar to Python's :py:func:`python:map` that can
         also be utilized with a :py:class:`~hyperspy.signal.BaseSignal`
         instance for similar purposes. However, this method has the advantage of
@@ -4491,6 +4543,9 @@ def map(
             # inspect.
             _logger.warning(error)
 
+        if out_filename is not None:
+            # Only the iteration writes the results to a file
+            fargs = []
         if not ndkwargs and (self.axes_manager.signal_dimension == 1 and
                              "axis" in fargs):
             kwargs['axis'] = self.axes_manager.signal_axes[-1].index_in_array
@@ -4509,7 +4564,7 @@ def map(
                                     show_progressbar=show_progressbar,
                                     parallel=parallel, max_workers=max_workers,
                                     ragged=ragged, inplace=inplace,
-                                    **kwargs)
+                                    out_filename=out_filename, **kwargs)
         if inplace:
             self.events.data_changed.trigger(obj=self)
         return res
@@ -4536,6 +4591,7 @@ def _map_iterate(
         max_workers=None,
         ragged=None,
         inplace=True,
+        out_filename=None,
         **kwargs,
     ):
         """Iterates the signal navigation space applying the function.
@@ -4560,6 +4616,10 @@ def _map_iterate(
             shape (and/or numpy arrays to begin with). If ``None``,
             an appropriate choice is made while processing. Note: ``None`` is
             not allowed for Lazy signals!
+        out_filename : None or str, default None
+            If given and the results are not ragged, they are written to a
+            :py:class:`numpy.memmap` backed by this file instead of an array
+            in memory, which becomes the data of the resulting signal.
         **kwargs : dict
             Additional keyword arguments passed to :std:term:`function`
 
@@ -4567,6 +4627,10 @@ def _map_iterate(
         -----
         This method is replaced for lazy signals.
 
+        Unless the results are ragged, the shape and dtype of the output
+        are inferred from the result of the first navigation pixel and all
+        the results are written directly into a preallocated array.
+
         Examples
         --------
 
@@ -4601,7 +4665,9 @@ def _map_iterate(
 
         """
         from os import cpu_count
-        from hyperspy.misc.utils import create_map_objects, map_result_construction
+        from hyperspy.misc.utils import (create_map_objects,
+                                         collect_map_results,
+                                         map_result_construction)
 
         if show_progressbar is None:
             show_progressbar = preferences.General.show_progressbar
@@ -4609,91 +4675,60 @@ def _map_iterate(
         if parallel is None:
             parallel = preferences.General.parallel
 
-        size = max(1, self.axes_manager.navigation_size)
-        func, iterators = create_map_objects(function, size, iterating_kwargs, **kwargs)
-        iterators = (self._iterate_signal(),) + iterators
-        res_shape = self.axes_manager._navigation_shape_in_array
-
-        # no navigation
-        if not len(res_shape):
-            res_shape = (1,)
-
-        # pre-allocate some space
-        res_data = np.empty(res_shape, dtype="O")
-        shapes = set()
-
-        if show_progressbar:
-            pbar = progressbar(total=size, leave=True, disable=not show_progressbar)
-
         # We set this value to equal cpu_count, with a maximum
         # of 32 cores, since the earlier default value was inappropriate
         # for many-core machines.
         if max_workers is None:
             max_workers = min(32, cpu_count())
 
-        # Avoid any overhead of additional threads
+        # Avoid any overhead of additional threads or processes
         if max_workers < 2:
             parallel = False
 
-        # parallel or sequential mapping
-        if parallel:
+        size = max(1, self.axes_manager.navigation_size)
+        res_shape = self.axes_manager._navigation_shape_in_array
+        processes = parallel == "processes" and size > 1
+        if processes:
+            # The constant kwargs are sent once to the workers with the
+            # function instead of once per pixel
+            iterating = tuple(key for key, value in iterating_kwargs)
+            function = partial(function, **{k: v for k, v in kwargs.items()
+                                            if k not in iterating})
+            kwargs = {}
+        func, iterators = create_map_objects(function, size, iterating_kwargs, **kwargs)
+
+        if show_progressbar:
+            pbar = progressbar(total=size, leave=True, disable=not show_progressbar)
+            callback = pbar.update
+        else:
+            callback = None
+
+        # parallel or sequential mapping, the results are written directly
+        # into a preallocated array unless they are ragged
+        if processes:
+            from hyperspy.misc.utils import map_with_process_pool
+
+            sig_shape = self.axes_manager._signal_shape_in_array or (1,)
+            data = self._data_aligned_with_axes.reshape((size,) + sig_shape)
+            res_data, sig_shape, ragged = map_with_process_pool(
+                func, data, iterators, res_shape, ragged=ragged,
+                max_workers=max_workers, callback=callback,
+                filename=out_filename)
+        elif parallel:
             from concurrent.futures import ThreadPoolExecutor
 
+            iterators = (self._iterate_signal(),) + iterators
             with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                for ind, res in zip(
-                    range(res_data.size), executor.map(func, zip(*iterators))
-                ):
-                    res = np.asarray(res)
-                    res_data.flat[ind] = res
-
-                    if ragged is False:
-                        shapes.add(res.shape)
-                        if len(shapes) != 1:
-                            raise ValueError(
-                                "The result shapes are not identical, but ragged=False"
-                            )
-                    else:
-                        try:
-                            shapes.add(res.shape)
-                        except AttributeError:
-                            shapes.add(None)
-
-                    if show_progressbar:
-                        pbar.update(1)
-
+                res_data, sig_shape, ragged = collect_map_results(
+                    executor.map(func, zip(*iterators)), res_shape,
+                    ragged=ragged, callback=callback, filename=out_filename)
         else:
             from builtins import map
 
-            for ind, res in zip(range(res_data.size), map(func, zip(*iterators))):
-                res = np.asarray(res)
-                res_data.flat[ind] = res
-
-                if ragged is False:
-                    shapes.add(res.shape)
-                    if len(shapes) != 1:
-                        raise ValueError(
-                            "The result shapes are not identical, but ragged=False"
-                        )
-                else:
-                    try:
-                        shapes.add(res.shape)
-                    except AttributeError:
-                        shapes.add(None)
-
-                if show_progressbar:
-                    pbar.update(1)
-
-        # Combine data if required
-        shapes = list(shapes)
-        suitable_shapes = len(shapes) == 1 and shapes[0] is not None
-        ragged = ragged or not suitable_shapes
-        sig_shape = None
-
-        if not ragged:
-            sig_shape = () if shapes[0] == (1,) else shapes[0]
-            res_data = np.stack(res_data.ravel()).reshape(
-                self.axes_manager._navigation_shape_in_array + sig_shape
-            )
+            iterators = (self._iterate_signal(),) + iterators
+            res_data, sig_shape, ragged = collect_map_results(
+                map(func, zip(*iterators)), res_shape, ragged=ragged,
+                callback=callback, filename=out_filename)
 
         res = map_result_construction(self, inplace, res_data, ragged, sig_shape)
 
@@ -18,6 +18,7 @@
 
 import gc
 import os.path
+import pickle
 import sys
 import tempfile
 import time
@@ -346,6 +347,90 @@ def test_rgba16():
     assert (s.data == data).all()
 
 
+def test_lazy_navigator(tmp_path):
+    from hyperspy.misc import lazy_navigator
+
+    fname = tmp_path / 'test.hspy'
+    data = np.arange(6 * 8 * 10 * 10).reshape((6, 8, 10, 10))
+    s = Signal2D(da.from_array(data, chunks=(2, 4, 10, 10))).as_lazy()
+    navigator = s.compute_navigator(show_progressbar=False)
+    s.save(fname)
+    lazy_navigator.clear_cache()
+    s2 = load(fname, lazy=True)
+    np.testing.assert_array_equal(
+        lazy_navigator.get_cached_navigator(s2.data), navigator.data)
+    s2.close_file()
+
+
+def test_lazy_aggregated_chunks(tmp_path):
+    fname = tmp_path / 'test.hspy'
+    s = Signal1D(np.arange(12 * 10 * 16.).reshape((12, 10, 16)))
+    s.save(fname, chunks=(2, 5, 16))
+    s2 = load(fname, lazy=True)
+    # Whole chunks of the file are aggregated
+    assert s2.data.chunks == ((12,), (10,), (16,))
+    s2.close_file()
+    s2 = load(fname, lazy=True, chunks=(2, 5, 16))
+    assert s2.data.chunks == ((2,) * 6, (5, 5), (16,))
+    np.testing.assert_array_equal(s2.data.compute(), s.data)
+    s2.close_file()
+
+
+@pytest.mark.parametrize("lazy", [True, False])
+def test_lazy_original_metadata(tmp_path, lazy):
+    fname = tmp_path / 'test.hspy'
+    s = Signal1D(np.arange(10))
+    s.original_metadata.set_item("Node1.Node11.leaf111", 111)
+    s.original_metadata.set_item("Node1.leaf11", [1, 2])
+    s.original_metadata.set_item("leaf1", "a")
+    s.save(fname)
+    s2 = load(fname, lazy=lazy, original_metadata="lazy")
+    # The groups are read on first access
+    node1 = s2.original_metadata.__dict__['Node1']['_dtb_value_']
+    assert '_lazy_attributes' in object.__getattribute__(node1, '__dict__')
+    assert s2.original_metadata.leaf1 == "a"
+    if lazy:
+        # The file is opened again if needed
+        s2.close_file()
+    assert s2.original_metadata.as_dictionary() == \
+        s.original_metadata.as_dictionary()
+
+
+def test_lazy_original_metadata_save_same_file(tmp_path):
+    fname = tmp_path / 'test.hspy'
+    s = Signal1D(np.arange(10))
+    s.original_metadata.set_item("Node1.Node11.leaf111", 111)
+    s.original_metadata.set_item("Node1.leaf11", [1, 2])
+    s.save(fname)
+    s2 = load(fname, original_metadata="lazy")
+    s2.save(fname, overwrite=True)
+    s3 = load(fname)
+    assert s3.original_metadata.as_dictionary() == \
+        s.original_metadata.as_dictionary()
+
+
+def test_lazy_original_metadata_pickle(tmp_path):
+    fname = tmp_path / 'test.hspy'
+    s = Signal1D(np.arange(10))
+    s.original_metadata.set_item("Node1.Node11.leaf111", 111)
+    s.original_metadata.set_item("Node1.leaf11", [1, 2])
+    s.save(fname)
+    s2 = load(fname, original_metadata="lazy")
+    original_metadata = pickle.loads(pickle.dumps(s2.original_metadata))
+    node1 = original_metadata.__dict__['Node1']['_dtb_value_']
+    assert '_lazy_attributes' in object.__getattribute__(node1, '__dict__')
+    assert original_metadata.as_dictionary() == \
+        s.original_metadata.as_dictionary()
+    assert s2.deepcopy().original_metadata.as_dictionary() == \
+        s.original_metadata.as_dictionary()
+
+
+def test_lazy_original_metadata_error():
+    with pytest.raises(ValueError):
+        load(os.path.join(my_path, "hdf5_files", "example1_v2.0.hdf5"),
+             original_metadata="eager")
+
+
 class TestLoadingOOMReadOnly:
 
     def setup_method(self, method):
@@ -396,6 +481,31 @@ def teardown_method(self, method):
         remove(self.filename)
 
 
+@pytest.mark.parametrize("compression", [None, "gzip"])
+@pytest.mark.parametrize("dtype", ["float32", "uint16", "complex128", "bool"])
+def test_write_direct_chunks(tmp_path, compression, dtype):
+    # The chunks at the edges are smaller than the chunk shape
+    data = (np.random.random((5, 7, 130)) * 10).astype(dtype)
+    s = Signal1D(data[:, ::-1])
+    fname = tmp_path / "test.hspy"
+    s.save(fname, chunks=(2, 3, 64), compression=compression)
+    with h5py.File(fname, mode="r") as f:
+        dset = f["Experiments/__unnamed__/data"]
+        assert dset.compression == compression
+        np.testing.assert_array_equal(dset[()], s.data)
+
+
+def test_compression_hdf5plugin(tmp_path):
+    pytest.importorskip("hdf5plugin")
+    s = Signal1D(np.arange(4 * 5 * 100).reshape((4, 5, 100)))
+    fname = tmp_path / "test.hspy"
+    s.save(fname, compression="blosc")
+    with h5py.File(fname, mode="r") as f:
+        dset = f["Experiments/__unnamed__/data"]
+        assert "32001" in dset._filters
+    np.testing.assert_array_equal(load(fname).data, s.data)
+
+
 class TestAxesConfiguration:
 
     def setup_method(self, method):
@@ -200,3 +200,24 @@ def test_save_default_format():
 
         t = hs.load(Path(dirpath, "temp.hspy"))
         assert len(t) == 1
+
+
+@pytest.mark.parametrize("ext", ["hspy", "rpl"])
+def test_load_slices(tmp_path, ext):
+    s = Signal1D(np.arange(4 * 5 * 10, dtype=np.float32).reshape((4, 5, 10)))
+    s.axes_manager[-1].offset = 1.
+    s.axes_manager[-1].scale = 0.5
+    fname = tmp_path / f"test.{ext}"
+    s.save(fname)
+    t = hs.load(fname, navigation_slice=(slice(1, 3), 2),
+                signal_slice=slice(2., 4.))
+    s2 = s.inav[1:3, 2].isig[2.:4.]
+    assert not t._lazy
+    np.testing.assert_allclose(t.data, s2.data)
+    assert t.axes_manager.navigation_shape == (2,)
+    assert t.axes_manager[-1].offset == 2.
+
+    t = hs.load(fname, lazy=True, signal_slice=slice(2, 5))
+    assert t._lazy
+    assert t.axes_manager.signal_shape == (3,)
+    np.testing.assert_allclose(t.data.compute(), s.isig[2:5].data)
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+# Copyright 2007-2020 The HyperSpy developers
+#
+# This file is part of  HyperSpy.
+#
+#  HyperSpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+#  HyperSpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with  HyperSpy.  If not, see <http://www.gnu.org/licenses/>.
+
+import dask.array as da
+import numpy as np
+import pytest
+
+from hyperspy._signals.signal1d import Signal1D
+from hyperspy._signals.signal2d import Signal2D
+from hyperspy.io import load
+
+zarr = pytest.importorskip("zarr")
+
+
+class TestZspy:
+
+    def setup_method(self, method):
+        s = Signal1D(np.arange(2 * 3 * 10, dtype=float).reshape((2, 3, 10)))
+        s.axes_manager[0].scale = 0.5
+        s.axes_manager[-1].units = "eV"
+        s.metadata.General.title = "test"
+        s.metadata.set_item("Test.list", [1, 2, 3])
+        s.metadata.set_item("Test.tuple", ("a", "b"))
+        s.metadata.set_item("Test.bool", np.bool_(True))
+        s.metadata.set_item("Test.binary", b"a\x00b")
+        s.metadata.set_item("Test.signal", Signal1D(np.arange(5)))
+        s.original_metadata.set_item("a.b", 1.5)
+        self.s = s
+
+    def check(self, s2):
+        s = self.s
+        np.testing.assert_array_equal(s2.data, s.data)
+        assert s2.axes_manager[0].scale == 0.5
+        assert s2.axes_manager[-1].units == "eV"
+        assert s2.metadata.General.title == "test"
+        assert s2.metadata.Test.list == [1, 2, 3]
+        assert s2.metadata.Test.tuple == ("a", "b")
+        assert s2.metadata.Test.bool is True
+        assert s2.metadata.Test.binary == b"a\x00b"
+        np.testing.assert_array_equal(s2.metadata.Test.signal.data,
+                                      np.arange(5))
+        assert s2.original_metadata.a.b == 1.5
+
+    @pytest.mark.parametrize("store", ["directory", "zip"])
+    def test_save_load(self, tmp_path, store):
+        fname = tmp_path / "test.zspy"
+        self.s.save(fname, store=store)
+        assert fname.is_dir() == (store == "directory")
+        self.check(load(fname))
+
+    def test_lazy(self, tmp_path):
+        fname = tmp_path / "test.zspy"
+        self.s.as_lazy().save(fname)
+        s2 = load(fname, lazy=True)
+        assert isinstance(s2.data, da.Array)
+        # A single chunk, made of the chunk of the file
+        f = zarr.open_group(zarr.NestedDirectoryStore(str(fname)), mode="r")
+        chunks = f["Experiments/test/data"].chunks
+        assert tuple(c[0] for c in s2.data.chunks) == chunks
+        self.check(s2)
+
+    def test_signal_chunks(self, tmp_path):
+        fname = tmp_path / "test.zspy"
+        s = Signal2D(np.zeros((10, 10, 64, 64)))
+        s.save(fname)
+        f = zarr.open_group(zarr.NestedDirectoryStore(str(fname)), mode="r")
+        assert f["Experiments/__unnamed__/data"].chunks[-2:] == (64, 64)
+
+    def test_model(self, tmp_path):
+        fname = tmp_path / "test.zspy"
+        m = self.s.create_model()
+        m.store("a")
+        self.s.save(fname)
+        s2 = load(fname)
+        assert s2.models.a.restore().signal is s2
+
+    @pytest.mark.parametrize("store", ["directory", "zip"])
+    def test_lazy_original_metadata(self, tmp_path, store):
+        fname = tmp_path / "test.zspy"
+        self.s.save(fname, store=store)
+        s2 = load(fname, original_metadata="lazy")
+        self.check(s2)
+
+    @pytest.mark.parametrize("store", ["directory", "zip"])
+    def test_lazy_original_metadata_save_same_file(self, tmp_path, store):
+        fname = tmp_path / "test.zspy"
+        self.s.save(fname, store=store)
+        s2 = load(fname, original_metadata="lazy")
+        s2.save(fname, store=store, overwrite=True)
+        self.check(load(fname))
@@ -169,6 +169,22 @@ def test_bounds_warning(self):
         ):
             self.s.decomposition(bounds=True)
 
+    @pytest.mark.parametrize("scheduler", ["synchronous", "threads"])
+    def test_scheduler(self, scheduler):
+        self.s.decomposition(output_dimension=3, algorithm="ORPCA")
+        loadings = self.s.learning_results.loadings
+        s = self.s.deepcopy()
+        s.decomposition(output_dimension=3, algorithm="ORPCA",
+                        scheduler=scheduler)
+        np.testing.assert_allclose(s.learning_results.loadings, loadings)
+
+    def test_get_warning(self):
+        with pytest.warns(
+            VisibleDeprecationWarning, match="`get` keyword is deprecated"
+        ):
+            self.s.decomposition(output_dimension=3, algorithm="ORPCA",
+                                 get="synchronous")
+
     @pytest.mark.skipif(not sklearn_installed, reason="sklearn not installed")
     @pytest.mark.parametrize("algorithm", ["ONMF"])
     def test_deprecated_algorithms_warning(self, algorithm):
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# Copyright 2007-2020 The HyperSpy developers
+#
+# This file is part of  HyperSpy.
+#
+#  HyperSpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+#  HyperSpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with  HyperSpy.  If not, see <http://www.gnu.org/licenses/>.
+
+import dask.array as da
+import h5py
+import numpy as np
+
+from hyperspy.misc.chunk_planner import (aggregate_storage_chunks,
+                                         chunks_fit, get_reading_chunks,
+                                         get_storage_chunks, plan_chunks)
+
+
+def test_plan_chunks_keep_axes():
+    chunks = plan_chunks((50, 50, 64, 64), 8, 2 ** 20, keep_axes=(2, 3))
+    assert chunks[2:] == ((64,), (64,))
+    assert max(chunks[0]) * max(chunks[1]) * 64 * 64 * 8 <= 2 ** 20
+    # The contiguous axes are grown first
+    assert chunks[1] == (32, 18)
+    assert chunks[0] == (1,) * 50
+
+
+def test_plan_chunks_storage_multiples():
+    chunks = plan_chunks((60, 60, 32), 8, 600 * 32 * 8, keep_axes=(2,),
+                         units=(4, 6, 32))
+    assert chunks[1] == (60,)
+    assert all(c % 4 == 0 for c in chunks[0][:-1])
+    # Shrinking the chunks also keeps multiples of the storage chunks
+    chunks = plan_chunks((60, 60, 32), 8, 50 * 32 * 8, keep_axes=(2,),
+                         start=(30, 60, 32), units=(4, 6, 32))
+    assert chunks[1][0] % 6 == 0 and chunks[0][0] % 4 == 0
+    assert chunks[0][0] * chunks[1][0] <= 50
+
+
+def test_plan_chunks_reduce():
+    chunks = plan_chunks((10, 100), 8, 2 ** 20, grow_axes=(0,),
+                         start=(1, 2))
+    assert chunks == ((10,), (100,))
+    chunks = plan_chunks((100, 100), 8, 100 * 8, grow_axes=(0,))
+    assert chunks[0] == (100,)
+
+
+def test_plan_chunks_does_not_fit():
+    chunks = plan_chunks((10, 100), 8, 64, keep_axes=(1,))
+    assert chunks == ((1,) * 10, (100,))
+
+
+def test_chunks_fit():
+    planned = plan_chunks((40, 40, 64), 8, 2 ** 20, keep_axes=(2,))
+    assert chunks_fit(planned, 8, 2 ** 20, planned, (2,))
+    # Split axis that must be kept
+    chunks = da.ones((40, 40, 64), chunks=(10, 40, 32)).chunks
+    assert not chunks_fit(chunks, 8, 2 ** 20, planned, (2,))
+    # Many times more chunks than planned
+    chunks = da.ones((40, 40, 64), chunks=(1, 1, 64)).chunks
+    assert not chunks_fit(chunks, 8, 2 ** 20, planned, (2,))
+    # Close enough to the planned chunks
+    chunks = da.ones((40, 40, 64), chunks=(10, 40, 64)).chunks
+    assert chunks_fit(chunks, 8, 2 ** 20, planned, (2,))
+    # Too large
+    planned = plan_chunks((40, 40, 64), 8, 2 ** 19, keep_axes=(2,))
+    chunks = da.ones((40, 40, 64), chunks=(40, 40, 64)).chunks
+    assert not chunks_fit(chunks, 8, 2 ** 19, planned, (2,))
+
+
+def test_get_storage_chunks(tmp_path):
+    with h5py.File(tmp_path / "test.h5", "w") as f:
+        dset = f.create_dataset("data", data=np.zeros((10, 20, 30)),
+                                chunks=(2, 5, 30))
+        data = da.from_array(dset, chunks=(4, 10, 30))
+        assert get_storage_chunks(data) == (2, 5, 30)
+        assert get_storage_chunks(data[:5]) is None
+        assert get_storage_chunks(da.ones((10, 20, 30))) is None
+
+
+def test_aggregate_storage_chunks():
+    chunks = aggregate_storage_chunks((100, 100, 64, 64), 4, (3, 7, 64, 64),
+                                      max_nbytes=2 ** 24)
+    assert chunks[2:] == ((64,), (64,))
+    # Whole storage chunks, the last one along each axis excepted
+    assert all(c % 3 == 0 for c in chunks[0][:-1])
+    assert all(c % 7 == 0 for c in chunks[1][:-1])
+    assert max(chunks[0]) * max(chunks[1]) * 64 * 64 * 4 <= 2 ** 24
+    assert len(chunks[0]) * len(chunks[1]) < 34 * 15
+
+
+def test_aggregate_storage_chunks_large():
+    # The storage chunks are never split
+    chunks = aggregate_storage_chunks((10, 512, 512), 8, (2, 512, 512),
+                                      max_nbytes=2 ** 20)
+    assert chunks == ((2,) * 5, (512,), (512,))
+
+
+def test_get_reading_chunks(tmp_path):
+    with h5py.File(tmp_path / "test.h5", "w") as f:
+        dset = f.create_dataset("a", shape=(40, 30), dtype="f8",
+                                chunks=(4, 30))
+        assert get_reading_chunks(dset) == ((40,), (30,))
+        assert get_reading_chunks(dset, chunks=(4, 30)) == (4, 30)
+        contiguous = f.create_dataset("b", shape=(40, 30), dtype="f8")
+        assert get_reading_chunks(contiguous) == ((40,), (30,))
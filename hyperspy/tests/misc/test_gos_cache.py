@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# Copyright 2007-2020 The HyperSpy developers
+#
+# This file is part of  HyperSpy.
+#
+#  HyperSpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+#  HyperSpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with  HyperSpy.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+import pytest
+
+from hyperspy.defaults_parser import preferences
+from hyperspy.misc.eels import gos_cache
+from hyperspy.misc.eels.hydrogenic_gos import HydrogenicGOS
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(gos_cache, "cache_path", tmp_path)
+    monkeypatch.setattr(preferences.EELS, "eels_gos_disk_cache", True)
+    gos_cache.clear()
+    yield gos_cache
+    gos_cache.clear()
+
+
+def test_integrateq_memory_cache(cache):
+    gos = HydrogenicGOS("C_K")
+    qint = gos.integrateq(283.8, 0.01, 100).y
+    # The second time the cached integral is returned
+    gos._integrateq = None
+    np.testing.assert_array_equal(gos.integrateq(283.8, 0.01, 100).y, qint)
+    with pytest.raises(TypeError):
+        gos.integrateq(283.8, 0.02, 100)
+
+
+def test_integrateq_disk_cache(cache):
+    gos = HydrogenicGOS("C_K")
+    interp = gos.integrateq(290., 0.01, 100)
+    assert len(list(cache.cache_path.glob("*.npy"))) == 1
+    cache.clear()
+    gos = HydrogenicGOS("C_K")
+    gos._integrateq = None
+    interp2 = gos.integrateq(290., 0.01, 100)
+    np.testing.assert_array_equal(interp2.x, interp.x)
+    np.testing.assert_array_equal(interp2.y, interp.y)
+    assert gos.energy_shift == 290. - gos.onset_energy
+    cache.clear(disk=True)
+    assert not list(cache.cache_path.glob("*.npy"))
+
+
+def test_gos_files_cache_size(cache, tmp_path, monkeypatch):
+    monkeypatch.setattr(gos_cache, "GOS_FILES_CACHE_SIZE", 2)
+    filenames = []
+    for i in range(3):
+        filenames.append(tmp_path / f"gos{i}")
+        filenames[-1].write_text(str(i))
+        gos_cache.read_gos_file(filenames[-1], lambda f: f.read_text())
+    assert len(gos_cache._gos_files) == 2
+    # The least recently used file is parsed again
+    parsed = []
+    gos_cache.read_gos_file(filenames[0], parsed.append)
+    assert parsed == [filenames[0]]
+
+
+def test_integrateq_no_disk_cache(cache, monkeypatch):
+    monkeypatch.setattr(preferences.EELS, "eels_gos_disk_cache", False)
+    HydrogenicGOS("C_K").integrateq(283.8, 0.01, 100)
+    assert not list(cache.cache_path.glob("*.npy"))
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+# Copyright 2007-2020 The HyperSpy developers
+#
+# This file is part of  HyperSpy.
+#
+#  HyperSpy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+#  HyperSpy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with  HyperSpy.  If not, see <http://www.gnu.org/licenses/>.
+
+import h5py
+import numpy as np
+import pytest
+
+from hyperspy.components1d import Gaussian
+from hyperspy.misc.checkpoint import ModelCheckpoint
+from hyperspy.signals import Signal1D
+
+
+def create_model():
+    rng = np.random.RandomState(17)
+    x = np.arange(50)
+    centres = 20 + np.arange(6)[:, np.newaxis] + np.zeros((6, 5))
+    data = 10 * np.exp(-(x - centres[..., np.newaxis]) ** 2 / 8)
+    s = Signal1D(data + rng.rand(*data.shape) * 0.1)
+    m = s.create_model()
+    g = Gaussian(A=20, centre=22, sigma=2)
+    m.append(g)
+    return m
+
+
+class TestModelCheckpoint:
+
+    def setup_method(self, method):
+        self.m = create_model()
+
+    def test_write_dirty_rows(self, tmp_path):
+        m = self.m
+        filename = tmp_path / "checkpoint.h5"
+        checkpoint = ModelCheckpoint(m, filename)
+        centre = m[0].centre
+        centre.map["values"][1, 2] = 1.
+        centre.map["values"][3, 0] = 2.
+        checkpoint.mark((1, 2))
+        checkpoint.write()
+        with h5py.File(filename, "r") as f:
+            values = f["parameters/0_gaussian.centre"][()]["values"]
+            done = f["done"][()]
+        assert values[1, 2] == 1.
+        # Only the rows marked as done are written
+        assert values[3, 0] == 0.
+        assert done.sum() == 1 and done[1, 2]
+        checkpoint.close()
+
+    def test_resume(self, tmp_path):
+        m = self.m
+        filename = tmp_path / "checkpoint.h5"
+        with ModelCheckpoint(m, filename) as checkpoint:
+            m[0].A.map["values"][2] = 5.
+            m.chisq.data[2] = 3.
+            checkpoint.mark_rows(2, 3)
+        m2 = create_model()
+        checkpoint = ModelCheckpoint(m2, filename, resume=True)
+        np.testing.assert_array_equal(m2[0].A.map["values"],
+                                      m[0].A.map["values"])
+        assert m2[0].A.map["values"][2, 0] == 5.
+        np.testing.assert_array_equal(m2.chisq.data, m.chisq.data)
+        assert checkpoint.done[2].all()
+        assert checkpoint.done.sum() == 5
+        checkpoint.close()
+
+    def test_resume_wrong_model(self, tmp_path):
+        filename = tmp_path / "checkpoint.h5"
+        ModelCheckpoint(self.m, filename).close()
+        m2 = create_model()
+        m2.append(Gaussian())
+        with pytest.raises(ValueError, match="components"):
+            ModelCheckpoint(m2, filename, resume=True)
+
+    def test_marker(self, tmp_path):
+        filename = tmp_path / "checkpoint.h5"
+        marker = np.zeros((6, 5))
+        checkpoint = ModelCheckpoint(self.m, filename, marker=marker)
+        marker[4, 1] = -1
+        checkpoint.write()
+        marker2 = np.ones((6, 5))
+        ModelCheckpoint(create_model(), filename, resume=True,
+                        marker=marker2).close()
+        np.testing.assert_array_equal(marker2, marker)
+        checkpoint.close()
+
+
+class TestMultifitAutosave:
+
+    def setup_method(self, method):
+        self.m = create_model()
+
+    def test_autosave_temporary_file(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        self.m.multifit(autosave=True, autosave_every=4,
+                        iterpath="serpentine")
+        assert not list(tmp_path.iterdir())
+
+    def test_autosave_resume(self, tmp_path):
+        m = self.m
+        filename = str(tmp_path / "multifit.h5")
+        m.multifit(autosave=filename, autosave_every=4, iterpath="serpentine")
+        with h5py.File(filename, "r") as f:
+            assert f["done"][()].all()
+            np.testing.assert_array_equal(
+                f["parameters/0_gaussian.centre"][()]["values"],
+                m[0].centre.map["values"])
+            # Simulate an interruption after the first three rows
+            done = f["done"][()]
+        done[3:] = False
+        with h5py.File(filename, "r+") as f:
+            f["done"][...] = done
+
+        m2 = create_model()
+        fitted = []
+        fit = m2.fit
+
+        def counting_fit(**kwargs):
+            fitted.append(m2.axes_manager.indices)
+            return fit(**kwargs)
+
+        m2.fit = counting_fit
+        m2.multifit(autosave=filename, resume=True, iterpath="serpentine")
+        assert len(fitted) == 15
+        np.testing.assert_allclose(m2[0].centre.map["values"],
+                                   m[0].centre.map["values"], rtol=1e-5)
+
+    def test_resume_requires_filename(self):
+        with pytest.raises(ValueError, match="resume"):
+            self.m.multifit(autosave=True, resume=True)
+
+    def test_autosave_interrupted(self, tmp_path):
+        m = self.m
+        filename = str(tmp_path / "multifit.h5")
+        fit = m.fit
+        fitted = []
+
+        def interrupted_fit(**kwargs):
+            if len(fitted) == 7:
+                raise KeyboardInterrupt
+            fitted.append(m.axes_manager.indices)
+            return fit(**kwargs)
+
+        m.fit = interrupted_fit
+        with pytest.raises(KeyboardInterrupt):
+            m.multifit(autosave=filename, autosave_every=100,
+                       iterpath="flyback")
+        # The fits done since the last write are saved and the file closed
+        with h5py.File(filename, "r") as f:
+            assert f["done"][()].sum() == 7
+            assert f["done"][()].ravel()[:7].all()
+
+    def test_autosave_linear_resume(self, tmp_path):
+        m = self.m
+        m[0].centre.free = False
+        m[0].sigma.free = False
+        filename = str(tmp_path / "multifit.h5")
+        m.multifit(optimizer="linear", autosave=filename,
+                   iterpath="serpentine")
+        with h5py.File(filename, "r") as f:
+            assert f["done"][()].all()
+            np.testing.assert_array_equal(
+                f["parameters/0_gaussian.a"][()]["values"],
+                m[0].A.map["values"])
+
+        m2 = create_model()
+        m2[0].centre.free = False
+        m2[0].sigma.free = False
+        # Nothing is refitted, so the fits do not see the new data
+        m2.signal.data[:] = 0
+        m2.multifit(optimizer="linear", autosave=filename, resume=True,
+                    iterpath="serpentine")
+        np.testing.assert_array_equal(m2[0].A.map["values"],
+                                      m[0].A.map["values"])
+        assert m[0].A.map["values"].min() > 1
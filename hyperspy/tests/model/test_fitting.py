@@ -546,6 +546,29 @@ def test_bounded_snapping(self, optimizer):
         np.testing.assert_allclose(self.m[0].r.map["values"], [3.0, 3.0], rtol=TOL)
         np.testing.assert_allclose(self.m[0].A.map["values"], [4.0, 4.0], rtol=TOL)
 
+    def test_parallel(self):
+        # HyperSpy 2.0: remove setting iterpath='serpentine'
+        self.m.multifit(iterpath="serpentine", optimizer="trf", parallel=True,
+                        max_workers=2)
+        np.testing.assert_array_almost_equal(self.m[0].r.map["values"], [3.0, 100.0])
+        np.testing.assert_array_almost_equal(self.m[0].A.map["values"], [2.0, 2.0])
+        assert self.m[0].r.map["is_set"].all()
+        assert np.all(self.m.dof.data == 1)
+        assert np.isfinite(self.m.chisq.data).all()
+
+    def test_parallel_mask(self):
+        chisq = self.m.chisq.data.copy()
+        # HyperSpy 2.0: remove setting iterpath='serpentine'
+        self.m.multifit(iterpath="serpentine", optimizer="trf", parallel=True,
+                        mask=np.array([False, True]))
+        np.testing.assert_array_almost_equal(self.m[0].r.map["values"], [3.0, 100.0])
+        np.testing.assert_array_equal(self.m.chisq.data[1], chisq[1])
+
+    def test_parallel_interactive_plot_error(self):
+        with pytest.raises(ValueError, match="interactive_plot"):
+            self.m.multifit(iterpath="serpentine", parallel=True,
+                            interactive_plot=True)
+
     @pytest.mark.parametrize("iterpath", ["flyback", "serpentine"])
     def test_iterpaths(self, iterpath):
         self.m.multifit(iterpath=iterpath)
@@ -564,6 +587,66 @@ def test_iterpath_none(self):
             self.m.multifit(iterpath=None)
 
 
+@pytest.mark.parametrize("lazy", [False, True])
+def test_multifit_parallel_blocks(monkeypatch, lazy):
+    import hyperspy.model
+    from hyperspy.defaults_parser import preferences
+
+    offsets = np.arange(30.0).reshape((10, 3))
+    s = hs.signals.Signal1D(np.ones((10, 3, 20)) * offsets[..., np.newaxis])
+    if lazy:
+        s = s.as_lazy()
+    m = s.create_model()
+    m.append(hs.model.components1D.Offset())
+    # Blocks of two rows of 3 * 20 float64
+    monkeypatch.setattr(preferences.General, "lazy_chunk_size",
+                        2 * 480 / 2 ** 20)
+    in_flight = []
+    _wait = hyperspy.model.wait
+
+    def wait(futures, **kwargs):
+        in_flight.append(len(futures))
+        return _wait(futures, **kwargs)
+
+    monkeypatch.setattr(hyperspy.model, "wait", wait)
+    m.multifit(iterpath="serpentine", parallel=True, max_workers=1)
+    np.testing.assert_allclose(m[0].offset.map["values"], offsets)
+    # 5 blocks, at most one more than the number of workers at a time
+    assert max(in_flight) == 2
+    assert len(in_flight) >= 3
+
+
+def test_multifit_parallel_packed_maps(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    import hyperspy.model
+
+    s = hs.signals.Signal1D(np.ones((4, 20)))
+    m = s.create_model()
+    m.extend([hs.model.components1D.Offset(),
+              hs.model.components1D.Gaussian()])
+    results = []
+    _multifit_block = hyperspy.model._multifit_block
+
+    def multifit_block(*args):
+        result = _multifit_block(*args)
+        results.append(result)
+        return result
+
+    # Run the blocks in this process to inspect what they send back
+    monkeypatch.setattr(hyperspy.model, "ProcessPoolExecutor",
+                        ThreadPoolExecutor)
+    monkeypatch.setattr(hyperspy.model, "_multifit_block", multifit_block)
+    m.multifit(iterpath="serpentine", parallel=True, max_workers=2)
+    assert results
+    dtype = np.dtype(
+        [("values", "float"), ("std", "float"), ("is_set", "bool")])
+    for maps, _, _ in results:
+        for component_maps in maps:
+            for map_ in component_maps:
+                # Only the fields of the parameter, not the whole store
+                assert map_.dtype == dtype
+
+
 @lazifyTestClass
 class TestMultiFitSignalVariance:
     def setup_method(self, method):
@@ -590,6 +673,180 @@ def test_std1_red_chisq(self):
         np.testing.assert_allclose(self.m.red_chisq.data[0], 0.813109, rtol=TOL)
         np.testing.assert_allclose(self.m.red_chisq.data[1], 0.697727, rtol=TOL)
 
+    def test_linear_red_chisq(self):
+        self.m.multifit(iterpath="serpentine", optimizer="linear")
+        np.testing.assert_allclose(self.m.red_chisq.data[0], 0.813109, rtol=TOL)
+        np.testing.assert_allclose(self.m.red_chisq.data[1], 0.697727, rtol=TOL)
+
+
+class TestMultifitLazyBlocks:
+    def setup_method(self, method):
+        np.random.seed(1)
+        axis = np.arange(50)
+        centre = 20 + np.arange(6)[:, np.newaxis] + np.zeros((6, 5))
+        s = hs.signals.Signal1D(
+            10 * np.exp(-((axis - centre[..., np.newaxis]) ** 2) / 8)
+            + np.random.uniform(0, 0.1, size=(6, 5, 50))
+        )
+        s.estimate_poissonian_noise_variance()
+        self.s = s
+
+    def _multifit(self, s):
+        m = s.create_model()
+        m.append(hs.model.components1D.Gaussian(A=20, centre=22, sigma=2))
+        m.multifit(iterpath="serpentine")
+        return m
+
+    def test_blocks(self, monkeypatch):
+        from hyperspy._signals.lazy import NavigationBlockStream
+
+        computed = []
+        compute = NavigationBlockStream._compute
+
+        def counting_compute(stream, block):
+            computed.append(block)
+            return compute(stream, block)
+
+        monkeypatch.setattr(NavigationBlockStream, "_compute", counting_compute)
+        s = self.s.as_lazy()
+        s.data = s.data.rechunk((2, 5, 50))
+        variance = s.get_noise_variance().as_lazy()
+        variance.data = variance.data.rechunk((3, 5, 50))
+        s.set_noise_variance(variance)
+        m = self._multifit(s)
+        # Each block is computed once, for the signal and the variance
+        assert computed == [0, 1, 2]
+        assert s._navigation_block is None
+        assert variance._navigation_block is None
+        m_ref = self._multifit(self.s)
+        for name in ("A", "centre", "sigma"):
+            np.testing.assert_allclose(
+                getattr(m[0], name).map["values"],
+                getattr(m_ref[0], name).map["values"],
+                rtol=TOL,
+            )
+        np.testing.assert_allclose(m.chisq.data, m_ref.chisq.data, rtol=TOL)
+
+
+class TestLinearFitting:
+    def setup_method(self, method):
+        np.random.seed(1)
+        axis = np.arange(100.0)
+        A = np.random.uniform(1, 10, size=(3, 4))
+        s = hs.signals.Signal1D(
+            A[..., np.newaxis] * np.exp(-((axis - 50) ** 2) / 50)
+            + 2
+            + 0.01 * axis
+            + np.random.normal(0, 0.1, size=(3, 4, 100))
+        )
+        self.s = s
+
+    def _create_model(self):
+        m = self.s.create_model()
+        g = hs.model.components1D.Gaussian(centre=50, sigma=5)
+        g.centre.free = False
+        g.sigma.free = False
+        m.extend([g, hs.model.components1D.Polynomial(order=1, legacy=False)])
+        m.set_signal_range(5, 95)
+        return m
+
+    def test_fit(self):
+        m = self._create_model()
+        m.fit(optimizer="linear")
+        m_lm = self._create_model()
+        m_lm.fit()
+        for p, p_lm in zip(m[0].free_parameters + m[1].free_parameters,
+                           m_lm[0].free_parameters + m_lm[1].free_parameters):
+            np.testing.assert_allclose(p.value, p_lm.value, rtol=1e-5)
+            np.testing.assert_allclose(p.std, p_lm.std, rtol=1e-5)
+
+    @pytest.mark.parametrize("variance", [None, "scalar", "signal"])
+    def test_multifit(self, variance):
+        if variance == "scalar":
+            self.s.set_noise_variance(0.01)
+        elif variance == "signal":
+            self.s.set_noise_variance(
+                hs.signals.Signal1D(np.random.uniform(0.5, 2, self.s.data.shape))
+            )
+        mask = np.zeros((3, 4), dtype=bool)
+        mask[1, 2] = True
+        m = self._create_model()
+        m.multifit(optimizer="linear", iterpath="serpentine", mask=mask)
+        m_lm = self._create_model()
+        m_lm.multifit(iterpath="serpentine", mask=mask)
+        for p, p_lm in zip(m[0].parameters + m[1].parameters,
+                           m_lm[0].parameters + m_lm[1].parameters):
+            np.testing.assert_array_equal(p.map["is_set"], p_lm.map["is_set"])
+            np.testing.assert_allclose(p.map["values"][~mask],
+                                       p_lm.map["values"][~mask], rtol=1e-5)
+            np.testing.assert_allclose(p.map["std"][~mask],
+                                       p_lm.map["std"][~mask], rtol=1e-5)
+        np.testing.assert_allclose(m.chisq.data, m_lm.chisq.data, rtol=1e-5)
+        np.testing.assert_array_equal(m.dof.data, m_lm.dof.data)
+
+    def test_multifit_non_uniform(self):
+        m = self._create_model()
+        m[0].sigma.map["values"][:] = 5.0
+        m[0].sigma.map["values"][0] = 4.0
+        m[0].sigma.map["is_set"][:] = True
+        m.multifit(optimizer="linear", iterpath="serpentine")
+        m_lm = self._create_model()
+        m_lm[0].sigma.map = m[0].sigma.map.copy()
+        m_lm.multifit(iterpath="serpentine")
+        np.testing.assert_allclose(m[0].A.map["values"],
+                                   m_lm[0].A.map["values"], rtol=1e-5)
+
+    def test_twin(self):
+        m = self._create_model()
+        g2 = hs.model.components1D.Gaussian(centre=60, sigma=5)
+        g2.centre.free = False
+        g2.sigma.free = False
+        g2.A.twin_function_expr = "2 * x"
+        g2.A.twin_inverse_function_expr = "x / 2"
+        g2.A.twin = m[0].A
+        m.append(g2)
+        m.multifit(optimizer="linear", iterpath="serpentine")
+        np.testing.assert_allclose(g2.A.map["values"], 2 * m[0].A.map["values"])
+        assert g2.A.map["is_set"].all()
+
+    def test_nonlinear_error(self):
+        m = self._create_model()
+        m[0].sigma.free = True
+        with pytest.raises(ValueError, match="Gaussian.sigma"):
+            m.fit(optimizer="linear")
+        with pytest.raises(ValueError, match="Gaussian.sigma"):
+            m.multifit(optimizer="linear", iterpath="serpentine")
+
+    def test_bounded_error(self):
+        m = self._create_model()
+        with pytest.raises(ValueError, match="Bounded optimization"):
+            m.multifit(optimizer="linear", iterpath="serpentine", bounded=True)
+
+    def test_nonlinear_twin_error(self):
+        m = self._create_model()
+        g2 = hs.model.components1D.Gaussian(centre=60, sigma=5)
+        g2.sigma.free = False
+        g2.centre.free = False
+        g2.A.twin_function_expr = "x ** 2"
+        g2.A.twin_inverse_function_expr = "sqrt(x)"
+        g2.A.twin = m[0].A
+        m.append(g2)
+        with pytest.raises(ValueError, match="Gaussian_0.A"):
+            m.fit(optimizer="linear")
+
+
+def test_expression_linear_parameters():
+    g = hs.model.components1D.Gaussian()
+    assert g.A._linear
+    assert not g.sigma._linear
+    assert not g.centre._linear
+    p = hs.model.components1D.Polynomial(order=2, legacy=False)
+    assert all(parameter._linear for parameter in p.parameters)
+    e = hs.model.components1D.Expression("a * b * x + c", name="test")
+    assert not e.a._linear
+    assert not e.b._linear
+    assert e.c._linear
+
 
 def test_missing_analytical_gradient():
     """Tests the error in gh-1388.
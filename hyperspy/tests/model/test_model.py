@@ -138,6 +138,194 @@ def test_call_method_binned(self):
         np.testing.assert_allclose(m[0].function(0) * 0.3, r1)
 
 
+class TestModelConvolution:
+    def setup_method(self, method):
+        s = hs.signals.Signal1D(np.zeros((2, 100)))
+        s.axes_manager[-1].offset = 100
+        ll = hs.signals.Signal1D(np.random.random((2, 31)))
+        ll.axes_manager[-1].offset = -10
+        m = s.create_model()
+        m.low_loss = ll
+        g = hs.model.components1D.Gaussian(A=100, centre=140, sigma=5)
+        g.convolved = True
+        m.append(g)
+        self.model = m
+
+    def _reference(self):
+        m = self.model
+        return np.convolve(m.low_loss(m.axes_manager),
+                           m[0].function(m.convolution_axis), mode="valid")
+
+    def test_fft_convolution(self):
+        m = self.model
+        np.testing.assert_allclose(m(), self._reference(), atol=1e-10)
+
+    def test_low_loss_fft_cache(self):
+        m = self.model
+        m()
+        cached = m._low_loss_fft
+        m()
+        assert m._low_loss_fft is cached
+        m.axes_manager.indices = (1,)
+        np.testing.assert_allclose(m(), self._reference(), atol=1e-10)
+        assert m._low_loss_fft is not cached
+
+    def test_low_loss_fft_cache_data_changed(self):
+        m = self.model
+        m()
+        ll = m.low_loss
+        ll.data[:] = np.random.random(ll.data.shape)
+        ll.events.data_changed.trigger(ll)
+        np.testing.assert_allclose(m(), self._reference(), atol=1e-10)
+
+    def test_low_loss_fft_cache_new_low_loss(self):
+        m = self.model
+        m()
+        ll = m.low_loss
+        m.low_loss = ll.deepcopy() * 2
+        np.testing.assert_allclose(m(), self._reference(), atol=1e-10)
+        # The previous low-loss does not reset the cache anymore
+        cached = m._low_loss_fft
+        ll.events.data_changed.trigger(ll)
+        assert m._low_loss_fft is cached
+
+
+class TestModelFixedComponentsCache:
+    def setup_method(self, method):
+        s = hs.signals.Signal1D(np.arange(100.0))
+        m = s.create_model()
+        g = hs.model.components1D.Gaussian(A=100, centre=50, sigma=5)
+        o = hs.model.components1D.Offset(offset=10)
+        o.offset.free = False
+        m.extend([g, o])
+        o.function = mock.MagicMock(side_effect=o.function)
+        self.model = m
+
+    def test_not_cached_outside_fit(self):
+        m = self.model
+        m()
+        m(onlyactive=True)
+        assert m[1].function.call_count == 2
+
+    def test_cached_during_fit(self):
+        m = self.model
+        m.fit()
+        assert m[1].function.call_count == 1
+        assert m._fixed_components_cache is None
+
+    def test_invalidation(self):
+        m = self.model
+        with m._fixed_components_cached():
+            r1 = m(onlyactive=True)
+            m[0].A.value = 50
+            r2 = m(onlyactive=True)
+            assert m[1].function.call_count == 1
+            np.testing.assert_allclose(r1 - r2, m[0].function(m.axis.axis), atol=1e-12)
+            m[1].offset.value = 20
+            r3 = m(onlyactive=True)
+            assert m[1].function.call_count == 2
+            np.testing.assert_allclose(r3 - r2, 10)
+            m.set_signal_range(10, 20)
+            axis = m.axis.axis[m.channel_switches]
+            assert m(onlyactive=True).size == axis.size
+            assert m[1].function.call_count == 3
+            m[1].active = False
+            np.testing.assert_allclose(m(onlyactive=True), m[0].function(axis))
+            m[1].active = True
+            m(onlyactive=True)
+            assert m[1].function.call_count == 4
+            m[1].offset.free = True
+            m(onlyactive=True)
+            m(onlyactive=True)
+            assert m[1].function.call_count == 6
+        assert m._fixed_components_cache is None
+
+    def test_twin(self):
+        m = self.model
+        g2 = hs.model.components1D.Gaussian(A=50, centre=30, sigma=5)
+        g2.A.free = False
+        g2.centre.free = False
+        g2.sigma.twin = m[0].sigma
+        m.append(g2)
+        m.signal.data = m(onlyactive=True)
+        m[0].sigma.value = 4
+        m.fit()
+        np.testing.assert_allclose(m[0].sigma.value, 5)
+        np.testing.assert_allclose(g2.sigma.value, 5)
+
+
+class TestModelFusedEvaluation:
+    def setup_method(self, method):
+        s = hs.signals.Signal1D(np.random.random(100))
+        m = s.create_model()
+        for centre in (20, 50, 80):
+            m.append(hs.model.components1D.Gaussian(
+                A=100, centre=centre, sigma=5))
+        m.append(hs.model.components1D.Lorentzian(A=10, centre=40))
+        m[1].sigma.twin = m[0].sigma
+        m[2].A.twin_function_expr = "2 * x"
+        m[2].A.twin = m[1].A
+        m._set_p0()
+        self.initial = m.p0
+        self.model = m
+
+    @pytest.mark.parametrize("module", ("numpy", "numexpr"))
+    def test_call(self, module):
+        m = self.model
+        expected = m()
+        m.enable_fused_evaluation(module)
+        np.testing.assert_allclose(m(), expected)
+        assert len(m._fused_expressions) == 1
+
+    def test_jacobian(self):
+        m = self.model
+        m.enable_fused_evaluation()
+        p0 = np.array(m.p0)
+        jac = m._jacobian(p0, None)
+        assert jac.shape == (len(p0), 100)
+        # Compare with the numerical derivatives, which take into account
+        # the twin function of m[2].A
+        delta = 1e-6
+        for i in range(len(p0)):
+            p = p0.copy()
+            p[i] += delta
+            upper = m._model_function(p)
+            p[i] -= 2 * delta
+            lower = m._model_function(p)
+            np.testing.assert_allclose(
+                jac[i], (upper - lower) / (2 * delta), atol=1e-5)
+
+    def test_recompile(self):
+        m = self.model
+        m.enable_fused_evaluation()
+        m()
+        fused = m._get_fused_expressions(list(m))
+        m[2].A.twin = None
+        expected = sum(component.function(m.axis.axis) for component in m)
+        np.testing.assert_allclose(m(), expected)
+        assert m._get_fused_expressions(list(m)) is not fused
+        m[3].active = False
+        np.testing.assert_allclose(
+            m(onlyactive=True),
+            expected - m[3].function(m.axis.axis))
+
+    def test_not_expression(self):
+        m = self.model
+        m.append(hs.model.components1D.Offset(offset=2.))
+        m.enable_fused_evaluation()
+        assert m._get_fused_expressions(list(m)) is None
+        m.remove(-1)
+        assert m._get_fused_expressions(list(m)) is not None
+
+    def test_fit(self):
+        m = self.model
+        m.signal.data = m()
+        m.enable_fused_evaluation()
+        m.fetch_values_from_array(np.array(self.initial) * 1.02)
+        m.fit(grad="analytical")
+        np.testing.assert_allclose(m.p0, self.initial, rtol=1e-4)
+
+
 class TestModelPlotCall:
     def setup_method(self, method):
         s = hs.signals.Signal1D(np.empty(1))
@@ -641,6 +829,103 @@ def test_not_active(self):
         assert self.o.offset.map["values"][0] != 2
 
 
+class TestParameterStore:
+    def setup_method(self, method):
+        s = hs.signals.Signal1D(np.zeros((2, 3, 10)))
+        m = s.create_model()
+        self.g = hs.model.components1D.Gaussian()
+        self.p = hs.model.components1D.Polynomial(order=2, legacy=False)
+        m.extend([self.g, self.p])
+        self.m = m
+
+    def test_maps_are_views(self):
+        store = self.m._get_parameter_store()
+        assert store.values.shape == (2, 3, 6)
+        assert store.is_set.shape == (2, 3, 6)
+        self.g.A.map["values"][1, 2] = 4
+        assert store.values[1, 2, 0] == 4
+        assert self.g.A.map.dtype.names == ("values", "std", "is_set")
+        assert self.m._get_parameter_store() is store
+
+    def test_store_fetch(self):
+        self.m.axes_manager.indices = (2, 1)
+        self.g.A.value = 3
+        self.g.A.std = 0.1
+        self.p.a1.value = 5
+        self.m.store_current_values()
+        store = self.m._get_parameter_store()
+        assert store.is_set[1, 2].all()
+        assert store.values[1, 2, 0] == 3
+        assert store.std[1, 2, 0] == 0.1
+        assert self.p.a1.map["values"][1, 2] == 5
+        self.g.A.value = 1
+        self.p.a1.value = 1
+        self.m.fetch_stored_values()
+        assert self.g.A.value == 3
+        assert self.g.A.std == 0.1
+        assert self.p.a1.value == 5
+
+    def test_fetch_only_fixed(self):
+        self.g.A.value = 3
+        self.g.sigma.value = 3
+        self.g.sigma.free = False
+        self.m.store_current_values()
+        self.g.A.value = 1
+        self.g.sigma.value = 1
+        self.m.fetch_stored_values(only_fixed=True)
+        assert self.g.A.value == 1
+        assert self.g.sigma.value == 3
+
+    def test_invalidation(self):
+        self.g.A.map["values"][0, 0] = 2
+        store = self.m._get_parameter_store()
+        o = hs.model.components1D.Offset()
+        self.m.append(o)
+        o.offset.map["values"][0, 1] = 3
+        new_store = self.m._get_parameter_store()
+        assert new_store is not store
+        assert new_store.values.shape == (2, 3, 7)
+        assert self.g.A.map["values"][0, 0] == 2
+        assert o.offset.map["values"][0, 1] == 3
+        self.m.remove(o)
+        assert self.m._get_parameter_store().values.shape == (2, 3, 6)
+
+    def test_multiple_elements(self):
+        with pytest.warns(VisibleDeprecationWarning):
+            p = hs.model.components1D.Polynomial(order=2)
+        self.m.append(p)
+        p.coefficients.value = (1, 2, 3)
+        p.coefficients.std = (0.1, 0.2, 0.3)
+        self.m.store_current_values()
+        store = self.m._get_parameter_store()
+        np.testing.assert_array_equal(store.values[0, 0, 6:], (1, 2, 3))
+        np.testing.assert_array_equal(
+            p.coefficients.map["std"][0, 0], (0.1, 0.2, 0.3))
+        p.coefficients.value = (0, 0, 0)
+        self.m.fetch_stored_values()
+        assert p.coefficients.value == (1, 2, 3)
+
+    def test_as_dictionary_packed(self):
+        self.m._get_parameter_store()
+        dic = self.g.A.as_dictionary()
+        assert dic["map"].dtype == np.dtype(
+            [("values", "float"), ("std", "float"), ("is_set", "bool")])
+
+    def test_save_parameters2file_packed(self, tmp_path):
+        self.m._get_parameter_store()
+        self.g.A.map["values"][1, 2] = 4
+        filename = tmp_path / "parameters.npz"
+        self.m.save_parameters2file(filename)
+        f = np.load(filename)
+        A = f["0_gaussian.a"]
+        assert A.dtype == np.dtype(
+            [("values", "float"), ("std", "float"), ("is_set", "bool")])
+        assert A["values"][1, 2] == 4
+        self.g.A.map["values"][1, 2] = 0
+        self.m.load_parameters_from_file(filename)
+        assert self.g.A.map["values"][1, 2] == 4
+
+
 class TestSetCurrentValuesTo:
     def setup_method(self, method):
         self.m = hs.signals.Signal1D(np.arange(10).reshape(2, 5)).create_model()
@@ -172,6 +172,22 @@ def test_setup(self):
         samf.stop()
         del samf
 
+    def test_need_pixels(self, monkeypatch):
+        from hyperspy.samfire_utils import samfire_pool
+        monkeypatch.setattr(samfire_pool, "cpu_count", lambda: 3)
+        samf = self.model.create_samfire(workers=2, setup=False)
+        samf._setup(ipyparallel=False)
+        pool = samf.pool
+        assert pool.num_workers == 2
+        pool.batch_size = 3
+        samf.metadata.marker[:2] = -samf._scale
+        # One batch running and one queued per worker
+        assert pool.need_pixels == 12
+        samf.running_pixels = [(0, 2), (1, 2), (2, 2), (3, 2)]
+        assert pool.need_pixels == 8
+        samf.stop()
+        del samf
+
     def test_samfire_init_marker(self):
         m = self.model
         samf = m.create_samfire(workers=N_WORKERS, setup=False)
@@ -334,6 +350,43 @@ def test_change_strategy(self):
         samf.stop()
         del samf
 
+    def test_backup_resume(self, tmp_path):
+        m = self.model
+        filename = str(tmp_path / "backup.h5")
+        samf = m.create_samfire(workers=0, setup=False)
+        samf.incremental_backup = True
+        samf.metadata.marker[:] = -1.
+        m[0].A.map['values'][:] = 3.
+        samf.backup(filename, on_count=False)
+        samf.count = 1
+        samf.update((0, 1), isgood=True)
+        m[0].A.map['values'][0, 1] = 4.
+        samf.backup(filename, on_count=False)
+        samf.stop()
+
+        m[0].A.map['values'][:] = 0.
+        samf = m.create_samfire(workers=0, setup=False)
+        samf.metadata.marker[:] = 1.
+        samf.restore_backup(filename)
+        assert np.all(samf.metadata.marker == -1.)
+        assert m[0].A.map['values'][0, 1] == 4.
+        assert m[0].A.map['values'][3, 3] == 3.
+        samf.stop()
+        del samf
+
+    def test_backup_model_save(self, tmp_path):
+        m = self.model
+        filename = str(tmp_path / "backup")
+        samf = m.create_samfire(workers=0, setup=False)
+        m[0].A.map['values'][:] = 3.
+        m[0].A.map['is_set'][:] = True
+        samf.backup(filename, on_count=False)
+        samf.stop()
+        assert 'samfire_backup' not in m.signal.models._models
+
+        m2 = hs.load(filename + ".hspy").models.restore('samfire_backup')
+        np.testing.assert_array_equal(m2[0].A.map['values'], 3.)
+
 @pytest.mark.xfail(reason="Sometimes the number of failed pixels > 3 when using multiprocessing. Unknown reason")
 def test_multiprocessed():
     """This test uses multiprocessing.pool rather than ipyparallel"""
@@ -546,3 +599,40 @@ def test_main_result(self):
                 np.allclose(lor2_values, possible_values2, rtol=0.05))
 
         del worker
+
+    def test_run_pixels_shared_data(self):
+        shared_memory = pytest.importorskip("multiprocessing.shared_memory")
+        worker = create_worker('worker')
+        worker.create_model(self.model_dictionary, self.model_letter)
+        worker.setup_test(self._gt_dump)
+        worker.set_optional_names({self.model[comp].name for comp in
+                                   self.optional_comps})
+        signal = self.model.signal
+        arrays = {
+            'signal.data': signal.data,
+            'variance.data': signal.metadata.Signal.Noise_properties.variance.data}
+        blocks = []
+        descriptions = {}
+        for key, array in arrays.items():
+            shm = shared_memory.SharedMemory(create=True, size=array.nbytes)
+            blocks.append(shm)
+            np.ndarray(array.shape, array.dtype, buffer=shm.buf)[:] = array
+            descriptions[key] = (shm.name, array.shape, array.dtype.str)
+        try:
+            worker.attach_shared_data(descriptions)
+            self.vals['fitting_kwargs'] = {}
+            keyword, results = worker.run_pixels([(self.ind, self.vals)])
+            worker.stop_listening()
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+        assert keyword == 'results'
+        assert len(results) == 1
+        keyword, (_id, _ind, result, found_solution) = results[0]
+        assert keyword == 'result'
+        assert _ind == self.ind
+        assert found_solution
+        assert result['dof.data'][()] == 9
+        np.testing.assert_array_equal(worker.model.signal.data,
+                                      signal.data[self.ind])
@@ -400,6 +400,91 @@ def test_values(self):
         test2 = compare_two_value_dicts(ans_r2, ans2)
         assert test2
 
+    def test_values_running_sums(self):
+        s = self.s
+        s.radii = 2.
+        samf = self.samf
+        s.samf = samf
+        s.weight = someweight()
+        rng = np.random.RandomState(0)
+        samf.model.chisq.data[:] = rng.rand(*self.shape)
+        samf.model[1].active_is_multidimensional = True
+        samf.model[1]._active_array[:] = rng.rand(*self.shape) > 0.3
+        for component in samf.model:
+            for par in component.parameters:
+                par.map['values'] = rng.rand(*self.shape)
+
+        s._update_marker((0, 0))
+        s.values((1, 1))
+        assert s._sums is not None
+        # the fitted pixels are added to (or removed from) the running sums
+        # when their results are accepted, values only looks them up
+        map_calls = []
+        s.weight.map = lambda *args: map_calls.append(args)
+        samf.running_pixels = [(0, 0)]
+        s._update_marker((1, 2))
+        samf.running_pixels = []
+        s._update_marker((2, 1))
+        ans = s.values((1, 1))
+        assert map_calls == []
+
+        s_new = LocalStrategy('test diffusion strategy')
+        s_new.radii = 2.
+        s_new.samf = samf
+        s_new.weight = someweight()
+        ans_r = s_new.values((1, 1))
+        assert set(ans) == set(ans_r) == {'Gaussian', 'Gaussian_0',
+                                          'Gaussian_1'}
+        assert compare_two_value_dicts(ans_r, ans)
+
+        weights = np.exp(-samf.model.chisq.data[[1, 2], [2, 1]])
+        np.testing.assert_allclose(
+            ans['Gaussian']['A'],
+            np.average(samf.model[0].A.map['values'][[1, 2], [2, 1]],
+                       weights=weights))
+
+        s.radii = 1.
+        assert s._sums is None
+
+    def test_values_running_sums_refit(self):
+        s = self.s
+        s.radii = 2.
+        samf = self.samf
+        s.samf = samf
+        s.weight = someweight()
+        rng = np.random.RandomState(0)
+        samf.model.chisq.data[:] = rng.rand(*self.shape)
+        samf.model[1].active_is_multidimensional = True
+        samf.model[1]._active_array[:] = True
+        for component in samf.model:
+            for par in component.parameters:
+                par.map['values'] = rng.rand(*self.shape)
+
+        s._update_marker((1, 2))
+        s._update_marker((2, 1))
+        s.values((1, 1))
+        # refit already marked pixels: new values, chisq and active state
+        samf.model[0].A.map['values'][1, 2] = 5.
+        samf.model.chisq.data[1, 2] = 0.1
+        s._update_marker((1, 2))
+        samf.model[1]._active_array[2, 1] = False
+        s._update_marker((2, 1))
+        ans = s.values((1, 1))
+
+        weights = np.exp(-samf.model.chisq.data[[1, 2], [2, 1]])
+        np.testing.assert_allclose(
+            ans['Gaussian']['A'],
+            np.average(samf.model[0].A.map['values'][[1, 2], [2, 1]],
+                       weights=weights))
+        np.testing.assert_allclose(
+            ans['Gaussian_0']['A'], samf.model[1].A.map['values'][1, 2])
+
+        s_new = LocalStrategy('test diffusion strategy')
+        s_new.radii = 2.
+        s_new.samf = samf
+        s_new.weight = someweight()
+        assert compare_two_value_dicts(s_new.values((1, 1)), ans)
+
 
 class TestGlobalStrategy:
 
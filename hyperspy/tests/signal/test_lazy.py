@@ -16,6 +16,9 @@
 # You should have received a copy of the GNU General Public License
 # along with  HyperSpy.  If not, see <http://www.gnu.org/licenses/>.
 
+import gc
+import os
+
 import dask.array as da
 import numpy as np
 import pytest
@@ -23,8 +26,12 @@
 
 import hyperspy.api as hs
 from hyperspy import _lazy_signals
-from hyperspy._signals.lazy import _reshuffle_mixed_blocks, to_array
+from hyperspy._signals.lazy import (NavigationBlockStream,
+                                    _reshuffle_mixed_blocks, chunk_cache,
+                                    to_array)
+from hyperspy.defaults_parser import preferences
 from hyperspy.exceptions import VisibleDeprecationWarning
+from hyperspy.misc import dask_scheduler, persist
 
 
 def _signal():
@@ -77,7 +84,7 @@ def test_blockiter_bothmasks(signal, flat, dtype, nm, sm):
     it = signal._block_iterator(flat_signal=flat,
                                 navigation_mask=nm,
                                 signal_mask=sm,
-                                get=get)
+                                scheduler="synchronous")
     first_block = next(it)
     second_block = next(it)
     if nm is not None:
@@ -123,6 +130,290 @@ def test_as_array_dask(sig):
     assert thing.chunks == chunks
 
 
+def test_iterate_signal(signal):
+    images = list(signal._iterate_signal())
+    assert all(isinstance(image, np.ndarray) for image in images)
+    expected = [image.compute() for image in signal._iterate_signal(lazy=True)]
+    np.testing.assert_array_equal(images, expected)
+    assert signal._navigation_block is None
+
+
+@pytest.mark.parametrize("factor", [2, 0.5])
+def test_iterate_signal_memory(signal, monkeypatch, factor):
+    # Blocks of one index of the first axis, or pixel by pixel
+    monkeypatch.setattr(preferences.General, "lazy_chunk_size",
+                        factor * signal.data[0].nbytes / 2 ** 20)
+    images = list(signal._iterate_signal())
+    expected = [image.compute() for image in signal._iterate_signal(lazy=True)]
+    np.testing.assert_array_equal(images, expected)
+
+
+def test_navigation_block_stream(signal):
+    data = signal.data.compute()
+    with NavigationBlockStream([signal]) as blocks:
+        # The blocks are the chunks of the first axis
+        np.testing.assert_array_equal(blocks.edges, [0, 2, 3, 6])
+        blocks.load(0)
+        assert blocks.block == 0
+        # The next block is being computed
+        assert blocks._next[0] == 1
+        blocks.load(4)
+        assert blocks.block == 2
+        assert blocks._next is None
+        np.testing.assert_array_equal(blocks.arrays[0], data[3:])
+        signal.axes_manager.indices = (1, 4)
+        np.testing.assert_array_equal(signal(), data[4, 1])
+        # Outside of the block, the data is read from the dask array
+        signal.axes_manager.indices = (1, 0)
+        np.testing.assert_array_equal(signal(), data[0, 1])
+    assert signal._navigation_block is None
+
+
+def test_navigation_block_stream_memory(signal, monkeypatch):
+    data = signal.data.compute()
+    index_nbytes = data[0].nbytes
+    # Two indices of the first axis for the block in memory and the next one
+    monkeypatch.setattr(preferences.General, "lazy_chunk_size",
+                        4 * index_nbytes / 2 ** 20)
+    with NavigationBlockStream([signal]) as blocks:
+        # The chunks are split to fit
+        np.testing.assert_array_equal(blocks.edges, [0, 2, 3, 4, 6])
+        for index in range(6):
+            blocks.load(index)
+            assert blocks.arrays[0].nbytes <= 2 * index_nbytes
+            np.testing.assert_array_equal(
+                blocks.arrays[0],
+                data[blocks.edges[blocks.block]:
+                     blocks.edges[blocks.block + 1]])
+
+
+def test_navigation_block_stream_too_large(signal, monkeypatch):
+    data = signal.data.compute()
+    monkeypatch.setattr(preferences.General, "lazy_chunk_size",
+                        data[0].nbytes / 2 ** 20)
+    with NavigationBlockStream([signal]) as blocks:
+        blocks.load(0)
+        # The data is read pixel by pixel
+        assert blocks.block is None
+        assert signal._navigation_block is None
+        signal.axes_manager.indices = (1, 4)
+        np.testing.assert_array_equal(signal(), data[4, 1])
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(preferences.General, "lazy_chunk_cache_size", 1.)
+    chunk_cache.clear()
+    yield chunk_cache
+    chunk_cache.clear()
+
+
+def test_chunk_cache(signal, cache):
+    data = signal.data.compute()
+    signal.axes_manager.indices = (1, 4)
+    np.testing.assert_array_equal(signal(), data[4, 1])
+    assert len(cache) == 1
+    # Same chunk
+    signal.axes_manager.indices = (3, 5)
+    np.testing.assert_array_equal(signal(), data[5, 3])
+    assert len(cache) == 1
+    assert cache.nbytes == 3 * 4 * 7 * 11 * 8
+
+
+def test_chunk_cache_prefetch(signal, cache):
+    data = signal.data.compute()
+    signal.axes_manager.indices = (0, 0)
+    signal()
+    # Moving along the first array axis prefetches the following chunk
+    signal.axes_manager.indices = (0, 2)
+    signal()
+    for future in list(cache._pending.values()):
+        future.result()
+    assert len(cache) == 3
+    signal.axes_manager.indices = (2, 4)
+    np.testing.assert_array_equal(signal(), data[4, 2])
+
+
+def test_chunk_cache_lru(signal, cache, monkeypatch):
+    # Room for a single chunk of 3 x 4 positions
+    monkeypatch.setattr(preferences.General, "lazy_chunk_cache_size",
+                        3 * 4 * 7 * 11 * 8 / 2 ** 20)
+    signal.axes_manager.indices = (0, 4)
+    signal()
+    # Chunk of 2 x 5 positions
+    signal.axes_manager.indices = (5, 0)
+    signal()
+    assert len(cache) == 1
+    # The block indices are in the order of the navigation axes
+    assert list(cache._chunks)[0][2] == (1, 0)
+
+
+def test_chunk_cache_copy(signal, cache):
+    data = signal.data.compute()
+    other = signal.deepcopy()
+    signal.axes_manager.indices = (1, 4)
+    signal()[:] = -1
+    # The data in the cache is not modified
+    np.testing.assert_array_equal(signal(), data[4, 1])
+    other.axes_manager.indices = (1, 4)
+    np.testing.assert_array_equal(other(), data[4, 1])
+    chunk, = cache._chunks.values()
+    assert not chunk.flags.writeable
+
+
+def test_chunk_cache_close(signal, cache):
+    signal.axes_manager.indices = (0, 0)
+    signal()
+    signal.axes_manager.indices = (0, 2)
+    signal()
+    cache.close()
+    assert cache._executor is None
+    assert len(cache) == 0
+
+
+def test_chunk_cache_disabled(signal, cache, monkeypatch):
+    monkeypatch.setattr(preferences.General, "lazy_chunk_cache_size", 0)
+    signal()
+    assert len(cache) == 0
+
+
+@pytest.fixture
+def navigators():
+    from hyperspy.misc import lazy_navigator
+
+    lazy_navigator.clear_cache()
+    yield lazy_navigator
+    lazy_navigator.clear_cache()
+
+
+def test_compute_navigator(signal, navigators):
+    navigator = signal.compute_navigator(show_progressbar=False)
+    assert isinstance(navigator, hs.signals.Signal2D)
+    np.testing.assert_allclose(navigator.data,
+                               signal.data.sum(axis=(2, 3)).compute())
+    np.testing.assert_array_equal(
+        navigators.get_cached_navigator(signal.data), navigator.data)
+    # The navigator is reused
+    navigator2, computation = signal._get_navigator()
+    assert computation is None
+    assert np.shares_memory(navigator2.data, navigator.data)
+
+
+def test_compute_navigator_background(signal, navigators):
+    navigator, computation = signal._get_navigator(background=True)
+    # The first chunk is computed before returning
+    assert computation.computed >= 1
+    computation.thread.join()
+    assert computation.done
+    np.testing.assert_allclose(navigator.data,
+                               signal.data.sum(axis=(2, 3)).compute())
+    assert navigators.get_cached_navigator(signal.data) is not None
+
+
+def test_compute_navigator_stop(signal, navigators):
+    navigator, computation = signal._get_navigator(background=True)
+    computation.stop()
+    if not computation.done:
+        assert np.isnan(navigator.data).any()
+        assert navigators.get_cached_navigator(signal.data) is None
+
+
+def test_compute_navigator_3d_navigation(navigators):
+    data = np.arange(3 * 4 * 5 * 6.).reshape((3, 4, 5, 6))
+    s = _lazy_signals.LazySignal1D(da.from_array(data, chunks=(1, 2, 5, 6)))
+    navigator = s.compute_navigator(show_progressbar=False)
+    expected = hs.signals.Signal1D(data).sum(-1).as_signal2D((0, 1))
+    np.testing.assert_allclose(navigator.data, expected.data)
+    assert navigator.axes_manager.navigation_shape == (3, )
+
+
+def _wait_navigator(signal):
+    computation, _ = getattr(signal, '_navigator_update', (None, None))
+    if computation is not None and computation.thread is not None:
+        computation.thread.join()
+
+
+def test_plot_navigator_data_changed(navigators):
+    data = np.arange(6. * 9 * 7 * 11).reshape((6, 9, 7, 11))
+    s = _lazy_signals.LazySignal2D(
+        da.from_array(data, chunks=((2, 1, 3), (4, 5), (7,), (11,))))
+    s.plot()
+    _wait_navigator(s)
+    navigator_plot = s._plot.navigator_plot
+    np.testing.assert_allclose(navigator_plot.data_function(),
+                               data.sum(axis=(2, 3)))
+    # The data of the dask array changes in place
+    data *= 2
+    s.events.data_changed.trigger(obj=s)
+    _wait_navigator(s)
+    np.testing.assert_allclose(navigator_plot.data_function(),
+                               data.sum(axis=(2, 3)))
+    s._plot.close()
+
+
+@pytest.mark.parametrize("scheduler", ["synchronous", "threads", None])
+def test_compute_scheduler(signal, scheduler):
+    data = signal.data.compute()
+    signal.compute(scheduler=scheduler, show_progressbar=False)
+    np.testing.assert_array_equal(signal.data, data)
+
+
+def test_scheduler_preference(monkeypatch):
+    monkeypatch.setattr(preferences.General, "dask_scheduler", "synchronous")
+    assert dask_scheduler.get_scheduler() == "synchronous"
+    assert dask_scheduler.get_scheduler("threads") == "threads"
+    with pytest.raises(ValueError, match="not a valid scheduler"):
+        dask_scheduler.get_scheduler("gpu")
+
+
+def test_scheduler_address_client(monkeypatch):
+    distributed = pytest.importorskip("distributed")
+    with distributed.LocalCluster(n_workers=1, processes=False,
+                                  dashboard_address=None) as cluster:
+        monkeypatch.setattr(preferences.General, "dask_scheduler_address",
+                            cluster.scheduler_address)
+        client = dask_scheduler.get_scheduler("distributed")
+        # The connection is reused
+        assert dask_scheduler.get_scheduler("distributed") is client
+        client.close()
+        client2 = dask_scheduler.get_scheduler("distributed")
+        assert client2 is not client
+        assert client2.status == "running"
+        client2.close()
+
+
+@pytest.mark.parametrize("max_in_flight", [1, 2, 3])
+def test_compute_iter(max_in_flight):
+    arrays = [da.full((4,), i, chunks=2) for i in range(5)]
+    computed = dask_scheduler.compute_iter(
+        ((a, a + 1) for a in arrays), scheduler="threads",
+        max_in_flight=max_in_flight)
+    for i, (a, b) in enumerate(computed):
+        np.testing.assert_array_equal(a, i)
+        np.testing.assert_array_equal(b, i + 1)
+    assert i == 4
+
+
+def test_compute_iter_in_flight():
+    pulled = []
+
+    def collections():
+        for i in range(5):
+            pulled.append(i)
+            yield da.full((4,), i, chunks=2)
+
+    computed = dask_scheduler.compute_iter(collections(), scheduler="threads")
+    next(computed)
+    # The current collection and the next one
+    assert pulled == [0, 1]
+    computed.close()
+
+
+def test_block_iterator_get_warning(signal):
+    with pytest.warns(VisibleDeprecationWarning, match="`get` keyword"):
+        next(signal._block_iterator(get=get))
+
+
 def test_as_array_fail():
     with pytest.raises(ValueError):
         to_array('asd', chunks=None)
@@ -149,3 +440,72 @@ def test_warning():
     assert sig._lazy == False
     thing = to_array(sig, chunks=None)
     assert isinstance(thing, np.ndarray)
+
+
+def _get_persisted(s):
+    # The zarr array or h5py dataset read by the data
+    return s.data.dask[[name for name in s.data.dask.layers
+                        if name.startswith("original-")][0]]
+
+
+def test_persist_disk(signal):
+    data = signal.data.compute()
+    s = signal * 2
+    s.persist(show_progressbar=False)
+    store = _get_persisted(s)
+    if persist.zarr is None:
+        path = store.file.filename
+        assert os.path.isfile(path)
+    else:
+        path = store.store.path
+        assert os.path.isdir(path)
+    assert s.data.chunks == signal.data.chunks
+    np.testing.assert_array_equal(s.data.compute(), data * 2)
+    # The temporary file is removed when it is no longer used
+    del s, store
+    gc.collect()
+    assert not os.path.exists(path)
+
+
+def test_persist_disk_path(signal, tmp_path):
+    path = tmp_path / "persist.h5"
+    signal.persist(path=str(path), show_progressbar=False)
+    assert path.is_file()
+    np.testing.assert_array_equal(signal.data.compute(),
+                                  np.arange(6. * 9 * 7 * 11).reshape(
+                                      (6, 9, 7, 11)))
+    dset = _get_persisted(signal)
+    signal.close_file()
+    assert not dset.id.valid
+
+
+def test_persist_hdf5_scheduler(signal, tmp_path):
+    path = tmp_path / "persist.h5"
+    with pytest.raises(ValueError, match="HDF5"):
+        signal.persist(path=str(path), scheduler="processes",
+                       show_progressbar=False)
+
+
+def test_persist_zarr_processes(signal, tmp_path):
+    pytest.importorskip("zarr")
+    data = signal.data.compute()
+    # The irregular chunks are rechunked to write the zarr chunks
+    s = signal * 2
+    path = tmp_path / "persist.zarr"
+    s.persist(path=str(path), scheduler="processes", show_progressbar=False)
+    assert path.is_dir()
+    assert s.data.chunks == signal.data.chunks
+    np.testing.assert_array_equal(
+        s.data.compute(scheduler="processes"), data * 2)
+
+
+def test_persist_memory(signal):
+    s = signal + 1
+    s.persist(to="memory", show_progressbar=False)
+    # The graph only contains the computed chunks
+    assert all(isinstance(chunk, np.ndarray)
+               for chunk in dict(s.data.dask).values())
+    np.testing.assert_array_equal(s.data.compute(),
+                                  signal.data.compute() + 1)
+    with pytest.raises(ValueError, match="not a valid value"):
+        s.persist(to="gpu")
@@ -17,8 +17,10 @@
 # along with  HyperSpy.  If not, see <http://www.gnu.org/licenses/>.
 
 import dask.array as da
+import h5py
 import numpy as np
 
+from hyperspy.defaults_parser import preferences
 from hyperspy.signals import Signal1D, Signal2D
 
 
@@ -86,3 +88,24 @@ def test_lazy_diff_rechunk():
             (1,) * 10,
             (1,) * 99,
         )  # The data has not been rechunked
+
+
+def test_lazy_rechunk_storage_multiples(tmp_path, monkeypatch):
+    monkeypatch.setattr(preferences.General, "lazy_chunk_size", 0.05)
+    with h5py.File(tmp_path / "test.h5", "w") as f:
+        dset = f.create_dataset("data", data=np.ones((40, 40, 64)),
+                                chunks=(2, 2, 64))
+        s = Signal1D(da.from_array(dset, chunks=dset.chunks)).as_lazy()
+        s._make_lazy(rechunk=True)
+        nav_chunks = s.data.chunks[:2]
+        assert all(c % 2 == 0 for chunks in nav_chunks for c in chunks)
+        assert len(nav_chunks[0]) * len(nav_chunks[1]) < 400
+
+
+def test_lazy_no_redundant_rechunk():
+    s = Signal1D(da.ones((40, 40, 64), chunks=(10, 40, 64))).as_lazy()
+    s2 = s * 2
+    # The chunks already suit these operations
+    assert s2._lazy_data(rechunk=True) is s2.data
+    assert not any(name.startswith("rechunk")
+                   for name in s2.sum(axis=(0, 1)).data.dask.layers)
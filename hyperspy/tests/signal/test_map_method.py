@@ -16,6 +16,7 @@
 # You should have received a copy of the GNU General Public License
 # along with  HyperSpy.  If not, see <http://www.gnu.org/licenses/>.
 
+import os
 from unittest import mock
 
 import numpy as np
@@ -367,3 +368,160 @@ def test_map_ufunc(caplog):
     assert np.log(s) == s.map(np.log)
     np.testing.assert_allclose(s.data, np.log(data))
     assert "can direcly operate on hyperspy signals" in caplog.records[0].message
+
+
+@pytest.mark.parametrize('parallel', [True, False])
+def test_map_ragged_found_while_iterating(parallel):
+    s = hs.signals.Signal1D(np.arange(12.).reshape((4, 3)))
+    out = s.map(lambda x, n: x[:n], n=hs.signals.BaseSignal([3, 3, 2, 3]).T,
+                inplace=False, parallel=parallel, ragged=None)
+    assert out.data.dtype is np.dtype('O')
+    assert out.data.shape == (4, )
+    np.testing.assert_allclose(out.data[1], [3., 4., 5.])
+    np.testing.assert_allclose(out.data[2], [6., 7.])
+    with pytest.raises(ValueError):
+        s.map(lambda x, n: x[:n], n=hs.signals.BaseSignal([3, 3, 2, 3]).T,
+              inplace=False, parallel=parallel, ragged=False)
+
+
+def test_map_dtype_promotion():
+    s = hs.signals.Signal1D(np.arange(12).reshape((4, 3)))
+    out = s.map(lambda x: x / 2 if x[0] == 9 else x, inplace=False,
+                ragged=False)
+    assert out.data.dtype == np.dtype('float64')
+    np.testing.assert_allclose(out.data[:3], s.data[:3])
+    np.testing.assert_allclose(out.data[3], [4.5, 5., 5.5])
+
+
+def test_map_lazy_dtype():
+    s = hs.signals.Signal1D(np.arange(12).reshape((4, 3))).as_lazy()
+    s.data = s.data.rechunk((2, 3))
+    out = s.map(lambda x: x / 2 if x[0] == 9 else x, inplace=False,
+                ragged=False)
+    # The integer results are declared as float to not truncate the others
+    assert out.data.dtype == np.dtype('float64')
+    data = out.data.compute()
+    assert data.dtype == out.data.dtype
+    np.testing.assert_allclose(data[:3], np.arange(9).reshape((3, 3)))
+    np.testing.assert_allclose(data[3], [4.5, 5., 5.5])
+
+
+def test_map_lazy_dtype_unsafe_cast():
+    s = hs.signals.Signal1D(np.arange(12.).reshape((4, 3))).as_lazy()
+    out = s.map(lambda x: x + 1j if x[0] == 9 else x, inplace=False,
+                ragged=False)
+    with pytest.raises(ValueError, match="complex128"):
+        out.data.compute()
+
+
+def test_map_iterate_memmap(tmp_path):
+    s = hs.signals.Signal1D(np.arange(12.).reshape((4, 3)))
+    fname = str(tmp_path / "map_result.dat")
+    out = s._map_iterate(lambda x: x * 2, inplace=False, ragged=False,
+                         out_filename=fname)
+    assert isinstance(out.data, np.memmap)
+    np.testing.assert_allclose(out.data, s.data * 2)
+
+
+@pytest.mark.parametrize("parallel", [False, "processes"])
+def test_map_out_filename_inplace(tmp_path, parallel):
+    s = hs.signals.Signal1D(np.arange(12.).reshape((4, 3)))
+    fname = str(tmp_path / "map_result.dat")
+    s.map(lambda x: x * 2, ragged=False, parallel=parallel, max_workers=2,
+          out_filename=fname)
+    # The data is the memmap, not a copy of it in memory
+    assert isinstance(s.data, np.memmap)
+    assert s.data.filename == os.path.abspath(fname)
+    np.testing.assert_allclose(s.data, np.arange(12.).reshape((4, 3)) * 2)
+
+
+@pytest.mark.parametrize("parallel", [False, "processes"])
+def test_map_out_filename_dtype_promotion(tmp_path, parallel):
+    s = hs.signals.Signal1D(np.arange(12).reshape((4, 3)))
+    fname = str(tmp_path / "map_result.dat")
+    out = s.map(lambda x: x / 2 if x[0] == 9 else x, inplace=False,
+                ragged=False, parallel=parallel, max_workers=2,
+                out_filename=fname)
+    assert isinstance(out.data, np.memmap)
+    assert out.data.filename == os.path.abspath(fname)
+    assert out.data.dtype == np.dtype('float64')
+    np.testing.assert_allclose(out.data[:3], s.data[:3])
+    np.testing.assert_allclose(out.data[3], [4.5, 5., 5.5])
+
+
+def test_map_out_filename_lazy(tmp_path):
+    s = hs.signals.Signal1D(np.arange(12.).reshape((4, 3))).as_lazy()
+    with pytest.raises(ValueError):
+        s.map(lambda x: x * 2, ragged=False,
+              out_filename=str(tmp_path / "map_result.dat"))
+
+
+class TestMapProcesses:
+
+    def setup_method(self, method):
+        self.s = hs.signals.Signal1D(np.arange(24.).reshape((2, 4, 3)))
+
+    def test_constant_kwarg(self):
+        s = self.s
+        out = s.map(gaussian_filter1d, sigma=1, parallel="processes",
+                    max_workers=2, inplace=False)
+        np.testing.assert_allclose(out.data, gaussian_filter1d(s.data, 1))
+
+    def test_iterating_kwarg(self):
+        s = self.s
+        b = hs.signals.BaseSignal(np.arange(8.).reshape((2, 4))).T
+        out = s.map(lambda A, B, c: A * B + c, B=b, c=1, inplace=False,
+                    parallel="processes", max_workers=2)
+        np.testing.assert_allclose(
+            out.data, s.data * b.data[..., np.newaxis] + 1)
+
+    def test_scalar_result(self):
+        s = self.s
+        out = s.map(lambda x: x.sum(), parallel="processes", max_workers=2,
+                    inplace=False)
+        assert out.axes_manager.navigation_shape == (4, 2)
+        assert out.axes_manager.signal_dimension == 0
+        np.testing.assert_allclose(out.data, s.data.sum(-1))
+
+    def test_transposed(self):
+        s = self.s.T
+        out = s.map(lambda x: x * 2, parallel="processes", max_workers=2,
+                    inplace=False)
+        np.testing.assert_allclose(out.data, s.data * 2)
+
+    @pytest.mark.parametrize('ragged', [None, True])
+    def test_ragged(self, ragged):
+        s = self.s
+        n = hs.signals.BaseSignal(np.array([[3, 3, 2, 3],
+                                            [1, 3, 3, 3]])).T
+        out = s.map(lambda x, n: x[:n], n=n, inplace=False, ragged=ragged,
+                    parallel="processes", max_workers=2)
+        assert out.data.dtype is np.dtype('O')
+        assert out.data.shape == (2, 4)
+        np.testing.assert_allclose(out.data[0, 2], [6., 7.])
+        np.testing.assert_allclose(out.data[1, 0], [12.])
+        np.testing.assert_allclose(out.data[1, 3], [21., 22., 23.])
+
+    def test_ragged_false(self):
+        s = self.s
+        n = hs.signals.BaseSignal(np.array([[3, 3, 2, 3],
+                                            [1, 3, 3, 3]])).T
+        with pytest.raises(ValueError):
+            s.map(lambda x, n: x[:n], n=n, inplace=False, ragged=False,
+                  parallel="processes", max_workers=2)
+
+
+def test_lazy_map_blockwise():
+    import dask.array as da
+    data = np.arange(16 * 16 * 8.).reshape((16, 16, 8))
+    s = hs.signals.Signal1D(da.from_array(data, chunks=(8, 8, 8))).as_lazy()
+    # iterating kwargs are rechunked to match the navigation chunks
+    b = hs.signals.BaseSignal(
+        da.from_array(np.arange(256.).reshape((16, 16)), chunks=(16, 4))).T
+    out = s.map(lambda x, b, c: x[:4] * b + c, b=b, c=1, inplace=False,
+                ragged=False)
+    # one task per navigation chunk and not per pixel
+    assert len(out.data.__dask_graph__()) < 50
+    assert out.data.chunks[:2] == ((8, 8), (8, 8))
+    np.testing.assert_allclose(
+        out.data.compute(), data[..., :4] * b.data[..., np.newaxis] + 1)
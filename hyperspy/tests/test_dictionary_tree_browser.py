@@ -195,6 +195,41 @@ def test_html(self):
         tree['mybrokenhtmltag2>'] = ""
         tree._get_html_print_items()
 
+
+def test_lazy_dictionary():
+    calls = []
+
+    def read():
+        calls.append(1)
+        return {"Node1": {"leaf11": 11, "Node11": {"leaf111": 111}},
+                "leaf1": 1}
+
+    tree = DictionaryTreeBrowser(read, lazy=True)
+    tree_copy = tree.deepcopy()
+    assert not calls
+    assert tree.Node1.Node11.leaf111 == 111
+    assert len(calls) == 1
+    assert tree.keys() == ["Node1", "leaf1"]
+    assert tree.as_dictionary() == read()
+    # The copy is read independently
+    assert tree_copy.has_item("Node1.leaf11")
+
+
+def test_lazy_dictionary_set_item():
+    tree = DictionaryTreeBrowser({"Node1": {"leaf11": 11}}, lazy=True)
+    tree.set_item("Node1.leaf12", 12)
+    assert tree.as_dictionary() == {"Node1": {"leaf11": 11, "leaf12": 12}}
+
+
+def test_lazy_dictionary_signal():
+    s = BaseSignal([1., 2, 3])
+    tree = DictionaryTreeBrowser(
+        lambda: {"Node1": {"_sig_signal name": s._to_dictionary()}},
+        lazy=True)
+    assert isinstance(tree.Node1.signal_name, BaseSignal)
+    np.testing.assert_array_equal(tree.Node1.signal_name.data, s.data)
+
+
 def test_check_long_string():
     max_len = 20
     value = "Hello everyone this is a long string"